@@ -1,45 +1,202 @@
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from src import boot
+
+# Startup steps and readiness (/healthz, /readyz); created before the imports
+# below so that they count towards the time-to-ready it reports
+BOOT = boot.Boot()
+
 import dash_bootstrap_components as dbc
-import pandas as pd
-from dash import Dash, dcc, html, Input, Output  # State not currently needed
+from dash import ALL, MATCH, ClientsideFunction, Dash, ctx, dcc, html, Input, Output, State
+from dash.exceptions import PreventUpdate
 
-from src.const import get_constants
+from src import const, figure_bundle, geo, live, metrics, wire
+from src.const import constants_from_aggregates
+from src.aggregates import compute_aggregates, merge_measures, requirements
+from src.bitmap_index import InvertedIndex, filter_dataset
+from src.figure_cache import FigureCache
+from src.single_flight import SingleFlight
+from src.snapshot import SOURCES, LazyDataset, refresh, source_columns
+from src.sql_backend import open_store
+from src.title_search import TitleIndex
+from src.year_cube import RANGE_KEY
 from src import dash1, dash2, dash3, dash4
 
+BOOT.lap("imports")
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Data & constants
 # ──────────────────────────────────────────────────────────────────────────────
-DATA_DIR = Path("dashboards/dash_python/data")
+# IMDB_DATA_DIR points the app at another data drop (e.g. synthetic benchmark data)
+DATA_DIR = Path(os.environ.get("IMDB_DATA_DIR", Path(__file__).resolve().parent / "data"))
 
-MOVIES = pd.read_csv(DATA_DIR / "movie_after_cleaning.csv")
-MOVIES_SPLITS = pd.read_excel(DATA_DIR / "splits_movie.xlsx", sheet_name=None)
-SERIES = pd.read_csv(DATA_DIR / "series_after_cleaning.csv")
-SERIES_SPLITS = pd.read_excel(DATA_DIR / "splits_series.xlsx", sheet_name=None)
+# Feather snapshot of the cleaned CSVs + derived splits, rebuilt when a CSV changes,
+# held in memory as categorical codes / downcast numbers (see src/compact.py).
+# Columns and split sheets are read on first use, as the tabs' measures need them.
+# The served version of the data and everything derived from it is a
+# `live.Release`, set up by `startup()` and swapped whole by `reload_data()`;
+# a request reads RELEASE once and passes it down.
+DATA_TABS = ("movie", "series")
+RELEASE = None
 
-DATA_BY_TAB = {
-    "movie": (MOVIES, MOVIES_SPLITS),
-    "series": (SERIES, SERIES_SPLITS),
-}
+# Datasets whose works have runs (series) get the Year tab's activity
+# figure and measure on top; read from the cleaned CSVs' header lines
+RUN_TABS = {data_tab: dash4.has_runs(source_columns(DATA_DIR, data_tab)) for data_tab in DATA_TABS}
 
+# Each tab's builder and how many figures it draws per dataset
 VISUALIZATION_BUILDERS = {
-    "overview": (dash1.generate_visualizations, 4),
-    "content_creators": (dash2.generate_visualizations, 4),
-    "parental": (dash3.generate_visualizations, 2),
-    "year": (dash4.generate_visualizations, 2),
+    "overview": (dash1.generate_visualizations, dict.fromkeys(DATA_TABS, 4)),
+    "content_creators": (dash2.generate_visualizations, dict.fromkeys(DATA_TABS, 4)),
+    "parental": (dash3.generate_visualizations, dict.fromkeys(DATA_TABS, 2)),
+    "year": (dash4.generate_visualizations, {"movie": 2, "series": 3}),
 }
 
-# Top-level stats
-NUM_WORKS, NUM_COUNTRIES, NUM_LANGUAGES, AVG_VOTES = get_constants(
-    MOVIES, SERIES, MOVIES_SPLITS, SERIES_SPLITS
-)
+# Per-figure builders of each tab and dataset, in grid order (see FIGURES in src/dash*.py)
+FIGURE_BUILDERS = {
+    "overview": dict.fromkeys(DATA_TABS, dash1.FIGURES),
+    "content_creators": dict.fromkeys(DATA_TABS, dash2.FIGURES),
+    "parental": dict.fromkeys(DATA_TABS, dash3.FIGURES),
+    "year": {data_tab: dash4.RUN_FIGURES if runs else dash4.FIGURES for data_tab, runs in RUN_TABS.items()},
+}
+
+# Tabs whose figures follow the year range slider (built from a YearCube)
+YEAR_RANGE_TABS = ("parental", "year")
 
-MAX_OPTIONS_DISPLAY = 3_300
-DROPDOWN_OPTIONS = {
-    "movie": [{"label": t, "value": t} for t in MOVIES["title"][:MAX_OPTIONS_DISPLAY]],
-    "series": [{"label": t, "value": t} for t in SERIES["title"][:MAX_OPTIONS_DISPLAY]],
+# Aggregates each tab's builders read per dataset; they also decide which
+# columns and split sheets of a dataset are loaded (see `aggregates.requirements`)
+MEASURES_BY_TAB = {
+    "overview": dict.fromkeys(DATA_TABS, dash1.MEASURES),
+    "content_creators": dict.fromkeys(DATA_TABS, dash2.MEASURES),
+    "parental": dict.fromkeys(DATA_TABS, dash3.MEASURES),
+    "year": {data_tab: dash4.RUN_MEASURES if runs else dash4.MEASURES for data_tab, runs in RUN_TABS.items()},
 }
 
+# Which figure of each tab filters which dimension when clicked
+CROSSFILTERS = {
+    "overview": dash1.CROSSFILTER,
+    "content_creators": dash2.CROSSFILTER,
+    "parental": dash3.CROSSFILTER,
+    "year": dash4.CROSSFILTER,
+}
+
+# Every dimension a cross-filter selection may restrict
+CROSSFILTER_DIMENSIONS = sorted({dim for crossfilter in CROSSFILTERS.values() for dim, _ in crossfilter.values()})
+
+# IMDB_APPROXIMATE=1 answers top-n counts and distinct counts from mergeable
+# sketches (src/sketches.py) instead of exact passes (pandas backend)
+APPROXIMATE = os.environ.get("IMDB_APPROXIMATE", "0") == "1"
+
+# IMDB_BACKEND=sqlite|duckdb answers every aggregate (cross-filtered ones too)
+# with SQL over one on-disk store shared by all workers (src/sql_backend.py);
+# the default, pandas, evaluates them over the in-memory frames
+BACKEND = os.environ.get("IMDB_BACKEND", "pandas")
+
+# Whole-dataset aggregates of the exact pandas engine are kept as running
+# tallies (src/incremental.py) that a data drop updates by its rows alone;
+# sketches cannot take rows out and SQL stores are rebuilt, so those recompute
+INCREMENTAL = BACKEND == "pandas" and not APPROXIMATE
+
+# Every builder's + the KPI cards' measures
+MEASURES = merge_measures(const.MEASURES, *(m for by_data in MEASURES_BY_TAB.values() for m in by_data.values()))
+
+
+def selection_index(data_tab: str, release=None) -> InvertedIndex:
+    """Split value -> row ids over every cross-filter dimension, for filtering without frame scans."""
+    release = release or RELEASE
+
+    def build():
+        data, splits = release.datasets[data_tab].load(CROSSFILTER_DIMENSIONS, CROSSFILTER_DIMENSIONS)
+        return InvertedIndex(data, {sheet: splits[sheet] for sheet in CROSSFILTER_DIMENSIONS if sheet in splits})
+
+    return release.memo(("selection index", data_tab), build)
+
+
+def dataset_aggregates(data_tab: str, measures, selection=None, release=None) -> dict:
+    """*measures* over the works of a dataset matching *selection*, from the configured backend."""
+    release = release or RELEASE
+    if release.store is not None:
+        return release.store.compute_aggregates(data_tab, measures, selection)
+    columns, sheets = requirements(measures)
+    data, splits = release.datasets[data_tab].load(columns, sheets)
+    splits = {sheet: splits[sheet] for sheet in sheets}
+    if any((selection or {}).values()):
+        data, splits = filter_dataset(data, splits, selection_index(data_tab, release).select(selection))
+    return compute_aggregates(data, splits, measures, approximate=APPROXIMATE)
+
+
+def whole_aggregates(data_tab: str, tag: str, measures, release=None) -> dict:
+    """
+    *measures* (named *tag*) over a whole dataset, once per release: from
+    the running tallies a data drop is applied to, or from the backend.
+    """
+    release = release or RELEASE
+
+    def compute():
+        with metrics.timed("aggregate", data_tab):
+            if INCREMENTAL:
+                return release.state(data_tab, tag, measures).result()
+            return dataset_aggregates(data_tab, measures, release=release)
+
+    return release.memo(
+        ("aggregates", tag, data_tab),
+        lambda: FLIGHTS.do(("aggregates", release.version, tag, data_tab), compute),
+    )
+
+# Rendered figures shared by all workers; keyed by builder, dataset and version
+FIGURE_CACHE = FigureCache(DATA_DIR / ".cache" / "figures.sqlite", max_bytes=64 * 1024 * 1024)
+
+# IMDB_CLIENT_TABS=1 ships every unfiltered figure to the browser once and
+# switches tabs client-side (assets/client_tabs.js) instead of via update_tab
+CLIENT_TABS = os.environ.get("IMDB_CLIENT_TABS", "0") == "1"
+
+# IMDB_BACKGROUND_BOOT=1 binds at once and loads the data in a background
+# thread: the layout shell is served right away, data callbacks wait for the
+# data, /readyz answers 503 until it is in. (The client-side tabs' bundle
+# needs every figure before the first page, so they always boot in front.)
+BACKGROUND_BOOT = os.environ.get("IMDB_BACKGROUND_BOOT", "0") == "1" and not CLIENT_TABS
+# How long a data callback of a page served while starting waits for the data
+BOOT_WAIT_SECONDS = 300
+
+# Concurrent identical requests (a class opening the same tab at once) share
+# one computation of each aggregate, figure and tab layout. IMDB_FLIGHT_LOCKS=1
+# also coordinates workers through lock files: one renders a missing
+# shared-cache figure while the others wait and then read it.
+FLIGHT_LOCKS = os.environ.get("IMDB_FLIGHT_LOCKS", "0") == "1"
+FLIGHTS = SingleFlight(DATA_DIR / ".cache" / "locks" if FLIGHT_LOCKS else None)
+
+# New data drops (cleaned CSVs replaced, appended to or edited in place) are
+# picked up every IMDB_RELOAD_SECONDS (0 disables) and served without a
+# restart: appended and changed rows are applied as deltas to the snapshot,
+# the datasets in memory and the running aggregates, then the new release is
+# swapped in (src/live.py). The client-side tabs' bundle is built once, so
+# they do not reload. Workers take turns through lock files, so one of them
+# refreshes the snapshot (and SQL store) and the others read the result.
+RELOAD_SECONDS = 0 if CLIENT_TABS else float(os.environ.get("IMDB_RELOAD_SECONDS", "10"))
+RELOADS = SingleFlight(DATA_DIR / ".cache" / "locks")
+RELOAD_LOCK = threading.Lock()
+
+# Figures of a tab are built concurrently; slots pick up their prefetched result.
+# Slots whose render never comes here (an abandoned view, another worker) are
+# dropped once PREFETCH_SLOTS newer ones are in flight or the release changes.
+FIGURE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="figures")
+PREFETCH_SLOTS = 64
+_PREFETCHED = OrderedDict()
+_PREFETCH_LOCK = threading.Lock()
+
+# KPI card value ids, in the order `constants_from_aggregates` returns their
+# values (computed per release by `constants`), and what they show until then
+KPI_IDS = ("kpi-works", "kpi-countries", "kpi-languages", "kpi-votes")
+KPI_PLACEHOLDER = "…"
+
+# Server-side title search; the dropdown only ever receives the top matches
+SEARCH_TOP_K = 20
+
 BRAND_COLOR = "#deb522"
 
 CARD_STYLE = {
@@ -62,18 +219,29 @@ TAB_STYLE_IDLE = {
 }
 TAB_STYLE_ACTIVE = {**TAB_STYLE_IDLE, "textDecoration": "underline"}
 
+# Placeholder shown in a figure slot until its figure arrives
+EMPTY_FIGURE = {
+    "data": [],
+    "layout": {
+        "paper_bgcolor": "black",
+        "plot_bgcolor": "black",
+        "xaxis": {"visible": False},
+        "yaxis": {"visible": False},
+    },
+}
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────────────────────
-def stats_card(title: str, value, img: str) -> html.Div:
-    """Single KPI card."""
+def stats_card(title: str, value, img: str, value_id: str) -> html.Div:
+    """Single KPI card; its value can be updated through *value_id*."""
     return html.Div(
         dbc.Card(
             [
                 dbc.CardImg(src=img, top=True, style={"width": "50px", "alignSelf": "center"}),
                 dbc.CardBody(
                     [
-                        html.P(value, style={"margin": 0, "fontSize": "22px", "fontWeight": "bold"}),
+                        html.P(value, id=value_id, style={"margin": 0, "fontSize": "22px", "fontWeight": "bold"}),
                         html.H4(title, style={"margin": 0, "fontSize": "18px", "fontWeight": "bold"}),
                     ],
                     style={"textAlign": "center"},
@@ -84,20 +252,304 @@ def stats_card(title: str, value, img: str) -> html.Div:
     )
 
 
-def wrap_figures(figures) -> html.Div:
-    """Lay out a list of Plotly figures in a 2-column grid."""
+def constants(release) -> dict:
+    """Top-level stats (`{"kpis": {value id: value}, "years": (min, max)}`) over both datasets of *release*."""
+    def compute():
+        with metrics.timed("aggregate", "constants"):
+            values = constants_from_aggregates(
+                whole_aggregates("movie", "kpi", const.MEASURES, release),
+                whole_aggregates("series", "kpi", const.MEASURES, release),
+            )
+            years = [dataset.load(["year"])[0]["year"] for dataset in release.datasets.values()]
+            return {
+                "kpis": dict(zip(KPI_IDS, values)),
+                "years": (int(min(year.min() for year in years)), int(max(year.max() for year in years))),
+            }
+
+    return release.memo("constants", compute)
+
+
+def kpis() -> dict:
+    """KPI card value id -> value shown."""
+    release = RELEASE
+    if release is None:
+        return dict.fromkeys(KPI_IDS, KPI_PLACEHOLDER)
+    return constants(release)["kpis"]
+
+
+def year_slider() -> dict:
+    """Range, selection and decade marks of the year range slider."""
+    release = RELEASE
+    year_min, year_max = (0, 0) if release is None else constants(release)["years"]
+    return {
+        "min": year_min,
+        "max": year_max,
+        "value": [year_min, year_max],
+        "marks": {year: {"label": str(year), "style": {"color": BRAND_COLOR}}
+                  for year in range(year_min - year_min % 10 + 10, year_max + 1, 10)},
+    }
+
+
+def figure_cache_key(graph_tab: str, data_tab: str, index: int, release=None) -> str:
+    """Cache key of one figure; its builder's source mtime invalidates entries on code edits."""
+    build = FIGURE_BUILDERS[graph_tab][data_tab][index]
+    code_version = Path(inspect.getsourcefile(build)).stat().st_mtime_ns
+    mode = "approximate" if APPROXIMATE else "exact"
+    version = (release or RELEASE).version
+    return f"{build.__module__}.{build.__name__}@{code_version}|{data_tab}|{version}|{wire.ENCODING_VERSION}|{mode}"
+
+
+def selection_key(selection) -> tuple:
+    """Hashable, order-independent form of a `{dimension: [values]}` selection."""
+    return tuple(sorted((dim, tuple(sorted(vals))) for dim, vals in (selection or {}).items() if vals))
+
+
+def clean_selection(selection, data_tab: str) -> dict:
+    """
+    The cross-filters of *data_tab* in a `selection` store as the client
+    sent it: only known dimensions with a non-empty list of strings are
+    kept, anything else is dropped.
+    """
+    active = selection.get(data_tab) if isinstance(selection, dict) else None
+    if not isinstance(active, dict):
+        return {}
+    return {
+        dim: vals
+        for dim, vals in active.items()
+        if dim in CROSSFILTER_DIMENSIONS and isinstance(vals, list) and vals
+        and all(isinstance(value, str) for value in vals)
+    }
+
+
+def clean_slot(slot):
+    """
+    `(graph_tab, data_tab, index, selection, years)` of a figure slot's
+    request as the client sent it, or None when it names no figure.
+    """
+    if not isinstance(slot, dict):
+        return None
+    graph_tab, data_tab, index = slot.get("graph_tab"), slot.get("data_tab"), slot.get("index")
+    if graph_tab not in FIGURE_BUILDERS or data_tab not in DATA_TABS:
+        return None
+    if not isinstance(index, int) or not 0 <= index < len(FIGURE_BUILDERS[graph_tab][data_tab]):
+        return None
+    selection = clean_selection({data_tab: slot.get("selection")}, data_tab) or None
+    return graph_tab, data_tab, index, selection, clean_years(slot.get("years"))
+
+
+def clean_years(years):
+    """A `[start, end]` pair of years as the client sent it, as ints; None when it is anything else."""
+    if not isinstance(years, list) or len(years) != 2:
+        return None
+    if not all(isinstance(year, (int, float)) and not isinstance(year, bool) for year in years):
+        return None
+    return tuple(int(year) for year in years)
+
+
+def tab_aggregates(graph_tab: str, data_tab: str, release=None):
+    """Aggregates of a tab's builders over a whole dataset, computed on first use."""
+    return whole_aggregates(data_tab, graph_tab, MEASURES_BY_TAB[graph_tab][data_tab], release)
+
+
+def filtered_aggregates(graph_tab: str, data_tab: str, key: tuple, release=None):
+    """Aggregates of a tab's builders over the works matching a selection (see `selection_key`)."""
+    release = release or RELEASE
+
+    def compute():
+        with metrics.timed("aggregate", data_tab):
+            return dataset_aggregates(data_tab, MEASURES_BY_TAB[graph_tab][data_tab], dict(key), release)
+
+    return release.memo(
+        ("aggregates", graph_tab, data_tab, key),
+        lambda: FLIGHTS.do(("aggregates", release.version, graph_tab, data_tab, key), compute),
+        bounded=True,
+    )
+
+
+def title_index(data_tab: str, release=None) -> TitleIndex:
+    release = release or RELEASE
+    return release.memo(
+        ("title index", data_tab), lambda: TitleIndex(release.datasets[data_tab].load(["title"])[0]["title"])
+    )
+
+
+def year_window(graph_tab: str, year_range, release=None):
+    """The (start, end) years a tab's figures are restricted to, or None for all years."""
+    years = clean_years(year_range)
+    if graph_tab not in YEAR_RANGE_TABS or years is None or years == constants(release or RELEASE)["years"]:
+        return None
+    return years
+
+
+def build_figure(graph_tab: str, data_tab: str, index: int, selection=None, years=None, release=None):
+    """
+    Build figure *index* of a tab combination, with its arrays as compact
+    typed arrays (see `wire.encode_figure`). *selection*
+    (`{dimension: [values]}`) restricts the data to the works matching it;
+    without one the precomputed aggregates are used. *years* (start, end)
+    restricts year-range tabs, answered from their year cubes.
+    """
+    key = selection_key(selection)
+    if key:
+        aggregates = filtered_aggregates(graph_tab, data_tab, key, release)
+    else:
+        aggregates = tab_aggregates(graph_tab, data_tab, release)
+    if years:
+        aggregates = {**aggregates, RANGE_KEY: tuple(years)}
+    build = FIGURE_BUILDERS[graph_tab][data_tab][index]
+    with metrics.timed("builder", f"{graph_tab}.{build.__name__}"):
+        return wire.encode_figure(build(aggregates))
+
+
+def build_figures(graph_tab: str, data_tab: str, selection=None, release=None):
+    """Build every figure of a tab combination and validate their count."""
+    builders = FIGURE_BUILDERS[graph_tab][data_tab]
+    expected_figs = VISUALIZATION_BUILDERS[graph_tab][1][data_tab]
+    if len(builders) != expected_figs:
+        raise ValueError(f"{graph_tab}/{data_tab} has {len(builders)} figure builders (expected {expected_figs}).")
+    return [build_figure(graph_tab, data_tab, i, selection, release=release) for i in range(len(builders))]
+
+
+def get_figure(graph_tab: str, data_tab: str, index: int, selection=None, years=None, release=None):
+    """
+    One figure: from the shared cache, or freshly built when cross-filtered
+    or year-restricted. Concurrent requests for the same figure share one
+    build (and, with IMDB_FLIGHT_LOCKS=1, one cache fill across workers).
+    """
+    release = release or RELEASE
+    key = selection_key(selection)
+    if key or years:
+        return FLIGHTS.do(
+            ("figure", release.version, graph_tab, data_tab, index, key, tuple(years or ())),
+            lambda: build_figure(graph_tab, data_tab, index, selection, years, release),
+        )
+    cache_key = figure_cache_key(graph_tab, data_tab, index, release)
+    with metrics.timed("cache", graph_tab):
+        return FLIGHTS.do(
+            cache_key,
+            lambda: FIGURE_CACHE.get_or_build(
+                cache_key, lambda: [build_figure(graph_tab, data_tab, index, release=release)]
+            )[0],
+            shared=True,
+        )
+
+
+def prefetch_figures(graph_tab: str, data_tab: str, selection=None, years=None, release=None):
+    """Start building every figure of a tab combination in the figure pool."""
+    release = release or RELEASE
+    for index in range(len(FIGURE_BUILDERS[graph_tab][data_tab])):
+        slot = (release.version, graph_tab, data_tab, index, selection_key(selection), tuple(years or ()))
+        with _PREFETCH_LOCK:
+            if slot not in _PREFETCHED:
+                _PREFETCHED[slot] = FIGURE_POOL.submit(
+                    get_figure, graph_tab, data_tab, index, selection, years, release
+                )
+            # cancelling only stops builds that have not started yet
+            for key in [key for key in _PREFETCHED if key[0] != release.version]:
+                _PREFETCHED.pop(key).cancel()
+            while len(_PREFETCHED) > PREFETCH_SLOTS:
+                _PREFETCHED.popitem(last=False)[1].cancel()
+
+
+def resolve_figure(graph_tab: str, data_tab: str, index: int, selection=None, years=None, release=None):
+    """The prefetched figure for a slot if one is in flight, else build it now."""
+    release = release or RELEASE
+    slot = (release.version, graph_tab, data_tab, index, selection_key(selection), tuple(years or ()))
+    with _PREFETCH_LOCK:
+        future = _PREFETCHED.pop(slot, None)
+    if future is not None:
+        return future.result()
+    return get_figure(graph_tab, data_tab, index, selection, years, release)
+
+
+def warm_figure_cache(release=None):
+    """Pre-render every figure of every (graph_tab, data_tab) combination, in parallel."""
+    release = release or RELEASE
+    jobs = [
+        FIGURE_POOL.submit(get_figure, graph_tab, data_tab, index, release=release)
+        for graph_tab, builders in FIGURE_BUILDERS.items()
+        for data_tab in release.datasets
+        for index in range(len(builders[data_tab]))
+    ]
+    for job in jobs:
+        job.result()
+
+
+@metrics.instrument("wrap")
+def figure_slots(graph_tab: str, data_tab: str, selection=None, years=None) -> html.Div:
+    """
+    2-column grid of empty figure slots. Each slot carries its own request
+    in a `figure-slot` store; `render_figure` fills it as soon as that one
+    figure is ready, so the cheapest chart shows first.
+    """
     return html.Div(
         [
-            html.Div(dcc.Graph(figure=fig), style={"width": "50%", "display": "inline-block"})
-            for fig in figures
+            figure_slot(
+                i,
+                {"graph_tab": graph_tab, "data_tab": data_tab, "index": i, "selection": selection, "years": years},
+            )
+            for i in range(len(FIGURE_BUILDERS[graph_tab][data_tab]))
         ]
     )
 
 
+def figure_slot(index: int, request=None) -> html.Div:
+    """Grid cell holding figure *index* and the request it is rendered from."""
+    return html.Div(
+        [
+            dcc.Store(id={"type": "figure-slot", "index": index}, data=request),
+            dcc.Loading(
+                dcc.Graph(
+                    id={"type": "figure", "index": index},
+                    figure=EMPTY_FIGURE,
+                    config={"topojsonURL": TOPOJSON_URL},
+                ),
+                type="default",
+                color=BRAND_COLOR,
+            ),
+        ],
+        id={"type": "figure-cell", "index": index},
+        style={"width": "50%", "display": "inline-block"},
+    )
+
+
+def figure_bundle_url() -> str:
+    """Serve every unfiltered figure as one compressed bundle and return its URL."""
+    figures = {
+        graph_tab: {
+            data_tab: [get_figure(graph_tab, data_tab, i) for i in range(len(builders[data_tab]))]
+            for data_tab in RELEASE.datasets
+        }
+        for graph_tab, builders in FIGURE_BUILDERS.items()
+    }
+    return figure_bundle.install(app.server, figure_bundle.encode_bundle(figures))
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Dash app
 # ──────────────────────────────────────────────────────────────────────────────
 app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], title="IMDB Data Analysis Dashboard")
+# WSGI entry point: gunicorn app:server
+server = app.server
+
+# /metrics endpoint + Server-Timing headers (IMDB_METRICS=0 disables both)
+metrics.install(app.server, outputs=lambda: app.callback_map)
+# gzip for callback responses, the layout and Dash's scripts
+wire.install(app.server)
+# /healthz (liveness) and /readyz (data loaded)
+boot.install(app.server, BOOT)
+# world geometry for the choropleth, served by us instead of Plotly's CDN
+TOPOJSON_URL = app.get_relative_path(geo.install(app.server))
+metrics.register_gauge(
+    "imdb_figure_cache_lookups",
+    "Figure cache lookups of this worker by result.",
+    lambda: {(("result", "hit"),): FIGURE_CACHE.hits, (("result", "miss"),): FIGURE_CACHE.misses},
+)
+metrics.register_gauge(
+    "imdb_single_flight_calls",
+    "Coalesced computations of this worker: run, or joined while an identical one was in flight.",
+    lambda: {(("result", "run"),): FLIGHTS.leaders, (("result", "joined"),): FLIGHTS.joined},
+)
 
 app.layout = html.Div(
     [
@@ -121,15 +573,23 @@ app.layout = html.Div(
                             ),
                             width=6,
                         ),
+                        dbc.Col(
+                            [
+                                dcc.Dropdown(id="title-search", options=[], placeholder="Search a title…",
+                                             style={"marginTop": "15px"}),
+                                html.Div(id="title-details", style={"color": BRAND_COLOR, "fontSize": "14px"}),
+                            ],
+                            width=4,
+                        ),
                     ]
                 ),
                 # ── KPI cards ─────────────────────────────────────────────
                 dbc.Row(
                     [
-                        dbc.Col(stats_card("Work", NUM_WORKS, "./assets/movie-icon.png"), width=3),
-                        dbc.Col(stats_card("Language", NUM_LANGUAGES, "./assets/language-icon.svg"), width=3),
-                        dbc.Col(stats_card("Country", NUM_COUNTRIES, "./assets/country-icon.png"), width=3),
-                        dbc.Col(stats_card("Average Votes", AVG_VOTES, "./assets/vote-icon.png"), width=3),
+                        dbc.Col(stats_card("Work", KPI_PLACEHOLDER, "./assets/movie-icon.png", "kpi-works"), width=3),
+                        dbc.Col(stats_card("Language", KPI_PLACEHOLDER, "./assets/language-icon.svg", "kpi-languages"), width=3),
+                        dbc.Col(stats_card("Country", KPI_PLACEHOLDER, "./assets/country-icon.png", "kpi-countries"), width=3),
+                        dbc.Col(stats_card("Average Votes", KPI_PLACEHOLDER, "./assets/vote-icon.png", "kpi-votes"), width=3),
                     ],
                     style={"marginBlock": "10px"},
                 ),
@@ -149,10 +609,32 @@ app.layout = html.Div(
                         style={"padding": 0},
                     )
                 ),
-                # ── Dynamic figures ───────────────────────────────────────
+                # ── Active cross-filters ──────────────────────────────────
                 dbc.Row(
-                    dcc.Loading(html.Div(id="tabs-content"), type="default", color=BRAND_COLOR)
+                    [
+                        dbc.Col(html.Div(id="active-filters", style={"color": BRAND_COLOR}), width=10),
+                        dbc.Col(
+                            dbc.Button("Clear filters", id="clear-filters", size="sm",
+                                       style={"backgroundColor": BRAND_COLOR, "border": "none", "color": "black"}),
+                            width=2,
+                        ),
+                    ],
+                    style={"marginBlock": "10px"},
                 ),
+                # ── Year range (Parental Guide / Year tabs) ───────────────
+                dbc.Row(
+                    dcc.RangeSlider(id="year-range", step=1, tooltip={"placement": "bottom"}, **year_slider()),
+                    id="year-range-row",
+                    style={"marginBlock": "10px"},
+                ),
+                dcc.Store(id="selection", data={}),
+                # Polls for the data of a page served while starting (IMDB_BACKGROUND_BOOT=1)
+                dcc.Interval(id="boot-poll", interval=500, disabled=False),
+                # Preloaded figures (IMDB_CLIENT_TABS=1 only)
+                dcc.Store(id="figure-bundle-url"),
+                dcc.Store(id="figure-bundle"),
+                # ── Dynamic figures ───────────────────────────────────────
+                dbc.Row(html.Div(id="tabs-content")),
             ],
             style={"padding": 0},
         )
@@ -163,17 +645,280 @@ app.layout = html.Div(
 # ──────────────────────────────────────────────────────────────────────────────
 # Callbacks
 # ──────────────────────────────────────────────────────────────────────────────
-@app.callback(Output("tabs-content", "children"), Input("graph-tabs", "value"), Input("data-tabs", "value"))
-def update_tab(graph_tab: str, data_tab: str):
-    """Render the correct set of figures based on tab selections."""
-    data, splits = DATA_BY_TAB[data_tab]
-    builder, expected_figs = VISUALIZATION_BUILDERS[graph_tab]
+@metrics.instrument("callback")
+def update_tab(graph_tab: str, data_tab: str, selection=None, year_range=None):
+    """Lay out the figure slots for the tab selections and cross-filters; figures follow per slot."""
+    BOOT.wait(BOOT_WAIT_SECONDS)
+    release = RELEASE
+    active = clean_selection(selection, data_tab) or None
+    years = year_window(graph_tab, year_range, release)
+
+    def layout():
+        prefetch_figures(graph_tab, data_tab, active, years, release)
+        return figure_slots(graph_tab, data_tab, active, years)
+
+    return FLIGHTS.do(("update_tab", release.version, graph_tab, data_tab, selection_key(active), years), layout)
+
+
+if not CLIENT_TABS:
+    app.callback(
+        Output("tabs-content", "children"),
+        Input("graph-tabs", "value"),
+        Input("data-tabs", "value"),
+        Input("selection", "data"),
+        Input("year-range", "value"),
+    )(update_tab)
+
+
+@app.callback(
+    Output({"type": "figure", "index": MATCH}, "figure"),
+    Input({"type": "figure-slot", "index": MATCH}, "data"),
+)
+@metrics.instrument("callback")
+def render_figure(slot):
+    """Fill one figure slot (fired per slot, so slots render independently)."""
+    request = clean_slot(slot)
+    if request is None:
+        raise PreventUpdate
+    BOOT.wait(BOOT_WAIT_SECONDS)
+    return resolve_figure(*request)
+
+
+# Show the year slider only on the tabs it applies to (no server round trip)
+app.clientside_callback(
+    f"function (tab) {{ return {json.dumps(YEAR_RANGE_TABS)}.includes(tab) ? {{marginBlock: '10px'}} : {{display: 'none'}}; }}",
+    Output("year-range-row", "style"),
+    Input("graph-tabs", "value"),
+)
+
+
+@app.callback(
+    Output("selection", "data"),
+    Input({"type": "figure", "index": ALL}, "clickData"),
+    Input("clear-filters", "n_clicks"),
+    State("selection", "data"),
+    State("graph-tabs", "value"),
+    State("data-tabs", "value"),
+    prevent_initial_call=True,
+)
+def update_selection(_click_data, _clear_clicks, selection, graph_tab: str, data_tab: str):
+    """Toggle the clicked value in the cross-filter selection of the current dataset."""
+    if ctx.triggered_id == "clear-filters":
+        return {}
+
+    click = ctx.triggered[0]["value"] if ctx.triggered else None
+    target = CROSSFILTERS.get(graph_tab, {}).get(ctx.triggered_id["index"]) if click else None
+    if target is None:
+        raise PreventUpdate
+
+    dimension, field = target
+    value = click["points"][0].get(field)
+    if not isinstance(value, str):
+        raise PreventUpdate
 
-    figures = builder(data, splits)
-    if len(figures) != expected_figs:
-        raise ValueError(f"{builder.__name__} returned {len(figures)} figures (expected {expected_figs}).")
+    current = {dim: list(vals) for dim, vals in clean_selection(selection, data_tab).items()}
+    selection = dict(selection) if isinstance(selection, dict) else {}
+    values = current.setdefault(dimension, [])
+    if value in values:
+        values.remove(value)
+    else:
+        values.append(value)
+    selection[data_tab] = {dim: vals for dim, vals in current.items() if vals}
+    return selection
 
-    return wrap_figures(figures)
+
+@app.callback(
+    Output("title-search", "options"),
+    Input("title-search", "search_value"),
+    State("title-search", "value"),
+    State("data-tabs", "value"),
+)
+def search_titles(search_value, current, data_tab: str):
+    """Top-k prefix/fuzzy title matches for the text typed in the dropdown."""
+    if not search_value:
+        if current:
+            return [{"label": current, "value": current}]
+        raise PreventUpdate
+    BOOT.wait(BOOT_WAIT_SECONDS)
+    matches = title_index(data_tab).search(search_value, SEARCH_TOP_K)
+    # `search` makes the dropdown's own client-side filter keep fuzzy matches
+    return [{"label": t, "value": t, "search": search_value} for t in matches]
+
+
+@app.callback(Output("title-details", "children"), Input("title-search", "value"), State("data-tabs", "value"))
+def show_title(title, data_tab: str):
+    """Rating, votes and year of the picked title."""
+    if not title:
+        return ""
+    BOOT.wait(BOOT_WAIT_SECONDS)
+    data, _ = RELEASE.datasets[data_tab].load(["title", "rating", "votes", "year"])
+    match = data[data["title"] == title]
+    if match.empty:
+        return ""
+    work = match.iloc[0]
+    return f"★ {work['rating']}  ·  {int(work['votes']):,} votes  ·  {str(work['year'])[:4]}"
+
+
+@app.callback(Output("active-filters", "children"), Input("selection", "data"), Input("data-tabs", "value"))
+def show_selection(selection, data_tab: str):
+    """One-line summary of the active cross-filters."""
+    active = clean_selection(selection, data_tab)
+    if not active:
+        return "Click a bar, country or slice to filter every chart."
+    return "Filtered by " + "; ".join(f"{dim}: {', '.join(vals)}" for dim, vals in active.items())
+
+
+@app.callback(
+    [Output(value_id, "children") for value_id in kpis()]
+    + [Output("year-range", prop) for prop in year_slider()]
+    + [Output("boot-poll", "disabled")],
+    Input("boot-poll", "n_intervals"),
+    prevent_initial_call=True,
+)
+def show_startup(_n_intervals):
+    """Fill in the KPI cards and year slider of a page served before the data was in."""
+    if not BOOT.ready.is_set():
+        raise PreventUpdate
+    BOOT.wait()
+    return [*kpis().values(), *year_slider().values(), True]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Startup
+# ──────────────────────────────────────────────────────────────────────────────
+def fill_layout():
+    """Put the computed KPIs and year range into the layout served from now on."""
+    for value_id, value in kpis().items():
+        app.layout[value_id].children = value
+    for prop, value in year_slider().items():
+        setattr(app.layout["year-range"], prop, value)
+    app.layout["boot-poll"].disabled = True
+
+
+def sql_store(release):
+    """The SQL store (IMDB_BACKEND) of *release*'s data; one worker (re)builds it while the others wait."""
+    return RELOADS.do(
+        ("sql store", BACKEND),
+        lambda: open_store(
+            DATA_DIR / ".cache",
+            BACKEND,
+            # a throwaway full load, only when the store is missing or stale
+            lambda: {name: LazyDataset(DATA_DIR, name, entry=dataset.entry).load_all()
+                     for name, dataset in release.datasets.items()},
+            release.version,
+        ),
+        shared=True,
+    )
+
+
+def load_plotting():
+    """
+    Import plotly.express (the tabs' builders only import it when they run)
+    and draw a throwaway chart of every kind the tabs use: plotly fills in
+    its shared default template on first use, which is not thread-safe, so
+    this runs before the figure pool builds figures on several threads.
+    """
+    import pandas as pd
+    import plotly.express as px
+
+    frame = pd.DataFrame({"name": ["USA"], "value": [1]})
+    px.bar(frame, x="name", y="value")
+    px.line(frame, x="name", y="value")
+    px.pie(frame, names="name", values="value")
+    px.treemap(frame, path=["name"], values="value")
+    px.choropleth(frame, locations="name", color="value")
+
+
+def startup():
+    """Open the data and compute everything the first page needs from it."""
+    global RELEASE
+
+    with BOOT.step("snapshot"):
+        release = live.Release({name: LazyDataset(DATA_DIR, name) for name in DATA_TABS})
+
+    if BACKEND != "pandas":
+        with BOOT.step("sql store"):
+            release.store = sql_store(release)
+
+    with BOOT.step("constants"), metrics.timed("aggregate", "startup"):
+        constants(release)
+        RELEASE = release
+        fill_layout()
+
+    with BOOT.step("plotting"):
+        load_plotting()
+
+    with BOOT.step("figure cache"):
+        warm_figure_cache(release)
+
+
+def reload_data():
+    """
+    Serve the data as it is on disk now: refresh the snapshots, make the
+    next release from the drop (`live.advance`), compute what every page
+    shows from it and swap it in. Nothing happens when no dataset changed.
+    """
+    global RELEASE
+
+    BOOT.wait()
+    with RELOAD_LOCK:
+        current = RELEASE
+        entries = RELOADS.do(
+            ("snapshot",),
+            lambda: {name: refresh(DATA_DIR, name, dataset.entry) for name, dataset in current.datasets.items()},
+            shared=True,
+        )
+        release = live.advance(current, entries)
+        if release is current:
+            return
+        with metrics.timed("load", "reload"):
+            if BACKEND != "pandas":
+                release.store = sql_store(release)
+            constants(release)
+            warm_figure_cache(release)
+        RELEASE = release
+        fill_layout()
+
+
+WATCHER = live.Watcher(
+    [DATA_DIR / source for sources in SOURCES.values() for source in sources], reload_data, RELOAD_SECONDS
+)
+metrics.register_gauge(
+    "imdb_data_reloads",
+    "Data drops this worker noticed, by whether it now serves them.",
+    lambda: {(("result", "ok"),): WATCHER.reloads, (("result", "failed"),): WATCHER.failures},
+)
+if RELOAD_SECONDS:
+    # started per worker process on its first request (threads do not survive a fork)
+    app.server.before_request(WATCHER.start)
+
+BOOT.run(startup, background=BACKGROUND_BOOT)
+
+if CLIENT_TABS:
+    # Fixed slots, filled from the preloaded bundle by `figures.switch_tab`;
+    # cross-filtered views are requested through the slots' stores.
+    slots = max(len(builders) for by_data in FIGURE_BUILDERS.values() for builders in by_data.values())
+    app.layout["tabs-content"].children = html.Div([figure_slot(i) for i in range(slots)])
+    app.layout["figure-bundle-url"].data = app.get_relative_path(figure_bundle_url())
+    app.clientside_callback(
+        ClientsideFunction("figures", "load_bundle"),
+        Output("figure-bundle", "data"),
+        Input("figure-bundle-url", "data"),
+    )
+    app.clientside_callback(
+        ClientsideFunction("figures", "switch_tab"),
+        Output({"type": "figure", "index": ALL}, "figure", allow_duplicate=True),
+        Output({"type": "figure-slot", "index": ALL}, "data"),
+        Output({"type": "figure-cell", "index": ALL}, "style"),
+        Input("graph-tabs", "value"),
+        Input("data-tabs", "value"),
+        Input("selection", "data"),
+        Input("year-range", "value"),
+        Input("figure-bundle", "data"),
+        State("year-range", "min"),
+        State("year-range", "max"),
+        prevent_initial_call=True,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+// Client-side tab switching (IMDB_CLIENT_TABS=1): every precomputed figure is
+// fetched once as a bundle, after which switching tabs never reaches the server.
+// Cross-filtered and year-restricted views still go through the server-side
+// `render_figure`.
+const YEAR_RANGE_TABS = ["parental", "year"];  // app.YEAR_RANGE_TABS
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    figures: {
+        load_bundle: function (url) {
+            return fetch(url).then(function (response) {
+                return response.json();
+            });
+        },
+
+        switch_tab: function (graphTab, dataTab, selection, yearRange, bundle, yearMin, yearMax) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!bundle) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const figures = bundle[graphTab][dataTab];
+            const active = (selection || {})[dataTab];
+            const years = YEAR_RANGE_TABS.includes(graphTab) && yearRange
+                && (yearRange[0] !== yearMin || yearRange[1] !== yearMax) ? yearRange : null;
+            const filtered = (!!active && Object.keys(active).length > 0) || years !== null;
+            const slots = window.dash_clientside.callback_context.outputs_list[0].length;
+
+            const outFigures = [];
+            const outRequests = [];
+            const outStyles = [];
+            for (let i = 0; i < slots; i++) {
+                const shown = i < figures.length;
+                outStyles.push(shown ? {width: "50%", display: "inline-block"} : {display: "none"});
+                outFigures.push(shown && !filtered ? figures[i] : noUpdate);
+                outRequests.push(
+                    shown && filtered
+                        ? {graph_tab: graphTab, data_tab: dataTab, index: i, selection: active || null, years: years}
+                        : noUpdate
+                );
+            }
+            return [outFigures, outRequests, outStyles];
+        },
+    },
+});
@@ -0,0 +1,11 @@
+"""
+Performance benchmarks for the IMDB dashboard.
+
+    python -m benchmarks run --sizes 10000,100000 --out results.json
+    python -m benchmarks compare baseline.json results.json
+
+Every dataset (the shipped CSVs or a synthetic one) is copied/generated into
+its own temporary data directory and benchmarked in a fresh interpreter
+pointed at it through IMDB_DATA_DIR, so import-time numbers are honest and
+the real data/.cache is never touched.
+"""
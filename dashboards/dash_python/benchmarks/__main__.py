@@ -0,0 +1,151 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.datasets import prepare_shipped, prepare_synthetic
+from benchmarks.suite import APP_DIR, run_dataset
+
+# Fields that identify one measurement across result files
+KEY_FIELDS = ("dataset", "benchmark", "data_tab", "graph_tab", "column")
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cmd_run(args):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="imdb-bench-") as tmp:
+        datasets = []
+        if not args.no_shipped:
+            datasets.append(("shipped", prepare_shipped(Path(tmp) / "shipped")))
+        for size in args.sizes:
+            label = f"synthetic-{size}"
+            print(f"generating {label} ...", file=sys.stderr)
+            datasets.append((label, prepare_synthetic(Path(tmp) / label, size)))
+
+        for label, data_dir in datasets:
+            print(f"benchmarking {label} ...", file=sys.stderr)
+            results.extend(run_dataset(label, data_dir, args.repeat))
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text)
+    else:
+        print(text)
+
+
+def cmd_load(args):
+    from benchmarks import load
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="imdb-load-") as tmp:
+        data_dir = prepare_synthetic(Path(tmp) / "data", args.size) if args.size else None
+        for config in args.config or ["1x1"]:
+            workers, threads = load.parse_config(config)
+            print(f"loading {workers} worker(s) x {threads} thread(s) with {args.clients} clients ...", file=sys.stderr)
+            rows.append(load.run_config(
+                workers, threads, clients=args.clients, duration=args.duration, warmup=args.warmup,
+                think=args.think, filter_rate=args.filter_rate, data_dir=data_dir, preload=args.preload,
+            ))
+
+    print(load.format_report(rows))
+    if args.out:
+        report = {"meta": {"revision": _git_revision(), "python": platform.python_version(),
+                           "platform": platform.platform(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                           "size": args.size}, "results": rows}
+        Path(args.out).write_text(json.dumps(report, indent=2))
+
+
+def cmd_incremental(args):
+    from benchmarks import incremental
+
+    sys.exit(0 if incremental.run(args.size, args.start) else 1)
+
+
+def _key(row):
+    return tuple(row.get(f) for f in KEY_FIELDS)
+
+
+def cmd_compare(args):
+    old = {_key(r): r for r in json.loads(Path(args.baseline).read_text())["results"]}
+    new = {_key(r): r for r in json.loads(Path(args.candidate).read_text())["results"]}
+
+    regressions = 0
+    for key in sorted(old.keys() & new.keys(), key=str):
+        before, after = old[key]["median_ms"], new[key]["median_ms"]
+        ratio = after / before if before else float("inf")
+        flag = ""
+        if ratio > args.threshold and after - before > args.min_ms:
+            flag = "  REGRESSION"
+            regressions += 1
+        label = " ".join(str(k) for k in key if k is not None)
+        print(f"{label:<70} {before:10.2f} -> {after:10.2f} ms  x{ratio:5.2f}{flag}")
+
+    print(f"\n{regressions} regression(s) above x{args.threshold}")
+    sys.exit(1 if regressions else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the benchmark suite")
+    run.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",") if x],
+                     default=[10_000, 100_000, 1_000_000], help="synthetic dataset sizes (works)")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--no-shipped", action="store_true", help="skip the shipped CSVs")
+    run.add_argument("--out", help="write JSON results here instead of stdout")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio to flag")
+    compare.add_argument("--min-ms", type=float, default=1.0, help="ignore slowdowns below this many ms")
+    compare.set_defaults(func=cmd_compare)
+
+    load = sub.add_parser("load", help="load-test the app under gunicorn with concurrent simulated users")
+    load.add_argument("--config", action="append", metavar="WORKERSxTHREADS",
+                      help="gunicorn workers x threads, repeatable (default: 1x1)")
+    load.add_argument("--clients", type=int, default=20, help="concurrent simulated users")
+    load.add_argument("--duration", type=float, default=30.0, help="measured seconds per configuration")
+    load.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before that")
+    load.add_argument("--think", type=float, default=1.0, help="mean seconds between a user's clicks (0: none)")
+    load.add_argument("--filter-rate", type=float, default=0.2,
+                      help="share of clicks with a cross-filter or narrowed year window")
+    load.add_argument("--size", type=int, help="serve a synthetic dataset of this many works (default: shipped data)")
+    load.add_argument("--preload", action="store_true", help="import the app once in the master (gunicorn --preload)")
+    load.add_argument("--out", help="also write the JSON rows here")
+    load.set_defaults(func=cmd_load)
+
+    check = sub.add_parser("incremental", help="check data drops applied as deltas against full recomputes")
+    check.add_argument("--size", type=int, help="check a synthetic dataset of this many works (default: shipped data)")
+    check.add_argument("--start", type=float, default=0.85, help="share of the rows served before the first drop")
+    check.set_defaults(func=cmd_incremental)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from src.synthetic import DATA_FILES, fit_profile, write_dataset
+
+SHIPPED_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def prepare_shipped(target):
+    """Copy the shipped cleaned CSVs into *target*."""
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+    for name in DATA_FILES.values():
+        shutil.copy2(SHIPPED_DIR / name, target / name)
+    return target
+
+
+def prepare_synthetic(target, works, seed=0):
+    """
+    Write synthetic cleaned CSVs with *works* rows in total (movies:series
+    in the shipped ratio) into *target*, fitted on the shipped data.
+    """
+    frames = {kind: pd.read_csv(SHIPPED_DIR / name) for kind, name in DATA_FILES.items()}
+    total = sum(len(df) for df in frames.values())
+    for kind, frame in frames.items():
+        n = max(1, round(works * len(frame) / total))
+        write_dataset(target, fit_profile(frame, kind), n, seed=seed)
+    return Path(target)
@@ -0,0 +1,163 @@
+"""
+Check that a data drop applied as a delta serves the same aggregates as a
+full recompute.
+
+    python -m benchmarks incremental                 # shipped data
+    python -m benchmarks incremental --size 100000   # synthetic data
+
+On a copy of the cleaned CSVs, every dataset starts from the first
+`--start` share of its rows and then takes three drops, each refreshed and
+advanced exactly as the app does (`snapshot.refresh`, `live.advance`):
+
+  append    the remaining rows appended to the CSV (a delta)
+  change    a few rows edited in place, including new split values and a
+            value removed (a delta)
+  remove    the last rows dropped (a full rebuild)
+
+After each drop the running tallies of every measure (`release.state(...)
+.result()`) must equal `compute_aggregates` over the rows served, and the
+rows served must equal a cold start on the new snapshot. Appends are
+compared strictly; after in-place changes, values new to a dataset sort in
+arrival order in memory but in first-appearance order on a cold start, so
+that comparison ignores category order. Exits 1 on any mismatch.
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.datasets import prepare_shipped, prepare_synthetic
+from src import const, dash1, dash2, dash3, dash4, live
+from src.aggregates import compute_aggregates, merge_measures, requirements
+from src.snapshot import SOURCES, LazyDataset, refresh
+from src.year_cube import YearCube
+
+# Every builder's + the KPI cards' measures, as app.MEASURES
+MEASURES = merge_measures(const.MEASURES, dash1.MEASURES, dash2.MEASURES, dash3.MEASURES, dash4.RUN_MEASURES)
+
+# Year ranges year cubes are compared over, besides all years
+CUBE_RANGES = ((1990, 2005), (2010, 2024))
+
+
+def compare(expected, actual, path=""):
+    """Raise AssertionError, naming where, unless two aggregate results are equal."""
+    if isinstance(expected, YearCube):
+        for query in ("by_group", "by_year"):
+            for years in ((None, None), *CUBE_RANGES):
+                compare(getattr(expected, query)(*years), getattr(actual, query)(*years), f"{path}.{query}{years}")
+        return
+    if isinstance(expected, dict):
+        assert set(expected) == set(actual), f"{path}: keys {sorted(set(expected) ^ set(actual))}"
+        for key in expected:
+            compare(expected[key], actual[key], f"{path}.{key}")
+        return
+    if isinstance(expected, pd.DataFrame):
+        assert list(expected.columns) == list(actual.columns), f"{path}: columns"
+        assert len(expected) == len(actual), f"{path}: {len(expected)} rows, got {len(actual)}"
+        for column in expected.columns:
+            _compare_values(expected[column].to_numpy(), actual[column].to_numpy(), f"{path}.{column}")
+        return
+    if isinstance(expected, (list, np.ndarray)):
+        expected, actual = np.asarray(expected), np.asarray(actual)
+        assert expected.shape == actual.shape, f"{path}: shape {expected.shape}, got {actual.shape}"
+        _compare_values(expected, actual, path)
+        return
+    if isinstance(expected, float):
+        assert np.isclose(expected, actual, rtol=1e-9, equal_nan=True), f"{path}: {expected}, got {actual}"
+        return
+    assert expected == actual, f"{path}: {expected!r}, got {actual!r}"
+
+
+def _compare_values(expected, actual, path):
+    if expected.dtype.kind in "fiub" and actual.dtype.kind in "fiub":
+        ok = np.allclose(expected.astype(float), actual.astype(float), rtol=1e-9, equal_nan=True)
+    else:
+        ok = (expected.astype(str) == actual.astype(str)).all()
+    assert ok, f"{path}: values differ"
+
+
+def _rows(frame, splits):
+    """A dataset's rows as plain strings, whatever order its categories are in."""
+    return frame.astype(str), {
+        sheet: table[["row_id", sheet]].astype(str).reset_index(drop=True) for sheet, table in splits.items()
+    }
+
+
+def _drops(frame):
+    """`[(label, csv rows after the drop, appended only)]`, the first taking the CSV back to *frame*."""
+    changed = frame.copy()
+    edit = changed.index[:: max(1, len(changed) // 5)][:5]
+    changed.loc[edit, "votes"] = changed.loc[edit, "votes"] * 3 + 1
+    for column, value in (("genre", "Check Genre, Drama"), ("country", "Check Country"), ("parentalguide", "Check")):
+        if column in changed.columns:
+            changed.loc[edit[1], column] = value
+    if "language" in changed.columns:
+        changed.loc[edit[2], "language"] = np.nan
+    return [
+        ("append", frame, True),
+        ("change", changed, False),
+        ("remove", changed.iloc[: len(changed) - max(1, len(changed) // 50)], False),
+    ]
+
+
+def check_dataset(data_dir, name, start=0.85, out=print):
+    """Run the drops on dataset *name* of *data_dir* (rewritten in place); see the module docstring."""
+    path = Path(data_dir) / SOURCES[name][0]
+    full = pd.read_csv(path)
+    head = int(len(full) * start)
+    full.iloc[:head].to_csv(path, index=False)
+
+    columns, sheets = requirements(MEASURES)
+    release = live.Release({name: LazyDataset(data_dir, name)})
+    release.state(name, "check", MEASURES)  # the tallies every drop is applied to
+
+    for label, rows, appended in _drops(full):
+        if appended:
+            with open(path, "a") as fh:
+                fh.write(rows.iloc[head:].to_csv(index=False, header=False))
+        else:
+            rows.to_csv(path, index=False)
+
+        begin = time.perf_counter()
+        entry = refresh(data_dir, name, release.datasets[name].entry)
+        release = live.advance(release, {name: entry})
+        served = release.datasets[name].load(columns, sheets)
+        result = release.state(name, "check", MEASURES).result()
+        seconds = time.perf_counter() - begin
+
+        compare(compute_aggregates(*served, MEASURES), result, f"{name}.{label}")
+        cold = LazyDataset(data_dir, name, entry=entry).load(columns, sheets)
+        if appended:
+            compare(compute_aggregates(*cold, MEASURES), result, f"{name}.{label}.cold")
+        expected_frame, expected_splits = _rows(*cold)
+        frame, splits = _rows(*served)
+        pd.testing.assert_frame_equal(expected_frame, frame[expected_frame.columns])
+        for sheet, table in expected_splits.items():
+            pd.testing.assert_frame_equal(table, splits[sheet])
+
+        kind = "delta" if entry.get("base") else "rebuild"
+        out(f"{name:<8} {label:<8} {kind:<8} {len(served[0]):>9,} rows  {seconds * 1000:8.1f} ms  ok")
+
+
+def run(size=None, start=0.85, out=print):
+    """Check every dataset on a copy of the shipped data, or on *size* synthetic works; False on a mismatch."""
+    with tempfile.TemporaryDirectory(prefix="imdb-incremental-") as tmp:
+        source = prepare_synthetic(Path(tmp) / "source", size) if size else prepare_shipped(Path(tmp) / "source")
+        ok = True
+        for name in SOURCES:
+            data_dir = Path(tmp) / name
+            shutil.copytree(source, data_dir, ignore=shutil.ignore_patterns(".cache"))
+            try:
+                check_dataset(data_dir, name, start, out)
+            except AssertionError as error:
+                out(f"{name:<8} MISMATCH  {error}")
+                ok = False
+        return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
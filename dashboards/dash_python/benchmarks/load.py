@@ -0,0 +1,384 @@
+"""
+Concurrent-user load test of the dashboard under gunicorn.
+
+    python -m benchmarks load --config 1x1 --config 2x4 --clients 50 --duration 30
+
+Every `--config WORKERSxTHREADS` boots `app:server` under its own gunicorn
+master, then `--clients` simulated users replay tab-click sessions against
+`/_dash-update-component` for `--duration` seconds, as a browser does: one
+`update_tab` per click followed by a `render_figure` per figure slot it
+returns, some clicks with a year window or a cross-filter, with a think time
+between clicks. The report gives throughput, p50/p95/p99 latency, the error
+rate and every worker's resident memory, one row per configuration.
+
+The load generator runs on the same machine as the server; on few cores it
+competes with the workers for CPU, so compare configurations against each
+other rather than reading the numbers as absolute capacity.
+"""
+import gzip
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.suite import APP_DIR, _render_figure_requests
+
+UPDATE_PATH = "/_dash-update-component"
+HEADERS = {"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+
+# Directory every booted worker leaves its pid in (gunicorn `post_worker_init`)
+READY_DIR_ENV = "IMDB_LOAD_READY_DIR"
+
+# Cross-filter values a simulated user may click, per dimension (app CROSSFILTER dims)
+FILTER_VALUES = {
+    "genre": ["Drama", "Comedy", "Action", "Crime"],
+    "parentalguide": ["Adults", "Teens - Age above 12"],
+    "country": ["United States", "United Kingdom", "France"],
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Server
+# ──────────────────────────────────────────────────────────────────────────────
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _request(conn, method, path, body=None):
+    """`(status, decoded body)` of one request on a keep-alive connection."""
+    try:
+        conn.request(method, path, body=body, headers=HEADERS)
+        response = conn.getresponse()
+    except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+        # the server dropped the idle connection (gunicorn's keep-alive
+        # timeout); like a browser, retry once on a fresh one
+        conn.close()
+        conn.request(method, path, body=body, headers=HEADERS)
+        response = conn.getresponse()
+    data = response.read()
+    if response.getheader("Content-Encoding") == "gzip":
+        data = gzip.decompress(data)
+    if response.getheader("Connection", "").lower() == "close":
+        conn.close()  # http.client reconnects on the next request
+    return response.status, data
+
+
+class Server:
+    """`app:server` under a gunicorn master with *workers* x *threads*."""
+
+    def __init__(self, workers, threads, data_dir=None, preload=False, boot_timeout=300):
+        self.workers, self.threads = workers, threads
+        self.port = _free_port()
+        self.ready_dir = tempfile.TemporaryDirectory(prefix="imdb-load-")
+        env = {**os.environ, READY_DIR_ENV: self.ready_dir.name}
+        if data_dir:
+            env["IMDB_DATA_DIR"] = str(data_dir)
+        command = [
+            sys.executable, "-m", "gunicorn", "app:server",
+            "--bind", f"127.0.0.1:{self.port}",
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--timeout", str(boot_timeout),
+            "--log-level", "warning",
+            "--config", "python:benchmarks.load",
+        ] + (["--preload"] if preload else [])
+        self.process = subprocess.Popen(command, cwd=APP_DIR, env=env)
+        self._wait_ready(boot_timeout)
+
+    def _wait_ready(self, timeout):
+        """
+        Block until every worker has imported the app (see `post_worker_init`)
+        and `/readyz` reports the data loaded (IMDB_BACKGROUND_BOOT=1 imports
+        before it loads).
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with status {self.process.returncode}")
+            if len(os.listdir(self.ready_dir.name)) >= self.workers:
+                conn = self.connect()
+                try:
+                    if _request(conn, "GET", "/readyz")[0] == 200:
+                        return
+                except OSError:
+                    pass
+                finally:
+                    conn.close()
+            time.sleep(0.5)
+        self.stop()
+        raise TimeoutError(f"gunicorn not ready after {timeout} s")
+
+    def connect(self, timeout=60):
+        return http.client.HTTPConnection("127.0.0.1", self.port, timeout=timeout)
+
+    def worker_pids(self):
+        """PIDs of the master's worker processes (Linux /proc)."""
+        try:
+            path = Path(f"/proc/{self.process.pid}/task/{self.process.pid}/children")
+            return [int(pid) for pid in path.read_text().split()]
+        except OSError:
+            return []
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.ready_dir.cleanup()
+
+
+def post_worker_init(worker):
+    """gunicorn hook (this module doubles as the config file): the worker has loaded the app."""
+    ready_dir = os.environ.get(READY_DIR_ENV)
+    if ready_dir:
+        Path(ready_dir, str(worker.pid)).touch()
+
+
+def rss_mb(pid):
+    """Resident set size of *pid* in MB, or None once it is gone."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler(threading.Thread):
+    """Peak RSS of every worker of *server*, sampled every *interval* seconds."""
+
+    def __init__(self, server, interval=0.5):
+        super().__init__(daemon=True)
+        self.server, self.interval = server, interval
+        self.peak = {}
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.is_set():
+            self.sample()
+            self.done.wait(self.interval)
+
+    def sample(self):
+        for pid in self.server.worker_pids():
+            rss = rss_mb(pid)
+            if rss is not None:
+                self.peak[pid] = max(rss, self.peak.get(pid, 0.0))
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        self.sample()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Simulated users
+# ──────────────────────────────────────────────────────────────────────────────
+def _find(component, component_id):
+    """Props of the component with *component_id* in a `/_dash-layout` tree."""
+    if isinstance(component, list):
+        for child in component:
+            found = _find(child, component_id)
+            if found is not None:
+                return found
+        return None
+    if not isinstance(component, dict):
+        return None
+    props = component.get("props", {})
+    if props.get("id") == component_id:
+        return props
+    return _find(props.get("children"), component_id)
+
+
+def layout_choices(conn):
+    """Graph tabs, data tabs and the year slider's range, from the served layout."""
+    status, body = _request(conn, "GET", "/_dash-layout")
+    if status != 200:
+        raise RuntimeError(f"/_dash-layout answered {status}")
+    layout = json.loads(body)
+    tabs = {
+        name: [tab["props"]["value"] for tab in _find(layout, name)["children"]]
+        for name in ("graph-tabs", "data-tabs")
+    }
+    slider = _find(layout, "year-range")
+    return tabs["graph-tabs"], tabs["data-tabs"], (slider["min"], slider["max"])
+
+
+def update_tab_request(graph_tab, data_tab, selection=None, year_range=None):
+    return {
+        "output": "tabs-content.children",
+        "outputs": {"id": "tabs-content", "property": "children"},
+        "inputs": [
+            {"id": "graph-tabs", "property": "value", "value": graph_tab},
+            {"id": "data-tabs", "property": "value", "value": data_tab},
+            {"id": "selection", "property": "data", "value": selection or {}},
+            {"id": "year-range", "property": "value", "value": year_range},
+        ],
+        "changedPropIds": ["graph-tabs.value"],
+    }
+
+
+def clicks(rng, graph_tabs, data_tabs, years, filter_rate):
+    """
+    Endless click sequence of one user: starts on the first tabs, then mostly
+    switches graph tab, sometimes dataset; a *filter_rate* share of clicks
+    carries a cross-filter or a narrowed year window.
+    """
+    graph_tab, data_tab = graph_tabs[0], data_tabs[0]
+    while True:
+        selection, year_range = {}, None
+        if rng.random() < filter_rate:
+            if rng.random() < 0.5:
+                first = rng.randint(years[0], years[1])
+                year_range = [first, rng.randint(first, years[1])]
+            else:
+                dim = rng.choice(sorted(FILTER_VALUES))
+                selection = {data_tab: {dim: [rng.choice(FILTER_VALUES[dim])]}}
+        yield update_tab_request(graph_tab, data_tab, selection, year_range)
+        if rng.random() < 0.25 and len(data_tabs) > 1:
+            data_tab = rng.choice([t for t in data_tabs if t != data_tab])
+        else:
+            graph_tab = rng.choice([t for t in graph_tabs if t != graph_tab] or graph_tabs)
+
+
+class Client(threading.Thread):
+    """One simulated user on its own keep-alive connection."""
+
+    def __init__(self, server, choices, seed, think, start_at, stop_at, record_from):
+        super().__init__(daemon=True)
+        self.server, self.choices = server, choices
+        self.rng = random.Random(seed)
+        self.think, self.start_at, self.stop_at, self.record_from = think, start_at, stop_at, record_from
+        # (callback, ms, ok) per request and ms per click, measured after the warm-up
+        self.requests = []
+        self.clicks = []
+
+    def post(self, conn, callback, payload):
+        start = time.perf_counter()
+        try:
+            status, body = _request(conn, "POST", UPDATE_PATH, json.dumps(payload))
+            ok = status in (200, 204)
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            status, body, ok = None, b"", False
+        if time.monotonic() >= self.record_from:
+            self.requests.append((callback, (time.perf_counter() - start) * 1000, ok))
+        return body if status == 200 else None
+
+    def run(self):
+        conn = self.server.connect()
+        # stagger arrivals over the first think time, as real users do
+        time.sleep(self.rng.uniform(0, self.think) + max(0.0, self.start_at - time.monotonic()))
+        for request in clicks(self.rng, *self.choices):
+            if time.monotonic() >= self.stop_at:
+                break
+            start = time.perf_counter()
+            body = self.post(conn, "update_tab", request)
+            if body is not None:
+                slots = json.loads(body)["response"]["tabs-content"]["children"]["props"]["children"]
+                for figure_request in _render_figure_requests(slots):
+                    self.post(conn, "render_figure", figure_request)
+            if time.monotonic() >= self.record_from:
+                self.clicks.append((time.perf_counter() - start) * 1000)
+            if self.think:
+                time.sleep(self.rng.expovariate(1 / self.think))
+        conn.close()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Runs and the report
+# ──────────────────────────────────────────────────────────────────────────────
+def _percentile(samples, q):
+    """Nearest-rank percentile of sorted *samples* (None when empty)."""
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, round(q * (len(samples) - 1)))]
+
+
+def _latency(samples):
+    samples = sorted(samples)
+    return {f"p{round(q * 100)}_ms": _percentile(samples, q) for q in (0.5, 0.95, 0.99)}
+
+
+def run_config(workers, threads, clients=20, duration=30.0, warmup=5.0, think=1.0, filter_rate=0.2,
+               data_dir=None, preload=False, seed=0):
+    """Boot one gunicorn configuration, load it, and return its report row."""
+    server = Server(workers, threads, data_dir=data_dir, preload=preload)
+    try:
+        conn = server.connect()
+        choices = layout_choices(conn) + (filter_rate,)
+        conn.close()
+
+        sampler = RssSampler(server)
+        sampler.start()
+        now = time.monotonic()
+        record_from, stop_at = now + warmup, now + warmup + duration
+        users = [Client(server, choices, seed + i, think, now, stop_at, record_from) for i in range(clients)]
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+        sampler.stop()
+    finally:
+        server.stop()
+
+    requests = [r for user in users for r in user.requests]
+    errors = sum(1 for _, _, ok in requests if not ok)
+    by_callback = {}
+    for callback, ms, _ in requests:
+        by_callback.setdefault(callback, []).append(ms)
+    return {
+        "config": f"{workers}x{threads}",
+        "workers": workers,
+        "threads": threads,
+        "clients": clients,
+        "think_s": think,
+        "duration_s": duration,
+        "requests": len(requests),
+        "requests_per_s": len(requests) / duration,
+        "clicks_per_s": sum(len(user.clicks) for user in users) / duration,
+        "error_rate": errors / len(requests) if requests else None,
+        "request": _latency([ms for _, ms, _ in requests]),
+        "click": _latency([ms for user in users for ms in user.clicks]),
+        **{callback: _latency(samples) for callback, samples in sorted(by_callback.items())},
+        "worker_rss_mb": sorted(sampler.peak.values()),
+        "total_rss_mb": sum(sampler.peak.values()),
+    }
+
+
+def _ms(value):
+    return f"{value:8.1f}" if value is not None else f"{'-':>8}"
+
+
+def format_report(rows):
+    """Plain-text table, one configuration per line."""
+    header = (f"{'config':<8} {'clients':>7} {'req/s':>8} {'clicks/s':>8} {'errors':>7} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'click p95':>9}  worker RSS MB (peak)")
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        requests = row["request"]
+        rss = ", ".join(f"{mb:.0f}" for mb in row["worker_rss_mb"])
+        error_rate = f"{row['error_rate'] * 100:6.2f}%" if row["error_rate"] is not None else f"{'-':>7}"
+        lines.append(
+            f"{row['config']:<8} {row['clients']:>7} {row['requests_per_s']:8.1f} {row['clicks_per_s']:8.2f} "
+            f"{error_rate} {_ms(requests['p50_ms'])} {_ms(requests['p95_ms'])} {_ms(requests['p99_ms'])} "
+            f"{_ms(row['click']['p95_ms']):>9}  {rss} (total {row['total_rss_mb']:.0f})"
+        )
+    return "\n".join(lines)
+
+
+def parse_config(text):
+    """"2x4" -> (2 workers, 4 threads)."""
+    workers, _, threads = text.lower().partition("x")
+    return int(workers), int(threads or 1)
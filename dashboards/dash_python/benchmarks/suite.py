@@ -0,0 +1,202 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.timing import measure
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def time_import(data_dir):
+    """Seconds spent in `import app` in a fresh interpreter."""
+    code = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=APP_DIR,
+        env={**os.environ, "IMDB_DATA_DIR": str(data_dir)},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def run_dataset(label, data_dir, repeat):
+    """Benchmark one data directory in a child interpreter; returns result rows."""
+    rows = []
+    # cold: builds the snapshot + figure cache; warm: reuses both
+    for phase in ("cold", "warm"):
+        seconds = time_import(data_dir)
+        rows.append({"dataset": label, "benchmark": f"import_app.{phase}", "median_ms": seconds * 1000, "repeat": 1})
+
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", str(repeat)],
+        cwd=APP_DIR,
+        env={**os.environ, "IMDB_DATA_DIR": str(data_dir)},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    for row in json.loads(out.stdout.strip().splitlines()[-1]):
+        rows.append({"dataset": label, **row})
+    return rows
+
+
+def _update_tab_request(graph_tab, data_tab):
+    return {
+        "output": "tabs-content.children",
+        "outputs": {"id": "tabs-content", "property": "children"},
+        "inputs": [
+            {"id": "graph-tabs", "property": "value", "value": graph_tab},
+            {"id": "data-tabs", "property": "value", "value": data_tab},
+            {"id": "selection", "property": "data", "value": {}},
+            {"id": "year-range", "property": "value", "value": None},
+        ],
+        "changedPropIds": ["graph-tabs.value"],
+    }
+
+
+def _render_figure_requests(slots):
+    """One `render_figure` request per figure slot returned by `update_tab`."""
+    requests = []
+    for slot in slots:
+        store = slot["props"]["children"][0]["props"]
+        figure_id = {"type": "figure", "index": store["id"]["index"]}
+        requests.append({
+            "output": '{"index":["MATCH"],"type":"figure"}.figure',
+            "outputs": {"id": figure_id, "property": "figure"},
+            "inputs": [{"id": store["id"], "property": "data", "value": store["data"]}],
+            "changedPropIds": [json.dumps(store["id"], separators=(",", ":"), sort_keys=True) + ".data"],
+        })
+    return requests
+
+
+def _body(response):
+    """Response body as sent before any Content-Encoding."""
+    if response.headers.get("Content-Encoding") == "gzip":
+        return gzip.decompress(response.data)
+    return response.data
+
+
+def _update_tab_round_trip(client, graph_tab, data_tab):
+    """`update_tab` plus every slot's `render_figure`, as a gzip-accepting browser issues them."""
+    headers = {"Accept-Encoding": "gzip"}
+    response = client.post("/_dash-update-component", json=_update_tab_request(graph_tab, data_tab), headers=headers)
+    slots = json.loads(_body(response))["response"]["tabs-content"]["children"]["props"]["children"]
+    responses = [response] + [
+        client.post("/_dash-update-component", json=request, headers=headers)
+        for request in _render_figure_requests(slots)
+    ]
+    return responses
+
+
+def _wire_sizes(responses):
+    """
+    Bytes of a round trip three ways: with every typed array spelled out
+    as a JSON list (`json_bytes`), as encoded (`bytes`) and as compressed
+    on the wire (`wire_bytes`).
+    """
+    from src.wire import decode_figure
+
+    bodies = [_body(r) for r in responses]
+    plain = [json.dumps(decode_figure(json.loads(b)), separators=(",", ":")) for b in bodies]
+    return {
+        "json_bytes": sum(len(p.encode()) for p in plain),
+        "bytes": sum(len(b) for b in bodies),
+        "wire_bytes": sum(len(r.data) for r in responses),
+    }
+
+
+def run_in_process(repeat):
+    """All in-process benchmarks against the app's IMDB_DATA_DIR."""
+    import numpy as np
+
+    import app
+    from src import const
+    from src.aggregates import compute_aggregates, count, requirements
+    from src.bitmap_index import filter_dataset
+    from src.compact import compact_dataset, memory_footprint
+    from src.const import get_constants
+    from src.figure_bundle import encode_bundle
+    from src.incremental import AggregateState
+    from src.snapshot import LazyDataset, load_dataset
+    from src.sql_backend import open_store
+
+    rows = []
+    release = app.RELEASE
+    datasets = {data_tab: dataset.load_all() for data_tab, dataset in release.datasets.items()}
+    store = release.store or open_store(app.DATA_DIR / ".cache", "sqlite", datasets, release.version)
+
+    def record(name, stats, **extra):
+        stats.pop("result", None)
+        rows.append({"benchmark": name, **extra, **stats})
+
+    for data_tab, (data, splits) in datasets.items():
+        record("load_dataset", measure(lambda: compact_dataset(*load_dataset(app.DATA_DIR, data_tab)), repeat),
+               data_tab=data_tab, works=len(data), bytes=memory_footprint(data, splits)["total"])
+        # what a worker reads for the KPI cards and one tab, e.g. overview
+        stats = measure(lambda: LazyDataset(app.DATA_DIR, data_tab).load(
+            *requirements(const.MEASURES + app.MEASURES_BY_TAB["overview"][data_tab])), repeat)
+        record("load_dataset.pruned", stats, data_tab=data_tab, graph_tab="overview",
+               bytes=memory_footprint(*stats["result"])["total"])
+        record("compute_aggregates", measure(lambda: compute_aggregates(data, splits, app.MEASURES), repeat),
+               data_tab=data_tab)
+        record("compute_aggregates.approximate",
+               measure(lambda: compute_aggregates(data, splits, app.MEASURES, approximate=True), repeat),
+               data_tab=data_tab)
+        # a drop of the last 1% of the rows applied to tallies of the rest
+        cut = len(data) - max(1, len(data) // 100)
+        state = AggregateState.build(*filter_dataset(data, splits, np.arange(cut)), app.MEASURES)
+        drop = filter_dataset(data, splits, np.arange(cut, len(data)))
+        record("aggregate_state.apply", measure(lambda: state.apply(drop).result(), repeat),
+               data_tab=data_tab, rows=len(data) - cut)
+        record("compute_aggregates.sql", measure(lambda: store.compute_aggregates(data_tab, app.MEASURES), repeat),
+               data_tab=data_tab, engine=store.engine)
+        for sheet in ("genre", "stars"):
+            top = [count("top", sheet, source=sheet, top_n=10)]
+            record("top_counts", measure(lambda: compute_aggregates(data, splits, top), repeat),
+                   data_tab=data_tab, column=sheet)
+        cube = app.tab_aggregates("parental", data_tab)["years.parental"]
+        mid = int(cube.years[len(cube.years) // 2])
+        record("year_range.cube", measure(lambda: cube.by_group(mid - 10, mid + 10), repeat), data_tab=data_tab)
+        record("year_range.groupby", measure(
+            lambda: data[data["year"].between(mid - 10, mid + 10)].groupby("parentalguide", observed=True)["votes"].agg(
+                ["size", "mean"]), repeat), data_tab=data_tab)
+        for graph_tab, (builder, _) in app.VISUALIZATION_BUILDERS.items():
+            record("generate_visualizations", measure(lambda: builder(data, splits), repeat),
+                   data_tab=data_tab, graph_tab=graph_tab)
+
+    (movies, movies_splits), (series, series_splits) = datasets["movie"], datasets["series"]
+    record("get_constants", measure(lambda: get_constants(movies, series, movies_splits, series_splits), repeat))
+
+    figures = {
+        graph_tab: {data_tab: [app.get_figure(graph_tab, data_tab, i) for i in range(len(builders[data_tab]))]
+                    for data_tab in release.datasets}
+        for graph_tab, builders in app.FIGURE_BUILDERS.items()
+    }
+    stats = measure(lambda: encode_bundle(figures), repeat)
+    record("figure_bundle", stats, bytes=len(stats["result"]), raw_bytes=len(gzip.decompress(stats["result"])))
+
+    client = app.app.server.test_client()
+    max_bytes = app.FIGURE_CACHE.max_bytes
+    for cached in (True, False):
+        # an emptied zero-byte cache evicts every entry right away: every call misses
+        app.FIGURE_CACHE.max_bytes = max_bytes if cached else 0
+        if not cached:
+            app.FIGURE_CACHE.clear()
+        for data_tab in release.datasets:
+            for graph_tab in app.VISUALIZATION_BUILDERS:
+                stats = measure(lambda: _update_tab_round_trip(client, graph_tab, data_tab), repeat)
+                responses = stats["result"]
+                record("update_tab.cached" if cached else "update_tab.uncached", stats,
+                       data_tab=data_tab, graph_tab=graph_tab, requests=len(responses),
+                       **_wire_sizes(responses), status=max(r.status_code for r in responses))
+    app.FIGURE_CACHE.max_bytes = max_bytes
+    return rows
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_in_process(int(sys.argv[1]))))
@@ -0,0 +1,28 @@
+import statistics
+import time
+
+
+def measure(fn, repeat=5, warmup=1):
+    """
+    Call *fn* `warmup + repeat` times and return timing stats in ms for the
+    last *repeat* calls, plus `fn`'s last return value under "result".
+    """
+    result = None
+    for _ in range(warmup):
+        result = fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        "repeat": repeat,
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, round(0.95 * (len(samples) - 1)))],
+        "max_ms": samples[-1],
+        "result": result,
+    }
@@ -0,0 +1,228 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from src.distribution import MAX_OUTLIERS, summarize
+from src.intervals import active_per_year, run_end_years
+from src.sketches import HeavyHitters, HyperLogLog
+from src.utils import add_percentage
+from src.year_cube import YearCube
+
+# A single aggregate a builder needs.
+#   kind    – "count" | "group_size" | "group_mean" | "distinct" | "mean" | "rows" | "distribution"
+#             | "year_cube" | "activity"
+#   column  – key column (counts / groups / distinct), value column (mean / distribution)
+#             or first active year (activity)
+#   source  – "frame" or the name of a split sheet holding *column*
+#   top_n   – keep the n most frequent values ("count") / at most n outliers ("distribution")
+#   value   – numeric column averaged per group ("group_mean" / "year_cube") or summed
+#             over active works ("activity")
+#   bins    – histogram bins ("distribution" only; None = no histogram)
+#   end     – last active year column ("activity" only; missing = the start year)
+Measure = namedtuple(
+    "Measure", "name kind column source top_n value bins end", defaults=("frame", None, None, None, None)
+)
+
+
+# Approximate mode: rows per sketched partition and heavy-hitter counters kept
+APPROX_PARTITION_ROWS = 1_000_000
+APPROX_TOP_K = 1024
+
+
+# ── measure constructors ─────────────────────────────────────────
+def count(name, column, source="frame", top_n=None):
+    """Top-n value frequencies: a `<column>, count, percentage` frame, most frequent first."""
+    return Measure(name, "count", column, source, top_n)
+
+
+def group_size(name, by):
+    """Number of rows per value of *by* (like `groupby(by).size()`)."""
+    return Measure(name, "group_size", by)
+
+
+def group_mean(name, by, value):
+    """Mean of *value* per value of *by* (like `groupby(by)[value].mean()`)."""
+    return Measure(name, "group_mean", by, value=value)
+
+
+def year_cube(name, by, value):
+    """Counts and mean *value* per `year` x *by*, queryable for any year range (see `YearCube`)."""
+    return Measure(name, "year_cube", by, value=value)
+
+
+def activity(name, start, end, weight):
+    """Works active in each year of their [*start*, *end*] run, and the sum of their *weight*."""
+    return Measure(name, "activity", start, value=weight, end=end)
+
+
+def distinct(name, column, source="frame"):
+    """The distinct non-null values of *column* (an array, so sets can be merged)."""
+    return Measure(name, "distinct", column, source)
+
+
+def mean(name, column):
+    return Measure(name, "mean", column)
+
+
+def rows(name):
+    return Measure(name, "rows", None)
+
+
+def distribution(name, column, bins=None, max_outliers=MAX_OUTLIERS):
+    """Box-plot statistics (and optionally a histogram) of *column*; see `distribution.summarize`."""
+    return Measure(name, "distribution", column, top_n=max_outliers, bins=bins)
+
+
+def merge_measures(*groups):
+    """Union of several measure lists; the same name must mean the same measure."""
+    merged = {}
+    for group in groups:
+        for measure in group:
+            if merged.setdefault(measure.name, measure) != measure:
+                raise ValueError(f"Conflicting definitions for measure {measure.name!r}.")
+    return list(merged.values())
+
+
+def requirements(measures):
+    """`(columns, sheets)`: the frame columns and split sheets *measures* read."""
+    columns, sheets = set(), set()
+    for m in measures:
+        if m.source != "frame":
+            sheets.add(m.source)
+            continue
+        columns.update(c for c in (m.column, m.value, m.end) if c)
+        if m.kind == "year_cube":
+            columns.add("year")
+    return sorted(columns), sorted(sheets)
+
+
+# ── engine ───────────────────────────────────────────────────────
+def _encode(column):
+    """
+    Integer codes (-1 = missing) plus the value dictionary for *column*.
+    Dictionary order is first appearance, so stable sorts on the counts
+    break ties the way `value_counts()` does.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.array.codes, column.cat.categories
+    codes, uniques = pd.factorize(column, sort=False)
+    return codes, uniques
+
+
+def _group_order(uniques, present, categorical):
+    """Positions of the observed keys in `groupby(sort=True)` order."""
+    if categorical:
+        return np.flatnonzero(present)
+    order = np.argsort(np.asarray(uniques), kind="stable")
+    return order[present[order]]
+
+
+def _sketch(m, series):
+    """Approximate result of a "count" (top-n) or "distinct" measure, sketched per partition."""
+    sketch = HyperLogLog() if m.kind == "distinct" else HeavyHitters(max(APPROX_TOP_K, m.top_n))
+    for start in range(0, len(series), APPROX_PARTITION_ROWS):
+        sketch.update(series.iloc[start:start + APPROX_PARTITION_ROWS])
+    if m.kind == "distinct":
+        return sketch
+
+    top = sketch.top(m.top_n)
+    result = add_percentage(pd.DataFrame({m.column: [v for v, _ in top], "count": [c for _, c in top]}))
+    result.attrs["max_error"] = sketch.max_error
+    return result
+
+
+def compute_aggregates(frame, splits, measures, approximate=False):
+    """
+    Evaluate *measures* against one dataset and return `{name: result}`.
+
+    Measures sharing a key column share one encoding pass: the column is
+    turned into integer codes once, and every count, group size and group
+    sum over it is a `np.bincount` on those codes.
+
+    With *approximate*, top-n counts and distinct values come from mergeable
+    sketches instead (see src/sketches.py): a count frame then carries its
+    error bound in `attrs["max_error"]` and a distinct measure is a
+    `HyperLogLog` (merge, then `count()`).
+    """
+    bundle = {}
+
+    by_key = {}
+    for m in measures:
+        if m.kind == "rows":
+            bundle[m.name] = len(frame)
+        elif m.kind == "mean":
+            bundle[m.name] = float(frame[m.column].mean())
+        elif m.kind == "activity":
+            end = frame[m.end] if m.end in frame.columns else None
+            years, active, weighted = active_per_year(
+                frame[m.column], run_end_years(frame[m.column], end), frame[m.value]
+            )
+            bundle[m.name] = pd.DataFrame({"year": years, "active": active, m.value: weighted})
+        elif m.kind == "distribution":
+            bundle[m.name] = summarize(frame[m.column], bins=m.bins, max_outliers=m.top_n)
+        else:
+            by_key.setdefault((m.source, m.column), []).append(m)
+
+    for (source, column), group in by_key.items():
+        table = frame if source == "frame" else splits[source]
+        series = table[column]
+        if approximate:
+            sketched = [m for m in group if m.kind == "distinct" or (m.kind == "count" and m.top_n)]
+            for m in sketched:
+                bundle[m.name] = _sketch(m, series)
+            group = [m for m in group if m not in sketched]
+            if not group:
+                continue
+        categorical = isinstance(series.dtype, pd.CategoricalDtype)
+        codes, uniques = _encode(series)
+        valid = codes >= 0
+        freq = np.bincount(codes[valid], minlength=len(uniques))
+
+        for m in group:
+            if m.kind == "count":
+                order = np.argsort(-freq, kind="stable")
+                order = order[freq[order] > 0][: m.top_n]
+                result = pd.DataFrame(
+                    {m.column: np.asarray(uniques)[order], "count": freq[order]}
+                )
+                bundle[m.name] = add_percentage(result)
+
+            elif m.kind == "distinct":
+                bundle[m.name] = np.asarray(uniques)[freq > 0]
+
+            elif m.kind == "group_size":
+                order = _group_order(uniques, freq > 0, categorical)
+                bundle[m.name] = pd.DataFrame(
+                    {m.column: np.asarray(uniques)[order], "count": freq[order]}
+                )
+
+            elif m.kind == "group_mean":
+                weights = table[m.value].to_numpy(dtype=float)
+                ok = valid & ~np.isnan(weights)
+                sums = np.bincount(codes[ok], weights=weights[ok], minlength=len(uniques))
+                n = np.bincount(codes[ok], minlength=len(uniques))
+                order = _group_order(uniques, freq > 0, categorical)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    means = sums[order] / n[order]
+                bundle[m.name] = pd.DataFrame(
+                    {m.column: np.asarray(uniques)[order], m.value: means}
+                )
+
+            elif m.kind == "year_cube":
+                order = _group_order(uniques, np.ones(len(uniques), dtype=bool), categorical)
+                rank = np.empty(len(uniques), dtype=np.int64)
+                rank[order] = np.arange(len(order))
+                bundle[m.name] = YearCube(
+                    table["year"].to_numpy(),
+                    np.where(codes >= 0, rank[codes], -1),
+                    np.asarray(uniques)[order],
+                    table[m.value].to_numpy(dtype=float),
+                    by=m.column,
+                    value=m.value,
+                )
+
+            else:
+                raise ValueError(f"Unknown measure kind {m.kind!r} for {m.name!r}.")
+
+    return bundle
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+
+class InvertedIndex:
+    """
+    Inverted index from every split value (and every value of selected
+    categorical frame columns) to the sorted row ids of the works that
+    carry it.
+
+    The posting lists are sorted int32 arrays – the "array container" of a
+    Roaring bitmap – so AND/OR of a selection costs time proportional to the
+    posting lists involved, never a scan of the whole frame.
+    """
+
+    def __init__(self, frame, splits, frame_columns=("parentalguide",)):
+        self.num_rows = len(frame)
+        self.postings = {}
+
+        for column in frame_columns:
+            if column in frame.columns:
+                self.postings[column] = _postings(
+                    frame[column], np.arange(len(frame), dtype=np.int32)
+                )
+        for sheet, table in splits.items():
+            self.postings[sheet] = _postings(table[sheet], table["row_id"].to_numpy(dtype=np.int32))
+
+    def dimensions(self):
+        return list(self.postings)
+
+    def rows_for(self, dimension, value):
+        """Row ids carrying *value* in *dimension* (empty if unknown)."""
+        return self.postings.get(dimension, {}).get(value, np.empty(0, dtype=np.int32))
+
+    def select(self, selection):
+        """
+        Row ids matching *selection* – `{dimension: [values, ...]}` – with
+        OR between the values of one dimension and AND across dimensions.
+        Returns None when the selection is empty (i.e. "all rows").
+        """
+        active = {dim: vals for dim, vals in (selection or {}).items() if vals}
+        if not active:
+            return None
+
+        per_dimension = []
+        for dim, vals in active.items():
+            lists = [self.rows_for(dim, v) for v in vals]
+            rows = lists[0] if len(lists) == 1 else np.unique(np.concatenate(lists))
+            per_dimension.append(rows)
+
+        # intersect smallest first so every step shrinks the candidate set
+        per_dimension.sort(key=len)
+        rows = per_dimension[0]
+        for other in per_dimension[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+
+def _postings(values, row_ids):
+    """{value: sorted unique row ids} for one column, in a single sort."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.array.codes, values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values, sort=False)
+
+    valid = codes >= 0
+    codes, row_ids = codes[valid], row_ids[valid]
+    order = np.lexsort((row_ids, codes))
+    codes, row_ids = codes[order], row_ids[order]
+
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], bounds))
+    return {
+        uniques[codes[start]]: np.unique(chunk)
+        for start, chunk in zip(starts, np.split(row_ids, bounds))
+        if len(chunk)
+    }
+
+
+def filter_dataset(frame, splits, rows):
+    """
+    Restrict a `(frame, splits)` pair to the works in *rows* (sorted row
+    ids, or None for no filter). Split tables are sorted by `row_id` (as
+    built by src/splits.py), so their rows are located by binary search and
+    the cost follows the size of the selection.
+    """
+    if rows is None:
+        return frame, splits
+
+    filtered = {}
+    for sheet, table in splits.items():
+        row_id = table["row_id"].to_numpy()
+        lo = np.searchsorted(row_id, rows, side="left")
+        hi = np.searchsorted(row_id, rows, side="right")
+        lengths = hi - lo
+        positions = np.repeat(hi - np.cumsum(lengths), lengths) + np.arange(lengths.sum())
+        filtered[sheet] = table.iloc[positions]
+    return frame.iloc[rows], filtered
@@ -0,0 +1,177 @@
+"""
+Startup bookkeeping: how far the app is from serving data, how long each
+step took, and the `/healthz` and `/readyz` endpoints built on that.
+
+    python -m src.boot            # import-time profile + time-to-ready report
+
+`/healthz` answers as soon as the process serves requests (liveness);
+`/readyz` answers 503 until every startup step has finished, then 200
+(readiness), both with the steps' timings as JSON. A load balancer or
+orchestrator only routes traffic to ready workers, so with
+IMDB_BACKGROUND_BOOT=1 a worker binds at once and loads its data behind
+`/readyz` instead of in front of the listen socket.
+
+This module only uses the standard library, so it can be imported before
+anything heavy and time the rest.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+class NotReady(RuntimeError):
+    """The app is still starting (or failed to start)."""
+
+
+class Boot:
+    """Startup state of one process: named, timed steps and a ready flag."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps = []  # (name, seconds), in order
+        self.state = "starting"
+        self.error = None
+        self.ready = threading.Event()
+        self.ready_after = None
+        self._mark = self.started
+
+    def lap(self, name):
+        """Record the time since the previous step (or since start) as step *name*."""
+        now = time.perf_counter()
+        self.steps.append((name, now - self._mark))
+        self._mark = now
+
+    @contextmanager
+    def step(self, name):
+        """Time the enclosed block as step *name*."""
+        self._mark = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.lap(name)
+
+    def run(self, fn, background=False):
+        """
+        Call *fn* (the remaining startup work), then mark the process ready;
+        with *background*, in a daemon thread so the caller carries on.
+        """
+        def target():
+            try:
+                fn()
+                self.state = "ready"
+            except BaseException as error:  # reported on /readyz and by `wait`
+                self.error, self.state = error, "failed"
+                traceback.print_exc()
+            finally:
+                self.ready_after = time.perf_counter() - self.started
+                self.ready.set()
+
+        if background:
+            threading.Thread(target=target, name="boot", daemon=True).start()
+            return
+        target()
+        if self.error is not None:
+            raise self.error
+
+    def wait(self, timeout=None):
+        """Block until the app is ready; raise `NotReady` on a timeout or failed start."""
+        if not self.ready.wait(timeout):
+            raise NotReady(f"still starting after {timeout} s")
+        if self.error is not None:
+            raise NotReady("startup failed") from self.error
+
+    def report(self):
+        return {
+            "state": self.state,
+            "ready_after_s": self.ready_after,
+            "uptime_s": time.perf_counter() - self.started,
+            "steps": [{"name": name, "seconds": seconds} for name, seconds in self.steps],
+            **({"error": repr(self.error)} if self.error is not None else {}),
+        }
+
+
+def install(server, boot):
+    """Add `/healthz` (liveness) and `/readyz` (readiness of *boot*) to a Flask *server*."""
+    from flask import Response
+
+    def _json(status, body):
+        return Response(json.dumps(body), status=status, mimetype="application/json",
+                        headers={"Cache-Control": "no-store"})
+
+    @server.route("/healthz")
+    def _healthz():
+        return _json(200, {"state": "alive" if boot.state != "failed" else "failed"})
+
+    @server.route("/readyz")
+    def _readyz():
+        return _json(200 if boot.state == "ready" else 503, boot.report())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Profile report
+# ──────────────────────────────────────────────────────────────────────────────
+def import_profile(stderr):
+    """`[(cumulative s, self s, depth, module)]` from `python -X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative_us) / 1e6, int(self_us) / 1e6, depth, name.strip()))
+    return rows
+
+
+def profile(env=None, timeout=600):
+    """
+    Import the app in a fresh interpreter under `-X importtime`, wait until
+    it is ready and return `(import rows, boot report)`.
+    """
+    code = "import app, json; app.BOOT.wait(); print(json.dumps(app.BOOT.report()))"
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if out.returncode:
+        raise RuntimeError(out.stderr[-2000:])
+    return import_profile(out.stderr), json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def format_profile(rows, report, top=25, depth=2):
+    """Time-to-ready by startup step, then the costliest imports down to *depth*."""
+    lines = [f"ready after {report['ready_after_s']:.2f} s ({report['state']})", ""]
+    lines += [f"  {step['seconds']:7.3f} s  {step['name']}" for step in report["steps"]]
+    lines += ["", f"slowest imports (cumulative, up to depth {depth}):"]
+    shown = sorted((row for row in rows if row[2] <= depth), reverse=True)[:top]
+    lines += [f"  {cumulative:7.3f} s  {self_s:7.3f} s self  {'  ' * d}{name}" for cumulative, self_s, d, name in shown]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=25, help="imports to list")
+    parser.add_argument("--depth", type=int, default=2, help="deepest import level to list")
+    parser.add_argument("--json", help="also write the raw profile here")
+    args = parser.parse_args()
+
+    rows, report = profile()
+    print(format_profile(rows, report, args.top, args.depth))
+    if args.json:
+        Path(args.json).write_text(json.dumps({"boot": report, "imports": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
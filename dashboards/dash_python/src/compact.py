@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Long free-text columns no builder reads.
+DROP_COLUMNS = ("link", "description")
+
+# Comma-joined multi-valued columns; their values live in the split tables
+# (see src/splits.py), which is what the builders read.
+MULTI_VALUED_COLUMNS = (
+    "genre",
+    "country",
+    "language",
+    "production_company",
+    "stars",
+    "director",
+    "writer",
+    "creators",
+)
+
+# Low-cardinality text columns stored as int codes + dictionary.
+CATEGORICAL_COLUMNS = ("title", "parentalguide", "type", "end_year")
+
+# Release year: a "YYYY-MM-DD" string for movies, an integer for series.
+YEAR_COLUMN = "year"
+
+
+def _categorical(values):
+    # categories in order of first appearance, so value_counts() ties
+    # break exactly as they do on the plain strings
+    return pd.Categorical(values, categories=pd.unique(values.dropna()))
+
+
+def _year(values):
+    if not pd.api.types.is_integer_dtype(values):
+        values = pd.to_numeric(values.astype(str).str[:4])
+    return values.to_numpy().astype(np.int16)
+
+
+def compact_frame(frame):
+    """
+    Return a memory-lean copy of a cleaned movie/series frame:
+    text dimensions become categoricals, integers are downcast, `title` is
+    dictionary-encoded, `year` becomes a plain int16 year for both kinds of
+    work, and the unused `link`/`description` text and the multi-valued
+    columns already covered by the split tables are dropped.
+    Floats stay float64 so ratings/grosses render exactly as before.
+    """
+    frame = frame.drop(
+        columns=[c for c in DROP_COLUMNS + MULTI_VALUED_COLUMNS if c in frame.columns]
+    )
+
+    for col in frame.columns:
+        if col == YEAR_COLUMN:
+            frame[col] = _year(frame[col])
+        elif col in CATEGORICAL_COLUMNS:
+            frame[col] = _categorical(frame[col])
+        elif pd.api.types.is_integer_dtype(frame[col]):
+            frame[col] = pd.to_numeric(frame[col], downcast="integer")
+    return frame
+
+
+def compact_splits(frame, splits):
+    """
+    Re-encode split tables against a compacted *frame*: `title` shares the
+    frame's title dictionary (one copy of every title string) and `row_id`
+    and the value column are stored as small integer codes. Tables read
+    without their `title` column stay without it.
+    """
+    compacted = {}
+    for sheet, table in splits.items():
+        row_id = pd.to_numeric(table["row_id"], downcast="integer")
+        values = table[sheet]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = _categorical(values)
+        columns = {"row_id": row_id}
+        if "title" in table.columns:
+            titles = frame["title"].array
+            columns["title"] = pd.Categorical.from_codes(titles.codes[row_id], dtype=titles.dtype)
+        compacted[sheet] = pd.DataFrame({**columns, sheet: values})
+    return compacted
+
+
+def compact_dataset(frame, splits):
+    """Compact a `(frame, splits)` pair as loaded by `src.snapshot.load_dataset`."""
+    frame = compact_frame(frame)
+    return frame, compact_splits(frame, splits)
+
+
+def memory_footprint(frame, splits):
+    """
+    Resident bytes of a `(frame, splits)` pair. Category dictionaries shared
+    between columns (e.g. `title`) are counted once.
+    """
+    seen = set()
+
+    def table_bytes(table):
+        total = table.index.memory_usage(deep=True)
+        for col in table.columns:
+            values = table[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                total += values.array.codes.nbytes
+                categories = values.cat.categories
+                if id(categories) not in seen:
+                    seen.add(id(categories))
+                    total += categories.memory_usage(deep=True)
+            else:
+                total += values.memory_usage(deep=True, index=False)
+        return int(total)
+
+    frame_bytes = table_bytes(frame)
+    split_bytes = {sheet: table_bytes(t) for sheet, t in splits.items()}
+    return {
+        "frame": frame_bytes,
+        "splits": split_bytes,
+        "total": frame_bytes + sum(split_bytes.values()),
+    }
@@ -1,6 +1,26 @@
-import pandas as pd
+import numpy as np
 
-def get_constants(movies, series, movies_splits, series_splits):
+from src import aggregates as agg
+from src.sketches import HyperLogLog
+
+# Per-dataset aggregates behind the KPI cards, computed by src/aggregates.py
+MEASURES = [
+    agg.rows("kpi.works"),
+    agg.distinct("kpi.countries", "country", source="country"),
+    agg.distinct("kpi.languages", "language", source="language"),
+    agg.mean("kpi.mean_votes", "votes"),
+]
+
+
+def _union_size(a, b):
+    """Distinct values across two "distinct" results (arrays, or HyperLogLog sketches)."""
+    if isinstance(a, HyperLogLog):
+        return a.merge(b).count()
+    return len(np.union1d(a.astype(str), b.astype(str)))
+
+
+def get_constants(movies, series, movies_splits, series_splits,
+                  movies_aggregates=None, series_aggregates=None):
     """
     Return four key KPI values for the dashboard:
     1. Total number of works  (movies + series)
@@ -8,25 +28,27 @@ def get_constants(movies, series, movies_splits, series_splits):
     3. Total unique languages represented
     4. Average votes (integer) across movies and series
     """
+    if movies_aggregates is None:
+        movies_aggregates = agg.compute_aggregates(movies, movies_splits, MEASURES)
+    if series_aggregates is None:
+        series_aggregates = agg.compute_aggregates(series, series_splits, MEASURES)
+    return constants_from_aggregates(movies_aggregates, series_aggregates)
+
+
+def constants_from_aggregates(movies_aggregates, series_aggregates):
+    """`get_constants` from the datasets' `MEASURES` aggregates alone."""
+    m, s = movies_aggregates, series_aggregates
 
     # 1 ─ total works
-    num_of_works = len(movies) + len(series)
+    num_of_works = m["kpi.works"] + s["kpi.works"]
 
-    # 2 ─ unique countries (from both split files)
-    countries = pd.concat(
-        [movies_splits["country"]["country"], series_splits["country"]["country"]],
-        ignore_index=True,
-    )
-    num_of_countries = countries.nunique()
+    # 2 ─ unique countries (union of both datasets' split values)
+    num_of_countries = _union_size(m["kpi.countries"], s["kpi.countries"])
 
     # 3 ─ unique languages
-    languages = pd.concat(
-        [movies_splits["language"]["language"], series_splits["language"]["language"]],
-        ignore_index=True,
-    )
-    num_of_lang = languages.nunique()
+    num_of_lang = _union_size(m["kpi.languages"], s["kpi.languages"])
 
     # 4 ─ average votes, rounded to int
-    avg_votes = int((movies["votes"].mean() + series["votes"].mean()) / 2)
+    avg_votes = int((m["kpi.mean_votes"] + s["kpi.mean_votes"]) / 2)
 
     return num_of_works, num_of_countries, num_of_lang, avg_votes
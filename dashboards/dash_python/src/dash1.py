@@ -1,9 +1,28 @@
-import plotly.express as px
-from src.utils import value_counts_df     # helper we created
+from src import aggregates as agg
+from src.countries import iso3
+from src.distribution import box_figure
 
-def generate_visualizations(df, splits):
-    # ── 1. Treemap: Top Parental Guides ──────────────────────────
-    guides = value_counts_df(df["parentalguide"], top_n=10, col_name="parentalguide")
+# Everything this tab aggregates, computed by src/aggregates.py
+MEASURES = [
+    agg.count("overview.guides", "parentalguide", top_n=10),
+    agg.count("overview.genres", "genre", source="genre", top_n=10),
+    agg.count("overview.countries", "country", source="country", top_n=30),
+    agg.distribution("overview.ratings", "rating"),
+]
+
+# Figure index -> (filter dimension, clickData point field holding the value)
+CROSSFILTER = {
+    0: ("parentalguide", "label"),
+    1: ("genre", "y"),
+    2: ("country", "hovertext"),
+}
+
+
+# ── 1. Treemap: Top Parental Guides ──────────────────────────
+def treemap_guides(aggregates):
+    import plotly.express as px
+
+    guides = aggregates["overview.guides"]
     fig_treemap = px.treemap(
         guides,
         path=["parentalguide"],
@@ -13,9 +32,14 @@ def generate_visualizations(df, splits):
         color_continuous_scale="viridis",
     )
     fig_treemap.update_layout(template="plotly_dark", font=dict(color="yellow"))
+    return fig_treemap
 
-    # ── 2. Bar: Top Genres ───────────────────────────────────────
-    genres = value_counts_df(splits["genre"]["genre"], col_name="genre")
+
+# ── 2. Bar: Top Genres ───────────────────────────────────────
+def bar_genres(aggregates):
+    import plotly.express as px
+
+    genres = aggregates["overview.genres"]
     fig_bar_language = px.bar(
         genres,
         x="count",
@@ -32,22 +56,16 @@ def generate_visualizations(df, splits):
         font=dict(color="yellow"),
         yaxis=dict(categoryorder="total ascending"),
     )
+    return fig_bar_language
+
 
-    # ── 3. Choropleth: Producing Countries ───────────────────────
-    countries = value_counts_df(splits["country"]["country"], top_n=30, col_name="country")
-
-    country_mapping = {
-        "United States": "USA",  "United Kingdom": "GBR", "France": "FRA",
-        "Germany": "DEU",        "Japan": "JPN",          "India": "IND",
-        "Australia": "AUS",      "Canada": "CAN",         "China": "CHN",
-        "Italy": "ITA",          "Spain": "ESP",          "Mexico": "MEX",
-        "Hong Kong": "HKG",      "Sweden": "SWE",         "Denmark": "DNK",
-        "New Zealand": "NZL",    "Belgium": "BEL",        "South Korea": "KOR",
-        "Ireland": "IRL",        "Netherlands": "NLD",    "South Africa": "ZAF",
-        "Norway": "NOR",         "Austria": "AUT",        "Turkey": "TUR",
-        "West Germany": "DEU",   "Switzerland": "CHE",
-    }
-    countries["country_iso"] = countries["country"].map(country_mapping)
+# ── 3. Choropleth: Producing Countries ───────────────────────
+def choropleth_countries(aggregates):
+    import plotly.express as px
+
+    countries = aggregates["overview.countries"].copy()
+
+    countries["country_iso"] = countries["country"].map(iso3)
 
     fig_choropleth = px.choropleth(
         countries,
@@ -59,14 +77,23 @@ def generate_visualizations(df, splits):
         color_continuous_scale="viridis",
     )
     fig_choropleth.update_layout(template="plotly_dark", font=dict(color="yellow"))
+    return fig_choropleth
 
-    # ── 4. Box Plot: Ratings Distribution ────────────────────────
-    fig_boxplot = px.box(
-        df,
-        x="rating",
-        title="Ratings Distribution",
-    )
+
+# ── 4. Box Plot: Ratings Distribution ────────────────────────
+def box_ratings(aggregates):
+    # drawn from quartiles/whiskers/outliers only, never the raw ratings
+    fig_boxplot = box_figure(aggregates["overview.ratings"], "rating", title="Ratings Distribution")
     fig_boxplot.update_traces(marker=dict(color="yellow"))
     fig_boxplot.update_layout(template="plotly_dark", font=dict(color="yellow"))
+    return fig_boxplot
+
+
+# Figure builders in grid order; each only needs the aggregate bundle
+FIGURES = (treemap_guides, bar_genres, choropleth_countries, box_ratings)
+
 
-    return fig_treemap, fig_bar_language, fig_choropleth, fig_boxplot
+def generate_visualizations(df, splits, aggregates=None):
+    if aggregates is None:
+        aggregates = agg.compute_aggregates(df, splits, MEASURES)
+    return tuple(build(aggregates) for build in FIGURES)
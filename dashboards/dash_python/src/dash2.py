@@ -1,9 +1,27 @@
-import plotly.express as px
-from src.utils import value_counts_df
+from src import aggregates as agg
 
-def generate_visualizations(df, splits):
-    # ── 1. Donut: Top Creators ───────────────────────────────────
-    creators = value_counts_df(splits["creators"]["creators"], top_n=3, col_name="creators")
+# Everything this tab aggregates, computed by src/aggregates.py
+MEASURES = [
+    agg.count("creators.creators", "creators", source="creators", top_n=3),
+    agg.count("creators.production", "production_company", source="production_company", top_n=10),
+    agg.count("creators.stars", "stars", source="stars", top_n=10),
+    agg.count("creators.languages", "language", source="language", top_n=10),
+]
+
+# Figure index -> (filter dimension, clickData point field holding the value)
+CROSSFILTER = {
+    0: ("creators", "label"),
+    1: ("production_company", "y"),
+    2: ("stars", "x"),
+    3: ("language", "x"),
+}
+
+
+# ── 1. Donut: Top Creators ───────────────────────────────────
+def donut_creators(aggregates):
+    import plotly.express as px
+
+    creators = aggregates["creators.creators"]
     fig_donut = px.pie(
         creators,
         names="creators",
@@ -12,10 +30,14 @@ def generate_visualizations(df, splits):
         hole=0.5
     )
     fig_donut.update_layout(template="plotly_dark", font=dict(color="yellow"))
+    return fig_donut
 
-    # ── 2. Bar (h): Production Companies ────────────────────────
-    prod = value_counts_df(splits["production_company"]["production_company"],
-                           top_n=10, col_name="production_company")
+
+# ── 2. Bar (h): Production Companies ────────────────────────
+def bar_production(aggregates):
+    import plotly.express as px
+
+    prod = aggregates["creators.production"]
     fig_prod = px.bar(
         prod,
         x="count",
@@ -32,9 +54,14 @@ def generate_visualizations(df, splits):
         font=dict(color="yellow"),
         yaxis=dict(categoryorder="total ascending"),
     )
+    return fig_prod
+
 
-    # ── 3. Bar (v): Stars ───────────────────────────────────────
-    stars = value_counts_df(splits["stars"]["stars"], top_n=10, col_name="stars")
+# ── 3. Bar (v): Stars ───────────────────────────────────────
+def bar_stars(aggregates):
+    import plotly.express as px
+
+    stars = aggregates["creators.stars"]
     fig_stars = px.bar(
         stars,
         x="stars",
@@ -47,9 +74,14 @@ def generate_visualizations(df, splits):
     )
     fig_stars.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
     fig_stars.update_layout(template="plotly_dark", font=dict(color="yellow"))
+    return fig_stars
+
+
+# ── 4. Bar (v): Languages ───────────────────────────────────
+def bar_languages(aggregates):
+    import plotly.express as px
 
-    # ── 4. Bar (v): Languages ───────────────────────────────────
-    langs = value_counts_df(splits["language"]["language"], top_n=10, col_name="language")
+    langs = aggregates["creators.languages"]
     fig_lang = px.bar(
         langs,
         x="language",
@@ -62,5 +94,14 @@ def generate_visualizations(df, splits):
     )
     fig_lang.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
     fig_lang.update_layout(template="plotly_dark", font=dict(color="yellow"))
+    return fig_lang
+
+
+# Figure builders in grid order; each only needs the aggregate bundle
+FIGURES = (donut_creators, bar_production, bar_stars, bar_languages)
+
 
-    return fig_donut, fig_prod, fig_stars, fig_lang
+def generate_visualizations(df, splits, aggregates=None):
+    if aggregates is None:
+        aggregates = agg.compute_aggregates(df, splits, MEASURES)
+    return tuple(build(aggregates) for build in FIGURES)
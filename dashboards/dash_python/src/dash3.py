@@ -1,13 +1,34 @@
-import plotly.express as px
-
-def generate_visualizations(series, splits=None):
-    # ── Bar 1: average votes per parental guide ──
-    df_mean = (
-        series.groupby("parentalguide")["votes"]
-        .mean()
-        .reset_index(name="votes")
-        .sort_values("votes", ascending=False)
-    )
+from src import aggregates as agg
+from src.year_cube import year_range
+
+# Everything this tab aggregates, computed by src/aggregates.py
+MEASURES = [
+    agg.year_cube("years.parental", "parentalguide", "votes"),
+]
+
+# Figure index -> (filter dimension, clickData point field holding the value)
+CROSSFILTER = {
+    0: ("parentalguide", "x"),
+    1: ("parentalguide", "x"),
+}
+
+
+# consistent dark theme styling
+def _style(fig):
+    fig.update_layout(template="plotly_dark", font=dict(color="yellow"))
+    return fig
+
+
+# Per-guide counts and mean votes over the selected year range
+def _by_guide(aggregates):
+    return aggregates["years.parental"].by_group(*year_range(aggregates))
+
+
+# ── Bar 1: average votes per parental guide ──
+def bar_mean_votes(aggregates):
+    import plotly.express as px
+
+    df_mean = _by_guide(aggregates)[["parentalguide", "votes"]].sort_values("votes", ascending=False)
     fig_bar_mean_votes = px.bar(
         df_mean,
         x="parentalguide",
@@ -15,14 +36,14 @@ def generate_visualizations(series, splits=None):
         title="Parental Guide by Mean Votes",
         color="votes",
     )
+    return _style(fig_bar_mean_votes)
 
-    # ── Bar 2: total count per parental guide ──
-    df_count = (
-        series.groupby("parentalguide")
-        .size()
-        .reset_index(name="count")
-        .sort_values("count", ascending=False)
-    )
+
+# ── Bar 2: total count per parental guide ──
+def bar_count(aggregates):
+    import plotly.express as px
+
+    df_count = _by_guide(aggregates)[["parentalguide", "count"]].sort_values("count", ascending=False)
     fig_bar_count = px.bar(
         df_count,
         x="parentalguide",
@@ -30,9 +51,14 @@ def generate_visualizations(series, splits=None):
         title="Parental Guide by Count",
         color="count",
     )
+    return _style(fig_bar_count)
+
+
+# Figure builders in grid order; each only needs the aggregate bundle
+FIGURES = (bar_mean_votes, bar_count)
 
-    # consistent dark theme styling
-    for fig in (fig_bar_mean_votes, fig_bar_count):
-        fig.update_layout(template="plotly_dark", font=dict(color="yellow"))
 
-    return fig_bar_mean_votes, fig_bar_count
+def generate_visualizations(series, splits=None, aggregates=None):
+    if aggregates is None:
+        aggregates = agg.compute_aggregates(series, splits, MEASURES)
+    return tuple(build(aggregates) for build in FIGURES)
@@ -1,35 +1,106 @@
-import plotly.express as px
-
-def generate_visualizations(df, splits=None):
-    # ── Line 1: works per year ────────────────────────────────
-    yearly_counts = (
-        df.groupby("year")
-        .size()
-        .reset_index(name="count")
-    )
+import numpy as np
+from src import aggregates as agg
+from src.year_cube import year_range
+
+# Everything this tab aggregates, computed by src/aggregates.py
+MEASURES = [
+    agg.year_cube("years.parental", "parentalguide", "votes"),
+]
+
+# Datasets with runs (a `start_year` and an `end_year`, i.e. series) also
+# count the works active each year: from their start (`year`) to their end,
+# or to date if unfinished. A movie is only active in its release year,
+# which `line_count` already shows.
+RUN_COLUMNS = ("start_year", "end_year")
+RUN_MEASURES = [
+    *MEASURES,
+    agg.activity("years.activity", "year", "end_year", "votes"),
+]
+
+# Year lines have no categorical dimension to filter on
+CROSSFILTER = {}
+
+
+# Shared dark theme + yellow line
+def _style(fig):
+    fig.update_traces(line=dict(color="yellow"))
+    fig.update_layout(template="plotly_dark", font=dict(color="yellow"))
+    return fig
+
+
+# Per-year counts and mean votes over the selected year range
+def _by_year(aggregates):
+    return aggregates["years.parental"].by_year(*year_range(aggregates))
+
+
+# ── Line 1: works per year ────────────────────────────────
+def line_count(aggregates):
+    import plotly.express as px
+
+    yearly_counts = _by_year(aggregates)[["year", "count"]]
     fig_count = px.line(
         yearly_counts,
         x="year",
         y="count",
         title="Work Count Over Time",
     )
+    return _style(fig_count)
 
-    # ── Line 2: mean votes per year ───────────────────────────
-    yearly_votes = (
-        df.groupby("year")["votes"]
-        .mean()
-        .reset_index(name="votes")
-    )
+
+# ── Line 2: mean votes per year ───────────────────────────
+def line_votes(aggregates):
+    import plotly.express as px
+
+    yearly_votes = _by_year(aggregates)[["year", "votes"]]
     fig_votes = px.line(
         yearly_votes,
         x="year",
         y="votes",
         title="Work Votes Over Time",
     )
+    return _style(fig_votes)
+
+
+# ── Line 3: series active per year, and their votes ──────
+def line_activity(aggregates):
+    import plotly.express as px
+
+    start, end = year_range(aggregates)
+    activity = aggregates["years.activity"]
+    activity = activity[activity["year"].between(start or -np.inf, end or np.inf)]
+    fig_active = px.line(
+        activity,
+        x="year",
+        y="active",
+        title="Active Series",
+    )
+    fig_active.add_scatter(
+        x=activity["year"],
+        y=activity["votes"],
+        name="votes of active series",
+        yaxis="y2",
+        line=dict(dash="dot"),
+    )
+    _style(fig_active)
+    fig_active.update_layout(
+        yaxis2=dict(title="votes of active series", overlaying="y", side="right", showgrid=False),
+        showlegend=False,
+    )
+    return fig_active
+
+
+# Figure builders in grid order; each only needs the aggregate bundle
+FIGURES = (line_count, line_votes)
+RUN_FIGURES = (*FIGURES, line_activity)
+
+
+def has_runs(columns):
+    """True when a dataset with *columns* has runs (see RUN_MEASURES)."""
+    return all(column in columns for column in RUN_COLUMNS)
 
-    # Shared dark theme + yellow line
-    for fig in (fig_count, fig_votes):
-        fig.update_traces(line=dict(color="yellow"))
-        fig.update_layout(template="plotly_dark", font=dict(color="yellow"))
 
-    return fig_count, fig_votes
+def generate_visualizations(df, splits=None, aggregates=None):
+    runs = has_runs(df.columns)
+    if aggregates is None:
+        aggregates = agg.compute_aggregates(df, splits, RUN_MEASURES if runs else MEASURES)
+    return tuple(build(aggregates) for build in (RUN_FIGURES if runs else FIGURES))
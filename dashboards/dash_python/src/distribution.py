@@ -0,0 +1,121 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Points beyond the whiskers kept per summary
+MAX_OUTLIERS = 200
+
+
+def summarize(values, bins=None, max_outliers=MAX_OUTLIERS, weights=None):
+    """
+    Fixed-size summary of a numeric column: the box-plot statistics
+    Plotly.js would compute from the raw points (its default "linear"
+    quartiles are numpy's "hazen" method; whiskers end at the last points
+    within 1.5 IQR), up to *max_outliers* distinct outlier values and, with
+    *bins* (anything `np.histogram` accepts), a histogram.
+
+    Outliers are drawn without jitter, so repeated values overlap anyway and
+    distinct values render the same plot; beyond the cap an evenly spaced
+    subset is kept, always including the extremes.
+
+    With *weights*, *values* are the distinct values of the column and
+    *weights* how often each occurs (e.g. a `GROUP BY value` result), so
+    the column itself never has to be materialised.
+    """
+    x = np.asarray(values, dtype=float)
+    w = np.ones(len(x), dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64)
+    keep = ~np.isnan(x) & (w > 0)
+    x, w = x[keep], w[keep]
+    summary = {"n": int(w.sum())}
+    if not len(x):
+        return summary
+
+    if weights is None:
+        q1, median, q3 = np.quantile(x, [0.25, 0.5, 0.75], method="hazen")
+    else:
+        order = np.argsort(x, kind="stable")
+        x, w = x[order], w[order]
+        q1, median, q3 = _weighted_hazen(x, w, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = x[(x >= q1 - 1.5 * iqr) & (x <= q3 + 1.5 * iqr)]
+    lowerfence = min(q1, inside.min())
+    upperfence = max(q3, inside.max())
+
+    outliers = np.unique(x[(x < lowerfence) | (x > upperfence)])
+    if len(outliers) > max_outliers:
+        keep = np.unique(np.linspace(0, len(outliers) - 1, max_outliers).round().astype(int))
+        outliers = outliers[keep]
+
+    summary.update(
+        min=float(x.min()),
+        max=float(x.max()),
+        mean=float(x.mean() if weights is None else np.average(x, weights=w)),
+        q1=float(q1),
+        median=float(median),
+        q3=float(q3),
+        lowerfence=float(lowerfence),
+        upperfence=float(upperfence),
+        outliers=outliers.tolist(),
+    )
+    if bins is not None:
+        counts, edges = np.histogram(x, bins=bins, weights=None if weights is None else w)
+        summary["histogram"] = {"edges": edges.tolist(), "counts": counts.astype(np.int64).tolist()}
+    return summary
+
+
+def _weighted_hazen(x, w, qs):
+    """`np.quantile(np.repeat(x, w), qs, method="hazen")` for sorted *x*, without the repeat."""
+    n = w.sum()
+    ends = np.cumsum(w)
+    # 0-based position of each quantile in the repeated array, and its neighbours' values
+    h = np.clip(n * np.asarray(qs) - 0.5, 0, n - 1)
+    lo = np.floor(h)
+    below = x[np.searchsorted(ends, lo, side="right")]
+    above = x[np.searchsorted(ends, np.minimum(lo + 1, n - 1), side="right")]
+    return below + (h - lo) * (above - below)
+
+
+def box_figure(summary, column, title=None):
+    """Horizontal box plot (plus outlier markers) drawn from a `summarize` result."""
+    hover = f"{column}=%{{x}}<extra></extra>"
+    fig = go.Figure(
+        [
+            go.Box(
+                q1=[summary["q1"]],
+                median=[summary["median"]],
+                q3=[summary["q3"]],
+                lowerfence=[summary["lowerfence"]],
+                upperfence=[summary["upperfence"]],
+                y=[0],
+                orientation="h",
+                name="",
+                hovertemplate=hover,
+                showlegend=False,
+            ),
+            go.Scatter(
+                x=summary["outliers"],
+                y=[0] * len(summary["outliers"]),
+                mode="markers",
+                name="",
+                hovertemplate=hover,
+                showlegend=False,
+            ),
+        ]
+    )
+    fig.update_layout(title=title, xaxis_title=column)
+    return fig
+
+
+def histogram_figure(summary, column, title=None):
+    """Histogram drawn from the binned counts of a `summarize(..., bins=...)` result."""
+    edges = np.asarray(summary["histogram"]["edges"])
+    fig = go.Figure(
+        go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=summary["histogram"]["counts"],
+            width=np.diff(edges),
+            name="",
+            hovertemplate=f"{column}=%{{x}}<br>count=%{{y}}<extra></extra>",
+        )
+    )
+    fig.update_layout(title=title, xaxis_title=column, yaxis_title="count", bargap=0)
+    return fig
@@ -0,0 +1,185 @@
+"""
+Raw IMDb scrape (`imdb_movies.csv` / `imdb_series.csv`) -> the cleaned
+datasets the dashboard reads (`movie_after_cleaning.csv` /
+`series_after_cleaning.csv`) and, optionally, their split tables.
+
+    python -m src.etl --data-dir data --workers 8
+
+The raw CSV is streamed in chunks; every chunk is parsed with vectorized
+string operations in a pool of worker processes, and the cleaned chunks
+are appended to the output in order. Memory use depends on the chunk size
+and the number of workers, not on the size of the scrape.
+"""
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.splits import SPLIT_COLUMNS, build_splits
+from src.synthetic import COLUMNS, DATA_FILES
+
+RAW_FILES = {"movie": "imdb_movies.csv", "series": "imdb_series.csv"}
+
+# Certificate -> parental guide label; certificates not listed are kept as
+# they are and a missing certificate counts as "Not Rated".
+PARENTAL_GUIDES = {
+    "G": "Kids",
+    "TV-G": "Kids",
+    "TV-Y": "Kids",
+    "PG": "Kids - with parental guidence",
+    "TV-PG": "Kids - with parental guidence",
+    "GP": "Kids - with parental guidence",
+    "M/PG": "Kids - with parental guidence",
+    "Approved": "Kids - with parental guidence",
+    "Passed": "Kids - with parental guidence",
+    "PG-13": "Teens - Age above 12",
+    "13+": "Teens - Age above 12",
+    "TV-14": "Teens - Age above 14",
+    "R": "Adults",
+    "M": "Adults",
+    "X": "Adults",
+    "NC-17": "Adults",
+    "TV-MA": "Adults",
+    "18+": "Adults",
+    "Not Rated": "Not Rated",
+    "Unrated": "Not Rated",
+}
+NOT_RATED = "Not Rated"
+
+# End year of a series still running ("2023–")
+UNFINISHED = "unfinished"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Parsers (whole columns at once)
+# ──────────────────────────────────────────────────────────────────────────────
+def parse_count(values):
+    """"2,850,860" -> 2850860 (missing stays missing)."""
+    return pd.to_numeric(values.str.replace(",", "", regex=False), errors="coerce").astype("Int64")
+
+
+def parse_money(values):
+    """"$28,884,716" -> 28884716.0."""
+    return pd.to_numeric(values.str.replace(r"[^\d.]", "", regex=True), errors="coerce").astype(float)
+
+
+def parse_duration(values):
+    """"2h 22m" / "2h" / "45m" / "50 hours 30 minutes" -> minutes."""
+    parts = values.str.extract(r"(?:(\d+)\s*h\D*)?(?:(\d+)\s*m)?")
+    hours = pd.to_numeric(parts[0], errors="coerce")
+    minutes = pd.to_numeric(parts[1], errors="coerce")
+    total = hours.fillna(0) * 60 + minutes.fillna(0)
+    return total.where(hours.notna() | minutes.notna()).astype("Int64")
+
+
+def parse_year_range(values):
+    """"2008–2013" / "2023–" / "2016" -> (start year, end year or "unfinished")."""
+    parts = values.str.extract(r"(\d{4})(?:\s*[–-]\s*(\d{4})?)?")
+    start = pd.to_numeric(parts[0], errors="coerce").astype("Int64")
+    return start, parts[1].fillna(UNFINISHED)
+
+
+def parental_guide(certificates):
+    """Certificate -> parental guide label (see `PARENTAL_GUIDES`)."""
+    return certificates.map(PARENTAL_GUIDES).fillna(certificates).fillna(NOT_RATED)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cleaning
+# ──────────────────────────────────────────────────────────────────────────────
+def clean_movies(raw):
+    """Cleaned movie rows (columns as in `movie_after_cleaning.csv`) from raw scrape rows."""
+    clean = raw.copy()
+    clean["rating"] = pd.to_numeric(raw["rating"], errors="coerce").astype(float)
+    clean["votes"] = parse_count(raw["votes"])
+    clean["year"] = raw["year"].str.strip().str[:4] + "-01-01"
+    clean["duration"] = parse_duration(raw["duration"])
+    clean["worldwide_gross"] = parse_money(raw["worldwide_gross"])
+    clean["parentalguide"] = parental_guide(raw["certificate"])
+    return clean[COLUMNS["movie"]]
+
+
+def clean_series(raw):
+    """Cleaned series rows (columns as in `series_after_cleaning.csv`) from raw scrape rows."""
+    clean = raw.copy()
+    clean["rating"] = pd.to_numeric(raw["rating"], errors="coerce").astype(float)
+    clean["votes"] = parse_count(raw["votes"])
+    clean["start_year"], clean["end_year"] = parse_year_range(raw["year"])
+    clean["year"] = clean["start_year"]
+    clean["parentalguide"] = parental_guide(raw["certificate"])
+    return clean[COLUMNS["series"]]
+
+
+CLEANERS = {"movie": clean_movies, "series": clean_series}
+
+
+def _clean_chunk(kind, raw, with_splits):
+    clean = CLEANERS[kind](raw)
+    return clean, build_splits(clean, SPLIT_COLUMNS[kind]) if with_splits else None
+
+
+def _ordered(pool, kind, chunks, with_splits, ahead):
+    """Cleaned chunks in input order, with at most *ahead* of them in flight."""
+    pending = deque()
+    for raw in chunks:
+        pending.append(pool.submit(_clean_chunk, kind, raw, with_splits))
+        if len(pending) >= ahead:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def run(data_dir, kind, out_dir=None, chunk_size=100_000, workers=None, with_splits=False):
+    """
+    Clean `<data_dir>/imdb_<kind>s.csv` into `<out_dir>/<kind>_after_cleaning.csv`
+    (*out_dir* defaults to *data_dir*) and, with *with_splits*, write the
+    split tables to `<out_dir>/splits_<kind>/<sheet>.csv` (`row_id`,
+    `title`, value), as `src.synthetic` does. Returns the cleaned CSV's path.
+    """
+    data_dir = Path(data_dir)
+    out_dir = Path(out_dir or data_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / DATA_FILES[kind]
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    split_dir = out_dir / f"splits_{kind}"
+    if with_splits:
+        split_dir.mkdir(exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    # every raw column as text: the parsers own the typing, whatever each chunk holds
+    chunks = pd.read_csv(data_dir / RAW_FILES[kind], dtype=str, chunksize=chunk_size)
+    row_offset = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, (clean, splits) in enumerate(_ordered(pool, kind, chunks, with_splits, 2 * workers)):
+            clean.to_csv(tmp, index=False, mode="w" if i == 0 else "a", header=i == 0)
+            for sheet, table in (splits or {}).items():
+                table["row_id"] += np.int32(row_offset)
+                table.to_csv(split_dir / f"{sheet}.csv", index=False, mode="w" if i == 0 else "a", header=i == 0)
+            row_offset += len(clean)
+    # readers (and the snapshot fingerprint) only ever see a complete file
+    os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=Path(__file__).resolve().parent.parent / "data",
+                        help="directory with the raw imdb_*.csv files")
+    parser.add_argument("--out", help="output data directory (default: --data-dir)")
+    parser.add_argument("--kind", choices=sorted(RAW_FILES), action="append",
+                        help="dataset(s) to clean (default: all)")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--with-splits", action="store_true", help="also write exploded split tables")
+    args = parser.parse_args()
+
+    for kind in args.kind or sorted(RAW_FILES):
+        print(run(args.data_dir, kind, args.out, args.chunk_size, args.workers, args.with_splits))
+
+
+if __name__ == "__main__":
+    main()
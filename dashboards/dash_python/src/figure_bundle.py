@@ -0,0 +1,50 @@
+import gzip
+import hashlib
+
+import plotly.io as pio
+
+
+def encode_bundle(figures):
+    """
+    Gzip-compressed JSON of every precomputed figure, shaped
+    `{graph_tab: {data_tab: [figure, ...]}}` (figures as Plotly figures or dicts).
+    """
+    body = "{" + ",".join(
+        f'"{graph_tab}":{{'
+        + ",".join(
+            f'"{data_tab}":[' + ",".join(pio.to_json(fig, validate=False) for fig in figs) + "]"
+            for data_tab, figs in by_data.items()
+        )
+        + "}"
+        for graph_tab, by_data in figures.items()
+    ) + "}"
+    return gzip.compress(body.encode(), compresslevel=9, mtime=0)
+
+
+def install(server, payload, path="/_figure-bundle", name=None):
+    """
+    Serve a bundle from `encode_bundle` (or any gzip-compressed JSON
+    *payload*) on a Flask *server* and return its URL. The URL carries a
+    digest of the content, so browsers may cache it for good; clients that
+    do not accept gzip get it decompressed. With *name*, the URL ends in
+    `/<digest>/<name>` for clients that insist on a file name.
+    """
+    from flask import Response, request
+
+    digest = hashlib.sha256(payload).hexdigest()[:16]
+    url = f"{path}/{digest}/{name}" if name else f"{path}/{digest}.json"
+
+    @server.route(url, endpoint=url)
+    def _figure_bundle():
+        headers = {
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "ETag": f'"{digest}"',
+            "Vary": "Accept-Encoding",
+        }
+        if request.if_none_match.contains(digest):
+            return Response(status=304, headers=headers)
+        if "gzip" in request.accept_encodings:
+            return Response(payload, mimetype="application/json", headers={**headers, "Content-Encoding": "gzip"})
+        return Response(gzip.decompress(payload), mimetype="application/json", headers=headers)
+
+    return url
@@ -0,0 +1,112 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+
+class FigureCache:
+    """
+    SQLite-backed store of rendered figure lists, shared by every worker
+    process that points at the same file.
+
+    Values are the builders' figures serialised to plain Plotly JSON
+    (zlib-compressed); `dcc.Graph` accepts the decoded dicts directly, so a
+    hit never touches pandas or plotly. Entries are evicted least recently
+    used first once the stored bytes exceed *max_bytes*.
+    """
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS figures (
+                    key         TEXT PRIMARY KEY,
+                    payload     BLOB NOT NULL,
+                    size        INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self):
+        # One short-lived connection per call keeps it thread/fork safe.
+        return sqlite3.connect(self.path, timeout=30)
+
+    # ── public API ───────────────────────────────────────────────
+    def get(self, key):
+        """Return the cached figure dicts for *key*, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM figures WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE figures SET last_access = ? WHERE key = ?", (time.time(), key))
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key, figures):
+        """Store *figures* (Plotly figures or dicts) under *key*."""
+        payload = zlib.compress(
+            ("[" + ",".join(_to_json(fig) for fig in figures) + "]").encode()
+        )
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO figures VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time()),
+            )
+            self._evict(conn)
+
+    def get_or_build(self, key, build):
+        """Return cached figures for *key*, calling `build()` on a miss."""
+        figures = self.get(key)
+        if figures is None:
+            figures = build()
+            self.put(key, figures)
+        return figures
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM figures")
+
+    def stats(self):
+        """Hit/miss counters of this process plus the size of the shared store."""
+        with self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM figures").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    # ── internals ────────────────────────────────────────────────
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM figures").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM figures ORDER BY last_access").fetchall():
+            conn.execute("DELETE FROM figures WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+def _to_json(fig):
+    if isinstance(fig, dict):
+        return json.dumps(fig)
+    return fig.to_json()
@@ -0,0 +1,299 @@
+"""
+World geometry for the Overview choropleth, bundled with the app.
+
+Plotly draws ISO-3 choropleths on `world_110m.json`, a TopoJSON file it
+otherwise fetches from its CDN on every page load. This module builds
+that file once from Natural Earth's 1:110m admin-0 countries and the app
+serves it from `assets/topojson/` itself:
+
+    python -m src.geo ne_110m_admin_0_countries.geojson
+
+The topology stores every border once (shared by the two countries it
+separates), on an integer grid, delta-encoded and simplified, with the
+`countries`, `land` and `coastlines` objects Plotly's base layers read.
+Countries too small for the 1:110m scale (Hong Kong, Singapore, Malta, …)
+are drawn as a small disc around their capital so they still show up.
+"""
+import argparse
+import gzip
+import json
+import math
+from pathlib import Path
+
+from src import figure_bundle
+from src.countries import iso3
+
+# Plotly requests `<topojsonURL><scope>_<resolution>m.json`
+TOPOJSON_NAME = "world_110m.json"
+ASSET_PATH = Path(__file__).resolve().parent.parent / "assets" / "topojson" / TOPOJSON_NAME
+
+QUANTIZATION = 10_000  # grid steps across the map's width and height
+TOLERANCE = 2.0  # Douglas-Peucker tolerance, in grid steps
+
+# Base layers Plotly may draw from the file; the ones Natural Earth's
+# admin-0 countries cannot provide are left empty
+EMPTY_LAYERS = ("ocean", "lakes", "rivers", "subunits")
+
+# ISO-3 -> (lon, lat) of the capital, for countries missing from the 1:110m data
+SMALL_COUNTRIES = {
+    "AND": (1.53, 42.51), "ATG": (-61.85, 17.12), "BHR": (50.58, 26.24), "BRB": (-59.62, 13.10),
+    "COM": (43.24, -11.70), "CPV": (-23.52, 14.92), "DMA": (-61.39, 15.30), "FSM": (158.15, 6.92),
+    "GRD": (-61.74, 12.05), "HKG": (114.18, 22.31), "KIR": (173.02, 1.34), "KNA": (-62.72, 17.30),
+    "LCA": (-60.99, 14.01), "LIE": (9.52, 47.13), "MAC": (113.55, 22.19), "MCO": (7.41, 43.74),
+    "MDV": (73.51, 4.18), "MHL": (171.38, 7.10), "MLT": (14.51, 35.90), "MUS": (57.50, -20.17),
+    "NRU": (166.92, -0.53), "PLW": (134.63, 7.49), "SGP": (103.85, 1.29), "SMR": (12.44, 43.94),
+    "STP": (6.73, 0.34), "SYC": (55.45, -4.62), "TON": (-175.20, -21.14), "TUV": (179.22, -8.52),
+    "VAT": (12.45, 41.90), "VCT": (-61.22, 13.16), "WSM": (-171.77, -13.84),
+}
+DISC_RADIUS = 0.4  # degrees
+DISC_SIDES = 8
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Building the topology
+# ──────────────────────────────────────────────────────────────────────────────
+def _feature_iso3(properties):
+    """ISO-3 code of a Natural Earth feature ("-99" codes fall back to the name)."""
+    for key in ("ISO_A3", "iso_a3", "ADM0_A3", "adm0_a3"):
+        code = properties.get(key)
+        if code and code != "-99":
+            return code
+    for key in ("NAME", "name", "ADMIN", "admin"):
+        code = iso3(properties.get(key))
+        if code:
+            return code
+    return None
+
+
+def _polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+def _disc(lon, lat):
+    """Clockwise ring approximating a circle of `DISC_RADIUS` degrees."""
+    ring = [
+        [lon + DISC_RADIUS * math.cos(-2 * math.pi * i / DISC_SIDES) / math.cos(math.radians(lat)),
+         lat + DISC_RADIUS * math.sin(-2 * math.pi * i / DISC_SIDES)]
+        for i in range(DISC_SIDES)
+    ]
+    return [ring + ring[:1]]
+
+
+def _signed_area(ring):
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:])) / 2
+
+
+def _quantize_ring(ring, transform, exterior):
+    """
+    Integer grid points of *ring*, closed, without repeats, wound the way
+    d3 (and so Plotly) expects: exterior rings clockwise, holes
+    counter-clockwise. None when the ring collapses on the grid.
+    """
+    (sx, sy), (tx, ty) = transform["scale"], transform["translate"]
+    points = []
+    for x, y in ring:
+        point = (round((x - tx) / sx), round((y - ty) / sy))
+        if not points or point != points[-1]:
+            points.append(point)
+    if points[0] != points[-1]:
+        points.append(points[0])
+    if len(points) < 4:
+        return None
+    if (_signed_area(points) < 0) != exterior:
+        points.reverse()
+    return points
+
+
+def _junctions(rings):
+    """Points where rings meet or part: the only places arcs may start or end."""
+    neighbours, junctions = {}, set()
+    for ring in rings:
+        points = ring[:-1]
+        for i, point in enumerate(points):
+            pair = tuple(sorted((points[i - 1], points[(i + 1) % len(points)])))
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _simplify(points, tolerance):
+    """Douglas-Peucker on an open run of points, keeping both ends."""
+    if len(points) < 3 or tolerance <= 0:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (x0, y0), (x1, y1) = points[first], points[last]
+        dx, dy = x1 - x0, y1 - y0
+        norm = math.hypot(dx, dy)
+        index, distance = None, tolerance
+        for i in range(first + 1, last):
+            x, y = points[i]
+            d = abs(dy * (x - x0) - dx * (y - y0)) / norm if norm else math.hypot(x - x0, y - y0)
+            if d > distance:
+                index, distance = i, d
+        if index is not None:
+            keep[index] = True
+            stack.extend(((first, index), (index, last)))
+    return [p for p, k in zip(points, keep) if k]
+
+
+class _Arcs:
+    """Distinct arcs; an arc seen again (either way round) gets its first index."""
+
+    def __init__(self, tolerance):
+        self.tolerance = tolerance
+        self.arcs = []
+        self.index = {}
+        self.uses = []
+
+    def add(self, points):
+        key = tuple(points)
+        if key in self.index:
+            i = self.index[key]
+        elif key[::-1] in self.index:
+            i = ~self.index[key[::-1]]
+        else:
+            i = len(self.arcs)
+            self.index[key] = i
+            self.arcs.append(points)
+            self.uses.append(0)
+        self.uses[i if i >= 0 else ~i] += 1
+        return i
+
+    def ring(self, points, junctions):
+        """Arc indices of a closed ring, cut at its junctions."""
+        points = points[:-1]
+        cuts = [i for i, p in enumerate(points) if p in junctions]
+        if not cuts:
+            # a ring no other ring touches (an island, or a hole exactly filled
+            # by one other country): one closed arc from a canonical start
+            start = points.index(min(points))
+            points = points[start:] + points[:start]
+            return [self.add(points + points[:1])]
+        points = points[cuts[0]:] + points[:cuts[0]] + [points[cuts[0]]]
+        cuts = [i for i, p in enumerate(points) if p in junctions]
+        return [self.add(points[a:b + 1]) for a, b in zip(cuts, cuts[1:])]
+
+    def encoded(self):
+        """Simplified, delta-encoded arcs."""
+        out = []
+        for points in self.arcs:
+            closed = points[0] == points[-1]
+            if closed:
+                # split the loop at its far point so both halves keep their ends
+                far = max(range(len(points)), key=lambda i: abs(points[i][0] - points[0][0]) + abs(points[i][1] - points[0][1]))
+                simplified = _simplify(points[:far + 1], self.tolerance)[:-1] + _simplify(points[far:], self.tolerance)
+                points = simplified if len(simplified) >= 4 else points
+            else:
+                points = _simplify(points, self.tolerance)
+            x0 = y0 = 0
+            deltas = []
+            for x, y in points:
+                deltas.append([x - x0, y - y0])
+                x0, y0 = x, y
+            out.append(deltas)
+        return out
+
+
+def build_topology(collection, quantization=QUANTIZATION, tolerance=TOLERANCE):
+    """
+    Plotly-compatible world TopoJSON (as a dict) from a GeoJSON
+    FeatureCollection of Natural Earth admin-0 countries.
+    """
+    countries = []
+    for feature in collection["features"]:
+        polygons = _polygons(feature.get("geometry") or {"type": None})
+        if polygons:
+            countries.append((_feature_iso3(feature.get("properties") or {}), polygons))
+    present = {code for code, _ in countries}
+    countries += [(code, [_disc(*lonlat)]) for code, lonlat in SMALL_COUNTRIES.items() if code not in present]
+
+    xs = [x for _, polygons in countries for polygon in polygons for ring in polygon for x, _ in ring]
+    ys = [y for _, polygons in countries for polygon in polygons for ring in polygon for _, y in ring]
+    transform = {
+        "scale": [(max(xs) - min(xs)) / (quantization - 1), (max(ys) - min(ys)) / (quantization - 1)],
+        "translate": [min(xs), min(ys)],
+    }
+
+    quantized = []
+    for code, polygons in countries:
+        rings = []
+        for polygon in polygons:
+            polygon = [_quantize_ring(ring, transform, exterior=i == 0) for i, ring in enumerate(polygon)]
+            if polygon[0] is not None:
+                rings.append([ring for ring in polygon if ring is not None])
+        if rings:
+            quantized.append((code, rings))
+
+    junctions = _junctions([ring for _, polygons in quantized for polygon in polygons for ring in polygon])
+    arcs = _Arcs(tolerance)
+    geometries = []
+    for code, polygons in quantized:
+        polygons = [[arcs.ring(ring, junctions) for ring in polygon] for polygon in polygons]
+        geometry = (
+            {"type": "Polygon", "arcs": polygons[0]}
+            if len(polygons) == 1
+            else {"type": "MultiPolygon", "arcs": polygons}
+        )
+        if code:
+            geometry["id"] = code
+        geometries.append(geometry)
+
+    # coastline = every arc only one country uses (a shared arc is a border)
+    coast = [i for i, uses in enumerate(arcs.uses) if uses == 1]
+    objects = {
+        "countries": {"type": "GeometryCollection", "geometries": geometries},
+        "land": {
+            "type": "MultiPolygon",
+            "arcs": [
+                polygon
+                for geometry in geometries
+                for polygon in ([geometry["arcs"]] if geometry["type"] == "Polygon" else geometry["arcs"])
+            ],
+        },
+        "coastlines": {"type": "MultiLineString", "arcs": [[i] for i in coast]},
+        **{name: {"type": "GeometryCollection", "geometries": []} for name in EMPTY_LAYERS},
+    }
+    return {"type": "Topology", "transform": transform, "objects": objects, "arcs": arcs.encoded()}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Serving
+# ──────────────────────────────────────────────────────────────────────────────
+def install(server, path="/_geo"):
+    """
+    Serve the bundled `world_110m.json` on a Flask *server* and return the
+    `topojsonURL` to give `dcc.Graph(config=...)`. Like the figure bundle,
+    the URL carries a digest of the file, so browsers cache it for good.
+    """
+    payload = gzip.compress(ASSET_PATH.read_bytes(), compresslevel=9, mtime=0)
+    url = figure_bundle.install(server, payload, path, name=TOPOJSON_NAME)
+    return url[: -len(TOPOJSON_NAME)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Natural Earth admin-0 countries as GeoJSON")
+    parser.add_argument("--out", default=ASSET_PATH, type=Path)
+    parser.add_argument("--quantization", type=int, default=QUANTIZATION)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="simplification, in grid steps")
+    args = parser.parse_args()
+
+    with open(args.source, encoding="utf-8") as f:
+        topology = build_topology(json.load(f), args.quantization, args.tolerance)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(topology, separators=(",", ":")), encoding="utf-8")
+    print(f"{args.out}: {len(topology['objects']['countries']['geometries'])} countries, "
+          f"{len(topology['arcs'])} arcs, {args.out.stat().st_size / 1024:.0f} kB")
+
+
+if __name__ == "__main__":
+    main()
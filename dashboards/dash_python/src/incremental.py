@@ -0,0 +1,239 @@
+"""
+Aggregates kept as running tallies that rows can be added to and taken
+out of, so a data drop updates them in time proportional to the drop
+rather than to the dataset.
+
+`AggregateState.build(frame, splits, measures)` tallies every measure of
+src/aggregates.py into counts and sums per key:
+
+  rows / mean          rows; non-missing values and their sum
+  count / distinct /   rows per value (plus the non-missing values of the
+  group_size /         averaged column and their sum, for group means)
+  group_mean
+  distribution         rows per distinct value
+  year_cube            rows, values and sums per (year, group)
+  activity             works and summed weight per (start, end) run
+
+and `result()` turns the tallies into the bundle `compute_aggregates`
+returns for the same rows. `apply(added, removed)` is the state with the
+tallies of *added* rows added and those of *removed* rows (the old
+versions of changed rows) subtracted; a key whose rows all went is
+dropped. Keys new to a state go after the ones it has, so ties between
+equal counts break by the order values arrived in – the order of a cold
+start for appended rows.
+
+Distributions are exact for columns with few distinct values (ratings);
+sketched (IMDB_APPROXIMATE=1) measures cannot subtract and are not
+supported.
+"""
+import numpy as np
+import pandas as pd
+
+from src.distribution import summarize
+from src.intervals import active_per_year, run_end_years
+from src.utils import add_percentage
+from src.year_cube import YearCube
+
+# Key of rows without a group (year cubes) or without an end year (activity)
+NO_KEY = "\0"
+
+
+def _floats(series):
+    return series.to_numpy(dtype=float, na_value=np.nan)
+
+
+def _keys(series):
+    """`(codes, labels, categorical)`: integer codes of *series* (-1 = missing) and the labels they stand for."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.array.codes, np.asarray(series.cat.categories, dtype=object), True
+    codes, uniques = pd.factorize(series, sort=False)
+    return codes, np.asarray(uniques, dtype=object), False
+
+
+def _labelled(codes, labels):
+    """The label of every code, `NO_KEY` for missing ones."""
+    out = np.full(len(codes), NO_KEY, dtype=object)
+    present = codes >= 0
+    out[present] = labels[codes[present]]
+    return out
+
+
+def _groups(codes, labels, values=None):
+    """Rows per label (and the count and sum of non-missing *values*), labels with rows only, in label order."""
+    valid = codes >= 0
+    n = np.bincount(codes[valid], minlength=len(labels))
+    columns = {"n": n}
+    if values is not None:
+        ok = valid & ~np.isnan(values)
+        columns["valid"] = np.bincount(codes[ok], minlength=len(labels))
+        columns["total"] = np.bincount(codes[ok], weights=values[ok], minlength=len(labels))
+    return pd.DataFrame(columns, index=pd.Index(labels, dtype=object))[n > 0]
+
+
+def _cells(first, codes, labels, values, names, sums):
+    """
+    Rows per (*first*, label of *codes*) pair – missing labels as `NO_KEY` –
+    and the sums (`"sum"`) and non-missing counts (`"count"`) of *values*
+    listed in *sums*.
+    """
+    grouped = pd.DataFrame({"first": first, "code": codes, "value": values}).groupby(["first", "code"], sort=False)
+    tally = pd.DataFrame({"n": grouped.size(), **{column: grouped["value"].agg(how) for column, how in sums.items()}})
+    tally.index = pd.MultiIndex.from_arrays(
+        [tally.index.get_level_values(0).to_numpy(dtype=np.int64),
+         _labelled(tally.index.get_level_values(1).to_numpy(), labels)],
+        names=names,
+    )
+    return tally
+
+
+def _tally(m, frame, splits):
+    """`(parts, categorical)`: the tallies of measure *m* over some rows, and whether its keys are categorical."""
+    table = frame if m.source == "frame" else splits[m.source]
+
+    if m.kind == "rows":
+        return {"rows": pd.DataFrame({"n": [len(table)]})}, False
+
+    if m.kind == "mean":
+        values = _floats(table[m.column])
+        ok = ~np.isnan(values)
+        return {"values": pd.DataFrame({"n": [int(ok.sum())], "total": [values[ok].sum()]})}, False
+
+    if m.kind == "distribution":
+        values = _floats(table[m.column])
+        uniques, n = np.unique(values[~np.isnan(values)], return_counts=True)
+        return {"values": pd.DataFrame({"n": n}, index=uniques)}, False
+
+    if m.kind == "activity":
+        starts = table[m.column].to_numpy(dtype=np.int64)
+        if m.end in table.columns:
+            codes, labels, _ = _keys(table[m.end])
+        else:
+            codes, labels = np.full(len(table), -1), np.empty(0, dtype=object)
+        runs = _cells(starts, codes, labels, _floats(table[m.value]), ["start", "end"], {"weight": "sum"})
+        return {"runs": runs}, m.end in table.columns
+
+    codes, labels, categorical = _keys(table[m.column])
+    if m.kind in ("count", "distinct", "group_size"):
+        return {"groups": _groups(codes, labels)}, categorical
+    if m.kind == "group_mean":
+        return {"groups": _groups(codes, labels, _floats(table[m.value]))}, categorical
+    if m.kind == "year_cube":
+        cells = _cells(table["year"].to_numpy(dtype=np.int64), codes, labels, _floats(table[m.value]),
+                       ["year", "key"], {"total": "sum", "valid": "count"})
+        return {"groups": _groups(codes, labels), "cells": cells}, categorical
+    raise ValueError(f"Unknown measure kind {m.kind!r} for {m.name!r}.")
+
+
+def _merge(a, b, sign):
+    """Tally *a* plus *sign* times tally *b*; *b*'s new keys go last, keys left without rows are dropped."""
+    at = a.index.get_indexer(b.index)
+    new = at < 0
+    columns = {}
+    for column in a.columns:
+        values = sign * b[column].to_numpy()
+        merged = np.concatenate([a[column].to_numpy(), values[new]])
+        merged[at[~new]] += values[~new]
+        columns[column] = merged
+    merged = pd.DataFrame(columns, index=a.index.append(b.index[new]))
+    return merged[merged["n"] != 0]
+
+
+def _result(m, parts, flag):
+    """The aggregate of measure *m* from its tallies, as `compute_aggregates` returns it."""
+    if m.kind == "rows":
+        return int(parts["rows"]["n"].sum())
+
+    if m.kind == "mean":
+        n = parts["values"]["n"].sum()
+        return float(parts["values"]["total"].sum() / n) if n else float("nan")
+
+    if m.kind == "distribution":
+        values = parts["values"]
+        return summarize(values.index.to_numpy(dtype=float), bins=m.bins, max_outliers=m.top_n,
+                         weights=values["n"].to_numpy())
+
+    if m.kind == "activity":
+        runs = parts["runs"]
+        starts = runs.index.get_level_values("start").to_numpy()
+        ends = None
+        if flag:  # the dataset has an end column: missing or "unfinished" ends run to the latest year
+            ends = np.where(runs.index.get_level_values("end") == NO_KEY, None, runs.index.get_level_values("end"))
+        years, active, weighted = active_per_year(
+            starts, run_end_years(starts, ends), runs["weight"].to_numpy(), counts=runs["n"].to_numpy()
+        )
+        return pd.DataFrame({"year": years, "active": active, m.value: weighted})
+
+    groups = parts["groups"]
+    labels = groups.index.to_numpy()
+    n = groups["n"].to_numpy()
+    # categorical groups come in category (arrival) order, plain ones sorted
+    order = np.arange(len(labels)) if flag else np.argsort(labels, kind="stable")
+
+    if m.kind == "count":
+        top = np.argsort(-n, kind="stable")[: m.top_n]
+        return add_percentage(pd.DataFrame({m.column: labels[top], "count": n[top]}))
+
+    if m.kind == "distinct":
+        return labels
+
+    if m.kind == "group_size":
+        return pd.DataFrame({m.column: labels[order], "count": n[order]})
+
+    if m.kind == "group_mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = groups["total"].to_numpy()[order] / groups["valid"].to_numpy()[order]
+        return pd.DataFrame({m.column: labels[order], m.value: means})
+
+    if m.kind == "year_cube":
+        labels = labels[order]
+        cells = parts["cells"]
+        return YearCube(
+            cells.index.get_level_values("year").to_numpy(),
+            pd.Index(labels, dtype=object).get_indexer(cells.index.get_level_values("key")),
+            labels,
+            cells["total"].to_numpy(),
+            by=m.column,
+            value=m.value,
+            counts=cells["n"].to_numpy(),
+            valid=cells["valid"].to_numpy(),
+        )
+
+    raise ValueError(f"Unknown measure kind {m.kind!r} for {m.name!r}.")
+
+
+class AggregateState:
+    """Running tallies of *measures* over one dataset; see the module docstring."""
+
+    def __init__(self, measures, tallies, flags):
+        self.measures = list(measures)
+        self.tallies = tallies  # {measure name: {part: tally frame}}
+        self.flags = flags  # {measure name: categorical keys / has an end column}
+
+    @classmethod
+    def build(cls, frame, splits, measures):
+        """The state of *measures* over a dataset's rows (*frame* and the *splits* they read)."""
+        tallies, flags = {}, {}
+        for m in measures:
+            tallies[m.name], flags[m.name] = _tally(m, frame, splits)
+        return cls(measures, tallies, flags)
+
+    def apply(self, added, removed=None):
+        """
+        This state with the rows of *added* counted in and those of
+        *removed* taken out, each a `(frame, splits)` pair of rows as
+        `build` takes them. Returns a new state; this one is left as it is.
+        """
+        tallies = self.tallies
+        for rows, sign in ((added, 1), (removed, -1)):
+            if rows is None:
+                continue
+            delta = AggregateState.build(*rows, self.measures).tallies
+            tallies = {
+                name: {part: _merge(tally, delta[name][part], sign) for part, tally in parts.items()}
+                for name, parts in tallies.items()
+            }
+        return AggregateState(self.measures, tallies, self.flags)
+
+    def result(self):
+        """`{name: aggregate}`, exactly as `compute_aggregates` returns it for the rows tallied."""
+        return {m.name: _result(m, self.tallies[m.name], self.flags[m.name]) for m in self.measures}
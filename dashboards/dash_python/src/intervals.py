@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+
+def active_per_year(starts, ends, weights=None, counts=None):
+    """
+    Number of intervals covering each year – and the sum of their *weights* –
+    for inclusive [start, end] year intervals, via a difference array: +1 at
+    every start, -1 just past every end, then one running sum. Linear in the
+    number of intervals plus the years spanned, however long each run is.
+
+    Returns `(years, active, weighted)` over every year from the first start
+    to the last end; `weighted` is None without *weights*. With *counts*,
+    each interval stands for that many works (e.g. a `GROUP BY start, end`
+    result) and *weights* holds their summed weight.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.maximum(np.asarray(ends, dtype=np.int64), starts)
+    if not len(starts):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, None if weights is None else np.empty(0)
+
+    first = int(starts.min())
+    span = int(ends.max()) - first + 1
+    opened, closed = starts - first, ends - first + 1
+
+    years = np.arange(first, first + span)
+    active = np.cumsum(np.bincount(opened, weights=counts, minlength=span + 1)
+                       - np.bincount(closed, weights=counts, minlength=span + 1))[:span]
+    if counts is not None:
+        active = active.astype(np.int64)
+    if weights is None:
+        return years, active, None
+
+    weights = np.nan_to_num(np.asarray(weights, dtype=float))
+    delta = (np.bincount(opened, weights=weights, minlength=span + 1)
+             - np.bincount(closed, weights=weights, minlength=span + 1))
+    return years, active, np.cumsum(delta)[:span]
+
+
+def run_end_years(start, end):
+    """
+    Last active year of every work: *end* where it is a year, else (e.g.
+    "unfinished") still running in the latest year the data mentions.
+    Without an *end* column (movies) a work is active in its start year only.
+    """
+    start = np.asarray(start, dtype=np.int64)
+    if end is None:
+        return start
+    end = pd.to_numeric(pd.Series(np.asarray(end, dtype=object)), errors="coerce").to_numpy()
+    latest = max(int(start.max()) if len(start) else 0, int(np.nanmax(end)) if np.isfinite(end).any() else 0)
+    return np.where(np.isnan(end), latest, end).astype(np.int64)
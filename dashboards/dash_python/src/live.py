@@ -0,0 +1,172 @@
+"""
+Serving new data drops without a restart.
+
+Everything the app derives from one version of the data hangs off a
+`Release`: the datasets, the running aggregate tallies of the exact
+pandas engine (src/incremental.py) and a memo of per-version results
+(aggregate bundles, indexes, KPI constants). A release never changes
+data once built. When the cleaned CSVs change, `advance` makes the next
+release from the current one:
+
+* a dataset whose new snapshot is a delta over the one served (rows
+  appended or changed in place, see `snapshot.refresh`) is patched in
+  memory, and each of its aggregate states gets the changed rows added
+  and their old versions taken out – time proportional to the drop;
+* any other changed dataset is opened afresh and read on first use;
+* an unchanged dataset is shared with the new release, states and all.
+
+The app then swaps the new release in with a single assignment: a request
+reads the release once and uses it throughout, so it never mixes two
+versions. `Watcher` notices the drops.
+"""
+import os
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+from src.aggregates import requirements
+from src.bitmap_index import filter_dataset
+from src.incremental import AggregateState
+from src.snapshot import LazyDataset, read_delta
+
+# Results of a release kept per `memo(..., bounded=True)` (e.g. cross-filtered aggregates)
+RECENT_RESULTS = 32
+
+
+class Release:
+    """One version of the served data and what is derived from it; see the module docstring."""
+
+    def __init__(self, datasets, states=None):
+        self.datasets = datasets  # {name: LazyDataset}
+        self.version = "-".join(dataset.version for dataset in datasets.values())
+        self.store = None  # SQL backend of this version (IMDB_BACKEND), opened by the app
+        self.states = dict(states or {})  # {(dataset name, tag): AggregateState}
+        self._memo = {}
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+
+    def memo(self, key, fn, bounded=False):
+        """
+        `fn()`, computed once per release for *key*; with *bounded*, only
+        the `RECENT_RESULTS` most recently used keys are kept.
+        """
+        cache = self._recent if bounded else self._memo
+        with self._lock:
+            if key in cache:
+                if bounded:
+                    cache.move_to_end(key)
+                return cache[key]
+        value = fn()
+        with self._lock:
+            cache[key] = value
+            if bounded and len(cache) > RECENT_RESULTS:
+                cache.popitem(last=False)
+        return value
+
+    def state(self, name, tag, measures):
+        """Running tallies (*tag*) of *measures* over dataset *name*, built on first use."""
+        with self._lock:
+            state = self.states.get((name, tag))
+        if state is None:
+            frame, splits = self.datasets[name].load(*requirements(measures))
+            state = AggregateState.build(frame, splits, measures)
+            with self._lock:
+                state = self.states.setdefault((name, tag), state)
+        return state
+
+
+def advance(release, entries):
+    """
+    The release after *release* for the snapshot *entries* (`{name:
+    manifest entry}`, as `snapshot.refresh` returns them), or *release*
+    itself when none of them changed. See the module docstring.
+    """
+    if all(entries[name] is None or entries[name]["version"] == dataset.version
+           for name, dataset in release.datasets.items()):
+        return release
+
+    datasets, states = {}, {}
+    for name, dataset in release.datasets.items():
+        entry = entries[name]
+        kept = {key: state for key, state in release.states.items() if key[0] == name}
+        if entry is None or entry["version"] == dataset.version:
+            datasets[name] = dataset
+            states.update(kept)
+            continue
+
+        delta = read_delta(dataset.cache_dir, name, entry) if entry.get("base") == dataset.version else None
+        if delta is None:
+            datasets[name] = LazyDataset(dataset.data_dir, name, dataset.cache_dir, entry=entry)
+            continue
+
+        positions, rows = delta
+        patched = datasets[name] = dataset.patched(entry, positions, rows)
+        replaced = positions[positions < dataset.entry["rows"]]
+        for key, state in kept.items():
+            columns, sheets = requirements(state.measures)
+            states[key] = state.apply(
+                filter_dataset(*patched.load(columns, sheets), positions),
+                filter_dataset(*dataset.load(columns, sheets), replaced) if len(replaced) else None,
+            )
+    return Release(datasets, states)
+
+
+class Watcher:
+    """
+    Polls the (size, mtime) stamps of *paths* every *interval* seconds in
+    a daemon thread and calls *on_change* once they have changed and then
+    held still for a whole interval, so a file still being written is left
+    alone. A failing *on_change* is reported and not retried until the
+    files change again.
+    """
+
+    def __init__(self, paths, on_change, interval):
+        self.paths = list(paths)
+        self.on_change = on_change
+        self.interval = interval
+        self.reloads = 0  # changes handled
+        self.failures = 0  # changes *on_change* failed on
+        self._seen = self._last = self._stamps()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _stamps(self):
+        stamps = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_size, stat.st_mtime_ns))
+        return stamps
+
+    def start(self):
+        """Start polling in this process, unless it already does (threads do not survive a fork)."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name="reload", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.poll()
+
+    def poll(self):
+        """Check once; True when the files had changed and settled and *on_change* was called."""
+        stamps = self._stamps()
+        settled = stamps == self._last
+        self._last = stamps
+        if stamps == self._seen or not settled:
+            return False
+        self._seen = stamps
+        try:
+            self.on_change()
+            self.reloads += 1
+        except Exception:
+            self.failures += 1
+            traceback.print_exc()
+        return True
@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+# IMDB_METRICS=0 turns every hook below into a no-op.
+ENABLED = os.environ.get("IMDB_METRICS", "1") != "0"
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1e3, 5e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+
+
+# metric name -> (help, buckets, {labels: Histogram})
+_HISTOGRAMS = {
+    "imdb_dashboard_duration_seconds": ("Time spent per stage.", DURATION_BUCKETS, {}),
+    "imdb_dashboard_response_bytes": ("Callback response body size.", BYTES_BUCKETS, {}),
+}
+_GAUGES = {}  # metric name -> (help, callable returning {labels: value})
+_registry_lock = threading.Lock()
+
+
+def observe(metric, value, **labels):
+    """Record *value* in histogram *metric* under *labels*."""
+    if not ENABLED:
+        return
+    _, buckets, series = _HISTOGRAMS[metric]
+    key = tuple(sorted(labels.items()))
+    hist = series.get(key)
+    if hist is None:
+        with _registry_lock:
+            hist = series.setdefault(key, Histogram(buckets))
+    hist.observe(value)
+
+
+def register_gauge(metric, help_text, collect):
+    """Expose `collect()` – a `{labels-dict-as-tuple: value}` mapping – on /metrics."""
+    _GAUGES[metric] = (help_text, collect)
+
+
+@contextmanager
+def _timed(stage, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe("imdb_dashboard_duration_seconds", elapsed, stage=stage, name=name)
+        _add_server_timing(f"{stage}-{name}", elapsed)
+
+
+def timed(stage, name=""):
+    """Context manager timing one *stage* (e.g. "builder") of work *name*."""
+    return _timed(stage, name) if ENABLED else nullcontext()
+
+
+def instrument(stage, name=None):
+    """Decorator form of `timed`; returns *fn* untouched when disabled."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _timed(stage, label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Flask integration
+# ──────────────────────────────────────────────────────────────────────────────
+def _add_server_timing(name, seconds):
+    from flask import g, has_request_context
+
+    if has_request_context():
+        g.setdefault("server_timing", []).append((name, seconds))
+
+
+def _label_value(value):
+    """*value* escaped for a quoted label value of the text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key):
+    return ",".join(f'{k}="{_label_value(v)}"' for k, v in key)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric, (help_text, _, series) in _HISTOGRAMS.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for key, hist in sorted(series.items()):
+            labels = _labels(key)
+            sep = "," if labels else ""
+            for bound, count in zip(hist.buckets, hist.counts):
+                lines.append(f'{metric}_bucket{{{labels}{sep}le="{bound:g}"}} {count}')
+            lines.append(f'{metric}_bucket{{{labels}{sep}le="+Inf"}} {hist.count}')
+            lines.append(f"{metric}_sum{{{labels}}} {hist.sum:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+    for metric, (help_text, collect) in _GAUGES.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        for key, value in collect().items():
+            lines.append(f"{metric}{{{_labels(key)}}} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def install(server, path="/metrics", outputs=None):
+    """
+    Add the `/metrics` endpoint and per-request timing to a Flask *server*:
+    every response gets a `Server-Timing` header listing the stages timed
+    while serving it plus the total, and Dash callback responses have
+    their body size recorded. They are labelled by callback output when it
+    is one of `outputs()` (e.g. a Dash app's `callback_map`), otherwise as
+    "other": the output named in a request is up to the client.
+    """
+    if not ENABLED:
+        return
+
+    from flask import Response, g, request
+
+    @server.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
+
+    @server.after_request
+    def _finish_timer(response):
+        start = g.get("request_start")
+        if start is None:
+            return response
+        total = time.perf_counter() - start
+        entries = g.get("server_timing", [])
+
+        if request.path.endswith("/_dash-update-component"):
+            body = request.get_json(silent=True) or {}
+            output = body.get("output") if isinstance(body, dict) else None
+            if outputs is None or not isinstance(output, str) or output not in outputs():
+                output = "other"
+            observe("imdb_dashboard_duration_seconds", total, stage="request", name=output)
+            if not response.direct_passthrough:
+                observe("imdb_dashboard_response_bytes", response.calculate_content_length() or 0, output=output)
+
+        response.headers["Server-Timing"] = ", ".join(
+            [f"{name};dur={seconds * 1000:.1f}" for name, seconds in entries]
+            + [f"total;dur={total * 1000:.1f}"]
+        )
+        return response
+
+    @server.route(path)
+    def _metrics():
+        return Response(render(), mimetype="text/plain; version=0.0.4")
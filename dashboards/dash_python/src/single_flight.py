@@ -0,0 +1,82 @@
+"""
+Single-flight: concurrent identical computations run once.
+
+When many users open the same tab at the same moment, every request
+thread would otherwise build the same aggregates and figures side by
+side. `SingleFlight.do(key, fn)` runs `fn` for the first caller of a key
+and holds every caller that arrives while it runs; all of them get the
+same result (or the same exception). Nothing is cached beyond the call.
+
+Across worker processes, `do(..., shared=True)` with a *lock_dir* also
+takes an exclusive `flock` on a per-key lock file around `fn`: a worker
+that finds the key being computed elsewhere waits for it and then runs
+`fn` itself, which is cheap when `fn` first looks in a store the other
+worker has just filled (such as the shared figure cache).
+"""
+import hashlib
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Per-key coalescing of concurrent calls; see the module docstring."""
+
+    def __init__(self, lock_dir=None):
+        self.lock_dir = Path(lock_dir) if lock_dir else None
+        if self.lock_dir:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.leaders = 0  # calls that ran their function
+        self.joined = 0  # calls that waited for another caller's result instead
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, shared=False):
+        """`fn()`, or the result of the identical call already in flight for *key*."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.joined += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            with self._process_lock(key) if shared and self.lock_dir else nullcontext():
+                call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    @contextmanager
+    def _process_lock(self, key):
+        """Exclusive lock on *key* shared by every process using the same *lock_dir*."""
+        import fcntl
+
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:20]
+        fd = os.open(self.lock_dir / f"{digest}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # releases the lock
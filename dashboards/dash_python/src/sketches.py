@@ -0,0 +1,122 @@
+"""
+Mergeable sketches for the approximate aggregation mode (IMDB_APPROXIMATE=1).
+
+Both sketches are built per partition (a chunk of rows, a data file, a
+worker's share) and merged, and a merge is as accurate as building one
+sketch over all the data at once.
+
+* `HyperLogLog` – distinct counts in 2**p one-byte registers. Relative
+  standard error 1.04 / sqrt(2**p): about 1.6 % at the default p=12
+  (4 kB), i.e. within 3.3 % for ~95 % of estimates.
+* `HeavyHitters` – the k most frequent values (Misra-Gries / space-saving
+  summary) in O(k) memory. Every reported count is a lower bound that is
+  at most `max_error` <= n / (k + 1) below the true count (n = values
+  seen); values that occur more than n / (k + 1) times are never missed.
+  While fewer than k + 1 distinct values have been seen, it is exact.
+"""
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values):
+    """Stable 64-bit hashes of *values* (categoricals hash each category once)."""
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.array.codes
+        hashes = pd.util.hash_array(np.asarray(values.cat.categories, dtype=object))
+        return hashes[codes[codes >= 0]]
+    values = pd.Series(values).dropna()
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+class HyperLogLog:
+    """Approximate distinct count; see the module docstring for its error bound."""
+
+    def __init__(self, p=12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        """Relative standard error of `count()`."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def update(self, values):
+        return self.update_hashes(hash_values(values))
+
+    def update_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        # rank = position of the first 1-bit in the remaining 64 - p bits
+        rest = (hashes << np.uint64(self.p)) | np.uint64(1 << (self.p - 1))
+        rank = (64 - np.frexp(rest.astype(np.float64))[1] + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision.")
+        merged = HyperLogLog(self.p)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+
+class HeavyHitters:
+    """Top-k frequent values; see the module docstring for its error bound."""
+
+    def __init__(self, k=1024):
+        self.k = k
+        self.counts = {}
+        self.n = 0
+        self.max_error = 0
+
+    def update(self, values, weights=None):
+        """Add one partition of *values* (optionally pre-counted via *weights*)."""
+        if weights is None:
+            if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+                codes = values.array.codes
+                freq = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+                values, weights = np.asarray(values.cat.categories, dtype=object)[freq > 0], freq[freq > 0]
+            else:
+                counted = pd.Series(values).value_counts(sort=False)
+                values, weights = counted.index.to_numpy(), counted.to_numpy()
+        partition = HeavyHitters(self.k)
+        partition.counts = dict(zip(values, np.asarray(weights).tolist()))
+        partition.n = int(np.sum(weights))
+        merged = self.merge(partition)
+        self.counts, self.n, self.max_error = merged.counts, merged.n, merged.max_error
+        return self
+
+    def merge(self, other):
+        """
+        Summary of both inputs: counters are added, and when more than k
+        survive, the (k+1)-th largest is subtracted from all of them and the
+        non-positive ones are dropped (Agarwal et al., "Mergeable Summaries").
+        """
+        counts = dict(self.counts)
+        for value, c in other.counts.items():
+            counts[value] = counts.get(value, 0) + c
+        max_error = self.max_error + other.max_error
+        if len(counts) > self.k:
+            cut = sorted(counts.values(), reverse=True)[self.k]
+            counts = {v: c - cut for v, c in counts.items() if c > cut}
+            max_error += cut
+        merged = HeavyHitters(self.k)
+        merged.counts, merged.n, merged.max_error = counts, self.n + other.n, max_error
+        return merged
+
+    def top(self, n=None):
+        """`[(value, count), ...]`, most frequent first (ties in first-seen order)."""
+        items = sorted(self.counts.items(), key=lambda item: -item[1])
+        return items[:n]
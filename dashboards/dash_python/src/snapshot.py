@@ -0,0 +1,542 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import metrics
+from src.compact import compact_frame, compact_splits
+from src.splits import SPLIT_COLUMNS, build_splits
+
+# Cleaned CSV behind every dataset the dashboard serves. The split tables
+# are derived from it (see src/splits.py), so the XLSX files are not read.
+SOURCES = {
+    "movie": ("movie_after_cleaning.csv",),
+    "series": ("series_after_cleaning.csv",),
+}
+
+# Bump when the snapshot layout or the split derivation changes.
+FORMAT_VERSION = 4
+
+CACHE_DIRNAME = ".cache"
+MANIFEST_NAME = "manifest.json"
+
+# Versions of a dataset whose files are kept: the current one and those
+# before it, which processes that have not reloaded yet may still read
+KEEP_VERSIONS = 3
+# ... and any version replaced less than this long ago, however many came
+# after it: a worker still serving it reads columns from it on first use
+PRUNE_GRACE_SECONDS = 3600
+
+# Largest share of a dataset's rows a drop may change in place and still be
+# applied as a delta (see `refresh`); beyond it the snapshot is rebuilt
+MAX_CHANGED_FRACTION = 0.25
+
+
+def _fingerprint(path):
+    """Cheap (size, mtime) stamp of a source file."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_path(cache_dir, name, version, part=None):
+    """
+    Feather file of one version of dataset *name*: its frame, or the split
+    sheet / delta named *part*. Each version has its own files, so a
+    process keeps reading the version it serves while a newer one is written.
+    """
+    suffix = f".{part}" if part else ""
+    return Path(cache_dir) / f"{name}.{version}{suffix}.feather"
+
+
+def _atomic_write_feather(df, path):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    df.reset_index(drop=True).to_feather(tmp)
+    os.replace(tmp, path)
+
+
+def _read_manifest(cache_dir):
+    try:
+        return json.loads((cache_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(cache_dir, manifest):
+    path = cache_dir / MANIFEST_NAME
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, path)
+
+
+def _is_fresh(entry, data_dir, sources):
+    """
+    True when the snapshot in *entry* still matches *sources*.
+
+    Sizes/mtimes are compared first; only when those moved is the file
+    re-hashed, so a plain `touch` or a checkout does not force a rebuild.
+    Refreshed stamps are written back into *entry*.
+    """
+    if not entry or entry.get("format") != FORMAT_VERSION:
+        return False
+    if set(entry.get("sources", {})) != set(sources):
+        return False
+
+    for name in sources:
+        recorded = entry["sources"][name]
+        path = data_dir / name
+        stamp = _fingerprint(path)
+        if stamp["size"] != recorded["size"]:
+            return False
+        if stamp["mtime_ns"] != recorded["mtime_ns"]:
+            if _sha256(path) != recorded["sha256"]:
+                return False
+            recorded.update(stamp)
+    return True
+
+
+def source_columns(data_dir, name):
+    """Column names of dataset *name*'s cleaned CSV, from its header line alone (none when it is missing)."""
+    (csv_name,) = SOURCES[name]
+    try:
+        with open(Path(data_dir) / csv_name, newline="") as fh:
+            return next(csv.reader(fh), [])
+    except OSError:
+        return []
+
+
+def read_sources(data_dir, name):
+    """Parse the cleaned CSV for dataset *name* and derive its split tables."""
+    (csv_name,) = SOURCES[name]
+    frame = pd.read_csv(data_dir / csv_name)
+    return frame, build_splits(frame, SPLIT_COLUMNS[name])
+
+
+def _entry(data_dir, name, cache_dir, frame, splits, **extra):
+    """
+    Write *frame* and *splits* as the snapshot of dataset *name*'s source
+    files as they are now and return the manifest entry describing it.
+    """
+    sources = {}
+    for source in SOURCES[name]:
+        path = data_dir / source
+        sources[source] = {**_fingerprint(path), "sha256": _sha256(path)}
+    version = hashlib.sha256(
+        f"{FORMAT_VERSION}:".encode() + "".join(s["sha256"] for s in sources.values()).encode()
+    ).hexdigest()[:16]
+
+    _atomic_write_feather(frame, snapshot_path(cache_dir, name, version))
+    for sheet, table in splits.items():
+        _atomic_write_feather(table, snapshot_path(cache_dir, name, version, sheet))
+
+    return {
+        "format": FORMAT_VERSION,
+        "sources": sources,
+        "rows": len(frame),
+        "columns": list(frame.columns),
+        "sheets": list(splits),
+        "version": version,
+        **extra,
+    }
+
+
+def build_snapshot(data_dir, name, cache_dir=None):
+    """
+    Compile dataset *name* into Feather files under `<data_dir>/.cache`
+    and return the manifest entry describing them.
+    """
+    data_dir = Path(data_dir)
+    cache_dir = Path(cache_dir or data_dir / CACHE_DIRNAME)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    frame, splits = read_sources(data_dir, name)
+    return _entry(data_dir, name, cache_dir, frame, splits)
+
+
+def build_delta_snapshot(data_dir, name, base, positions, rows, cache_dir=None):
+    """
+    Write the snapshot of dataset *name* that is the snapshot *base* (a
+    manifest entry) with cleaned *rows* written at row *positions*
+    (positions past its end append), without parsing or splitting any
+    other row, and return its manifest entry. The rows are also kept as
+    the version's delta (see `read_delta`).
+    """
+    data_dir = Path(data_dir)
+    cache_dir = Path(cache_dir or data_dir / CACHE_DIRNAME)
+
+    frame = _patch_rows(pd.read_feather(snapshot_path(cache_dir, name, base["version"])), positions, rows)
+    added = _positioned(build_splits(rows, SPLIT_COLUMNS[name]), positions)
+    replaced = positions[positions < base["rows"]]
+    splits = {}
+    for sheet in base["sheets"]:
+        table = pd.read_feather(snapshot_path(cache_dir, name, base["version"], sheet))
+        table = _patch_split(table, replaced, added[sheet])
+        # categories in order of first appearance, as `build_splits` makes them
+        values = np.asarray(table[sheet], dtype=object)
+        table[sheet] = pd.Categorical(values, categories=pd.unique(values))
+        splits[sheet] = table
+
+    entry = _entry(data_dir, name, cache_dir, frame, splits, base=base["version"])
+    _atomic_write_feather(rows.assign(row_id=positions), snapshot_path(cache_dir, name, entry["version"], "delta"))
+    return entry
+
+
+def read_delta(cache_dir, name, entry):
+    """
+    `(positions, rows)` that made snapshot *entry* of dataset *name* from
+    snapshot `entry["base"]`, or None when it was built from the CSV.
+    """
+    path = snapshot_path(cache_dir, name, entry["version"], "delta")
+    if not entry.get("base") or not path.exists():
+        return None
+    rows = pd.read_feather(path)
+    return rows.pop("row_id").to_numpy(), rows
+
+
+def ensure_snapshot(data_dir, name, cache_dir=None):
+    """
+    Manifest entry of dataset *name*'s Feather snapshot, (re)building it
+    first when any of the source files changed; None without pyarrow.
+    """
+    return refresh(data_dir, name, None, cache_dir)
+
+
+def refresh(data_dir, name, base, cache_dir=None):
+    """
+    Manifest entry of dataset *name*'s snapshot of its source files as
+    they are now; None without pyarrow.
+
+    A drop that appends rows to the cleaned CSV or changes some of them in
+    place is applied to the snapshot *base* (the entry the caller serves)
+    as a delta: only the new and changed rows are split and written in
+    (`build_delta_snapshot`), and a process serving *base* can patch what
+    it holds in memory the same way (`read_delta`). Anything else – rows
+    removed, columns changed, most rows changed, no *base* – rebuilds the
+    snapshot from the CSV. A snapshot already up to date (say, refreshed
+    by another worker) is returned as it is.
+    """
+    data_dir = Path(data_dir)
+    cache_dir = Path(cache_dir or data_dir / CACHE_DIRNAME)
+
+    try:
+        import pyarrow  # noqa: F401  (feather backend)
+    except ImportError:
+        return None
+
+    manifest = _read_manifest(cache_dir)
+    entry = manifest.get(name)
+    if not _is_fresh(entry, data_dir, SOURCES[name]):
+        delta = _source_delta(data_dir, name, base, cache_dir) if _is_complete(cache_dir, name, base) else None
+        if delta is None:
+            fresh = build_snapshot(data_dir, name, cache_dir)
+        else:
+            fresh = build_delta_snapshot(data_dir, name, base, *delta, cache_dir)
+        history = [entry["version"], *entry.get("history", [])] if entry else []
+        fresh["history"] = [version for version in history if version != fresh["version"]][:KEEP_VERSIONS - 1]
+        fresh["retired"] = {**entry.get("retired", {}), entry["version"]: time.time()} if entry else {}
+        fresh["retired"].pop(fresh["version"], None)
+        entry = fresh
+    manifest[name] = entry = _prune(cache_dir, name, entry)
+    _write_manifest(cache_dir, manifest)
+    return entry
+
+
+def _is_complete(cache_dir, name, entry):
+    """True when every file of snapshot *entry* is on disk, in the current format."""
+    if not entry or entry.get("format") != FORMAT_VERSION:
+        return False
+    return all(
+        snapshot_path(cache_dir, name, entry["version"], part).exists() for part in (None, *entry["sheets"])
+    )
+
+
+def _prune(cache_dir, name, entry):
+    """
+    Delete the files of dataset *name*'s versions that *entry* neither is,
+    has in its history, nor replaced less than `PRUNE_GRACE_SECONDS` ago
+    (files of versions it has no record of: written that long ago). Returns
+    *entry* with the records of the deleted versions dropped.
+    """
+    now = time.time()
+    retired = entry.get("retired", {})
+    keep = {entry["version"], *entry.get("history", [])}
+    keep |= {version for version, at in retired.items() if now - at < PRUNE_GRACE_SECONDS}
+    for path in Path(cache_dir).glob(f"{name}.*feather"):
+        version = path.name[len(name) + 1:].split(".", 1)[0]
+        if version in keep:
+            continue
+        try:
+            if version not in retired and now - path.stat().st_mtime < PRUNE_GRACE_SECONDS:
+                continue
+            path.unlink()
+        except FileNotFoundError:  # pruned by another process
+            pass
+    return {**entry, "retired": {version: at for version, at in retired.items() if version in keep}}
+
+
+def load_dataset(data_dir, name, cache_dir=None, columns=None, sheets=None):
+    """
+    Return `(frame, splits)` for dataset *name* ("movie" or "series").
+
+    Reads from the Feather snapshot, (re)building it first when any of the
+    source files changed. *columns* / *sheets* restrict what is read (None
+    = everything); split sheets read that way carry `row_id` and their
+    values only. Without pyarrow it falls back to parsing the CSV directly.
+    """
+    data_dir = Path(data_dir)
+    cache_dir = Path(cache_dir or data_dir / CACHE_DIRNAME)
+
+    entry = ensure_snapshot(data_dir, name, cache_dir)
+    if entry is None:
+        frame, splits = read_sources(data_dir, name)
+        if columns is not None:
+            frame = frame[[c for c in frame.columns if c in columns]]
+        if sheets is not None:
+            splits = {sheet: splits[sheet][["row_id", sheet]] for sheet in sheets if sheet in splits}
+        return frame, splits
+    return read_snapshot(cache_dir, name, entry, columns, sheets)
+
+
+def read_snapshot(cache_dir, name, entry, columns=None, sheets=None):
+    """`(frame, splits)` of snapshot *entry* of dataset *name*, restricted as in `load_dataset`."""
+    version = entry["version"]
+    if columns is None:
+        frame = pd.read_feather(snapshot_path(cache_dir, name, version))
+    else:
+        frame = pd.read_feather(
+            snapshot_path(cache_dir, name, version), columns=[c for c in entry["columns"] if c in columns]
+        )
+        if frame.columns.empty:
+            frame = pd.DataFrame(index=pd.RangeIndex(entry["rows"]))
+    splits = {
+        sheet: pd.read_feather(
+            snapshot_path(cache_dir, name, version, sheet), columns=None if sheets is None else ["row_id", sheet]
+        )
+        for sheet in entry["sheets"]
+        if sheets is None or sheet in sheets
+    }
+    return frame, splits
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Deltas
+# ──────────────────────────────────────────────────────────────────────────────
+def _source_delta(data_dir, name, base, cache_dir):
+    """
+    `(positions, rows)`: the rows of dataset *name*'s cleaned CSV that are
+    new since snapshot *base* or differ from it, and their row positions;
+    None when the CSV changed in any other way.
+
+    When the file only grew, the bytes it had are hashed rather than
+    parsed and just the tail is read; otherwise every row is compared.
+    """
+    (csv_name,) = SOURCES[name]
+    path = data_dir / csv_name
+    rows = _appended(path, base["sources"][csv_name])
+    if rows is not None:
+        if list(rows.columns) != base["columns"]:
+            return None
+        return np.arange(base["rows"], base["rows"] + len(rows)), rows
+
+    frame = pd.read_csv(path)
+    old = pd.read_feather(snapshot_path(cache_dir, name, base["version"]))
+    if list(frame.columns) != list(old.columns) or len(frame) < len(old):
+        return None
+    changed = np.flatnonzero(_row_hashes(frame.iloc[:len(old)]) != _row_hashes(old))
+    if len(changed) > MAX_CHANGED_FRACTION * len(old):
+        return None
+    positions = np.concatenate([changed, np.arange(len(old), len(frame))])
+    return positions, frame.iloc[positions].reset_index(drop=True)
+
+
+def _appended(path, recorded):
+    """
+    The rows added to the end of the CSV at *path* since it was the file
+    *recorded* (size and sha256), or None when it changed otherwise.
+    """
+    size = recorded["size"]
+    if path.stat().st_size <= size:
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        fh.seek(0)
+        remaining, last = size, b""
+        while remaining:
+            block = fh.read(min(1 << 20, remaining))
+            if not block:
+                return None
+            digest.update(block)
+            remaining, last = remaining - len(block), block
+        # the old file must have ended on a row boundary
+        if digest.hexdigest() != recorded["sha256"] or not last.endswith(b"\n"):
+            return None
+        tail = fh.read()
+    return pd.read_csv(io.BytesIO(header + tail))
+
+
+def _row_hashes(frame):
+    """One 64-bit hash per row of *frame*, the same whatever dtypes its values were parsed as."""
+    normalized = pd.DataFrame(
+        {
+            column: values.astype(float) if pd.api.types.is_numeric_dtype(values) else values.astype(str)
+            for column, values in frame.items()
+        }
+    )
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def _positioned(splits, positions):
+    """Split tables of some rows, their `row_id`s mapped to those rows' *positions*."""
+    return {sheet: table.assign(row_id=positions[table["row_id"].to_numpy()]) for sheet, table in splits.items()}
+
+
+def _concat(tables):
+    """
+    Rows of *tables* one after another. Categorical columns stay
+    categorical: the first table's categories first, then each next
+    table's new ones, so existing codes keep their meaning.
+    """
+    columns = {}
+    for column in tables[0].columns:
+        parts = [table[column] for table in tables]
+        if not isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[column] = pd.concat(parts, ignore_index=True)
+            continue
+        parts = [part if isinstance(part.dtype, pd.CategoricalDtype) else part.astype("category") for part in parts]
+        categories = parts[0].cat.categories
+        for part in parts[1:]:
+            categories = categories.append(part.cat.categories.difference(categories, sort=False))
+        codes = []
+        for part in parts:
+            mapping = categories.get_indexer(part.cat.categories)
+            part_codes = part.array.codes
+            codes.append(np.where(part_codes >= 0, mapping[part_codes], -1))
+        columns[column] = pd.Series(
+            pd.Categorical.from_codes(np.concatenate(codes), dtype=pd.CategoricalDtype(categories))
+        )
+    return pd.DataFrame(columns, index=pd.RangeIndex(sum(len(table) for table in tables)))
+
+
+def _patch_rows(frame, positions, rows):
+    """*frame* with *rows* written at row *positions* (positions past its end append)."""
+    combined = _concat([frame, rows[list(frame.columns)]])
+    order = np.arange(max(len(frame), int(positions.max()) + 1 if len(positions) else 0))
+    order[positions] = len(frame) + np.arange(len(rows))
+    return combined.take(order).reset_index(drop=True)
+
+
+def _patch_split(table, replaced, added):
+    """
+    Split *table* without the values of the works at positions *replaced*,
+    with *added* (split rows, `row_id`s already positions) merged in, in
+    `row_id` order.
+    """
+    kept = table[~np.isin(table["row_id"].to_numpy(), replaced)]
+    merged = _concat([kept, added[list(table.columns)]])
+    return merged.take(np.argsort(merged["row_id"].to_numpy(), kind="stable")).reset_index(drop=True)
+
+
+class LazyDataset:
+    """
+    One dataset, held compacted (see src/compact.py) and read from the
+    snapshot only as far as it is used: `load(columns, sheets)` reads just
+    the columns and split sheets not in memory yet, so a worker never holds
+    text no builder reads, nor a dataset or sheet nobody has asked for.
+
+    A dataset stays on the snapshot version it was opened at (*entry*,
+    by default the current one), whatever versions are written after it.
+    """
+
+    def __init__(self, data_dir, name, cache_dir=None, entry=None):
+        self.data_dir, self.name = Path(data_dir), name
+        self.cache_dir = Path(cache_dir or self.data_dir / CACHE_DIRNAME)
+        self.entry = entry if entry is not None else ensure_snapshot(self.data_dir, name, self.cache_dir)
+        self.frame = None
+        self.splits = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self.entry["version"] if self.entry else ""
+
+    def load(self, columns=(), sheets=()):
+        """
+        `(frame, splits)` with at least *columns* (those the dataset has)
+        and *sheets*. The frames returned are never modified afterwards:
+        a later load that adds columns builds new ones.
+        """
+        with self._lock:
+            if self.entry is None:  # no pyarrow: no column access, read it all once
+                if self.frame is None:
+                    self.frame, self.splits = self._read(None, None)
+                return self.frame, self.splits
+
+            loaded = () if self.frame is None else self.frame.columns
+            missing = [c for c in self.entry["columns"] if c in columns and c not in loaded]
+            if self.frame is None or missing:
+                part, _ = self._read(missing, ())
+                self.frame = part if self.frame is None else pd.concat([self.frame, part], axis=1)
+
+            missing_sheets = [s for s in self.entry["sheets"] if s in sheets and s not in self.splits]
+            if missing_sheets:
+                _, parts = self._read((), missing_sheets)
+                self.splits = {**self.splits, **parts}
+            return self.frame, self.splits
+
+    def load_all(self):
+        """`(frame, splits)` with every column and split sheet."""
+        if self.entry is None:
+            return self.load()
+        return self.load(self.entry["columns"], self.entry["sheets"])
+
+    def patched(self, entry, positions, rows):
+        """
+        This dataset at snapshot *entry*, made from its own by writing the
+        cleaned *rows* at row *positions* (see `read_delta`). The columns
+        and sheets already in memory are patched with the compacted rows
+        instead of being read again; this dataset itself is left as it is.
+        """
+        dataset = LazyDataset(self.data_dir, self.name, self.cache_dir, entry=entry)
+        with self._lock:
+            frame, splits = self.frame, self.splits
+        if frame is None:
+            return dataset
+
+        with metrics.timed("load", self.name):
+            dataset.frame = _patch_rows(frame, positions, compact_frame(rows[list(frame.columns)]))
+            if splits:
+                sources = {sheet: SPLIT_COLUMNS[self.name][sheet] for sheet in splits}
+                added = {
+                    sheet: table[["row_id", sheet]]
+                    for sheet, table in _positioned(build_splits(rows, sources), positions).items()
+                }
+                added = compact_splits(None, added)
+                replaced = positions[positions < len(frame)]
+                dataset.splits = compact_splits(
+                    None, {sheet: _patch_split(table, replaced, added[sheet]) for sheet, table in splits.items()}
+                )
+        return dataset
+
+    def _read(self, columns, sheets):
+        with metrics.timed("load", self.name):
+            if self.entry is None:
+                frame, splits = load_dataset(self.data_dir, self.name, self.cache_dir, columns, sheets)
+            else:
+                frame, splits = read_snapshot(self.cache_dir, self.name, self.entry, columns, sheets)
+            frame = compact_frame(frame)
+            return frame, compact_splits(frame, splits)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Split sheet name -> comma-separated source column of the cleaned CSV.
+SPLIT_COLUMNS = {
+    "movie": {
+        "country": "country",
+        "creators": "director",
+        "stars": "stars",
+        "production_company": "production_company",
+        "language": "language",
+        "genre": "genre",
+        "writer": "writer",
+    },
+    "series": {
+        "country": "country",
+        "creators": "creators",
+        "stars": "stars",
+        "production_company": "production_company",
+        "language": "language",
+        "genre": "genre",
+    },
+}
+
+# Tokens the scraper uses for "no value"; pandas already read them as NaN
+# from the old Excel sheets, so they are dropped here too.
+MISSING_TOKENS = {"", "None"}
+
+
+def build_splits(frame, columns):
+    """
+    Explode the comma-separated *columns* of *frame* into split tables.
+
+    *columns* maps each output sheet name to its source column. All columns
+    are melted into one long Series and split/exploded in a single pass,
+    then cut back into one DataFrame per sheet with columns:
+      row_id  – position of the parent work in *frame*
+      title   – title of the parent work
+      <sheet> – the individual value, as a categorical (dictionary-encoded)
+                with categories in order of first appearance, so ties in
+                `value_counts()` break the same way as on plain strings
+    """
+    sheets = list(columns)
+    wide = frame[[columns[sheet] for sheet in sheets]].copy()
+    wide.columns = sheets
+
+    long = (
+        wide.reset_index(drop=True)
+        .rename_axis("row_id")
+        .reset_index()
+        .melt(id_vars="row_id", var_name="sheet", value_name="value")
+        .dropna(subset=["value"])
+    )
+    long["value"] = long["value"].astype(str).str.split(",")
+    long = long.explode("value", ignore_index=True)
+    long["value"] = long["value"].str.strip()
+    long = long[~long["value"].isin(MISSING_TOKENS)]
+
+    row_ids = long["row_id"].to_numpy(dtype=np.int32)
+    titles = frame["title"].to_numpy()
+    sheet_codes = pd.Categorical(long["sheet"], categories=sheets).codes
+    values = long["value"].to_numpy()
+
+    splits = {}
+    for code, sheet in enumerate(sheets):
+        mask = sheet_codes == code
+        sheet_values = values[mask]
+        splits[sheet] = pd.DataFrame(
+            {
+                "row_id": row_ids[mask],
+                "title": titles[row_ids[mask]],
+                sheet: pd.Categorical(sheet_values, categories=pd.unique(sheet_values)),
+            }
+        )
+    return splits
@@ -0,0 +1,344 @@
+"""
+Aggregates answered by an embedded SQL engine over an on-disk store,
+instead of pandas over frames held by every worker (IMDB_BACKEND).
+
+The store is one file under `<data_dir>/.cache` – SQLite (standard
+library) or DuckDB (optional `duckdb` package) – written once from the
+compacted datasets and then opened read-only by every worker process:
+
+  <name>                    the work frame, plus `row_id` (its position)
+  <name>__<sheet>           one split table: `row_id`, `<sheet>`
+  <name>__dict__<column>    `code`, `value` of a dictionary-encoded column
+
+Categorical columns are stored as their integer codes, so groups and ties
+come out in exactly the order the pandas engine (src/aggregates.py)
+produces. `SQLBackend.compute_aggregates` takes the same measures and
+returns the same bundle; a cross-filter selection becomes a `row_id`
+sub-query rather than a filtered copy of the frames.
+"""
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.distribution import summarize
+from src.intervals import active_per_year, run_end_years
+from src.utils import add_percentage
+from src.year_cube import YearCube
+
+ENGINES = ("sqlite", "duckdb")
+
+# Bump when the store layout changes.
+STORE_FORMAT = 1
+
+# Rows written per INSERT batch when building the store
+WRITE_CHUNK_ROWS = 100_000
+
+
+def store_path(cache_dir, engine):
+    return Path(cache_dir) / f"store.{engine}"
+
+
+def _connect(path, engine, read_only=True):
+    if engine == "duckdb":
+        try:
+            import duckdb
+        except ImportError as exc:
+            raise ImportError("IMDB_BACKEND=duckdb needs the `duckdb` package.") from exc
+        return duckdb.connect(str(path), read_only=read_only)
+    if engine != "sqlite":
+        raise ValueError(f"Unknown SQL engine {engine!r}; expected one of {ENGINES}.")
+    if read_only:
+        return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    return sqlite3.connect(path)
+
+
+def _query(conn, engine, sql, params=()):
+    if engine == "duckdb":
+        return conn.execute(sql, list(params)).df()
+    return pd.read_sql_query(sql, conn, params=list(params))
+
+
+def _write_table(conn, engine, table, frame):
+    """Create *table* from *frame*, inserting it in chunks."""
+    for start in range(0, max(len(frame), 1), WRITE_CHUNK_ROWS):
+        chunk = frame.iloc[start:start + WRITE_CHUNK_ROWS]
+        if engine == "duckdb":
+            conn.register("chunk", chunk)
+            verb = "CREATE TABLE" if start == 0 else "INSERT INTO"
+            conn.execute(f'{verb} "{table}" {"AS " if start == 0 else ""}SELECT * FROM chunk')
+            conn.unregister("chunk")
+        else:
+            chunk.to_sql(table, conn, index=False, if_exists="replace" if start == 0 else "append")
+
+
+def _dictionary_encode(frame):
+    """*frame* with categorical columns replaced by nullable codes, and their dictionaries."""
+    frame = frame.copy()
+    dictionaries = {}
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            codes = frame[column].array.codes
+            dictionaries[column] = pd.DataFrame(
+                {"code": np.arange(len(frame[column].cat.categories)),
+                 "value": np.asarray(frame[column].cat.categories, dtype=object)}
+            )
+            frame[column] = pd.array(np.where(codes >= 0, codes, 0), dtype="Int32")
+            frame.loc[codes < 0, column] = pd.NA
+    return frame, dictionaries
+
+
+def build_store(path, engine, datasets, version):
+    """
+    Write *datasets* – `{name: (frame, splits)}`, as compacted by
+    src/compact.py – into a new store at *path*, tagged with *version*.
+    The file is built next to *path* and renamed into place, so workers
+    never open a half-written store.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+
+    conn = _connect(tmp, engine, read_only=False)
+    try:
+        layout = {}
+        for name, (frame, splits) in datasets.items():
+            encoded, dictionaries = _dictionary_encode(frame)
+            encoded.insert(0, "row_id", np.arange(len(frame), dtype=np.int64))
+            _write_table(conn, engine, name, encoded)
+            for sheet, table in splits.items():
+                encoded_sheet, sheet_dictionaries = _dictionary_encode(table[["row_id", sheet]])
+                _write_table(conn, engine, f"{name}__{sheet}", encoded_sheet)
+                conn.execute(f'CREATE INDEX "{name}__{sheet}__by_value" ON "{name}__{sheet}" ("{sheet}")')
+                dictionaries.update(sheet_dictionaries)
+            for column, dictionary in dictionaries.items():
+                table = f"{name}__dict__{column}"
+                _write_table(conn, engine, table, dictionary)
+                conn.execute(f'CREATE UNIQUE INDEX "{table}__by_code" ON "{table}" (code)')
+                conn.execute(f'CREATE INDEX "{table}__by_value" ON "{table}" (value)')
+            layout[name] = {"columns": list(frame.columns), "sheets": list(splits), "dictionaries": sorted(dictionaries)}
+
+        meta = pd.DataFrame(
+            {"key": ["format", "version", "layout"], "value": [str(STORE_FORMAT), version, json.dumps(layout)]}
+        )
+        _write_table(conn, engine, "store_meta", meta)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+
+
+def _read_meta(path, engine):
+    try:
+        conn = _connect(path, engine)
+    except Exception:
+        return {}
+    try:
+        meta = _query(conn, engine, "SELECT key, value FROM store_meta")
+    except Exception:
+        return {}
+    finally:
+        conn.close()
+    return dict(zip(meta["key"], meta["value"]))
+
+
+def open_store(cache_dir, engine, datasets, version):
+    """
+    The `SQLBackend` over the store in *cache_dir*, (re)built from
+    *datasets* (`{name: (frame, splits)}`, or a callable returning it) when
+    it is missing or was written for another data *version*.
+    """
+    path = store_path(cache_dir, engine)
+    meta = _read_meta(path, engine)
+    if meta.get("format") != str(STORE_FORMAT) or meta.get("version") != version:
+        build_store(path, engine, datasets() if callable(datasets) else datasets, version)
+        meta = _read_meta(path, engine)
+    return SQLBackend(path, engine, json.loads(meta["layout"]))
+
+
+class SQLBackend:
+    """Evaluates aggregate measures with SQL against a store built by `build_store`."""
+
+    def __init__(self, path, engine, layout):
+        self.path = Path(path)
+        self.engine = engine
+        self.layout = layout
+
+    def _connect(self):
+        # One short-lived read-only connection per evaluation keeps it thread/fork safe.
+        return _connect(self.path, self.engine)
+
+    def _where(self, name, selection):
+        """
+        SQL condition (and parameters) restricting `row_id` to the works
+        matching *selection*. A dimension must be one of the dataset's split
+        sheets or frame columns: names are never taken into SQL otherwise.
+        """
+        active = {dim: vals for dim, vals in (selection or {}).items() if vals}
+        if not active:
+            return "", []
+
+        layout = self.layout[name]
+        unknown = [dim for dim in active if dim not in layout["sheets"] and dim not in layout["columns"]]
+        if unknown:
+            raise ValueError(f"Unknown cross-filter dimensions for {name!r}: {unknown!r}")
+
+        queries, params = [], []
+        for dim, vals in active.items():
+            table = f"{name}__{dim}" if dim in layout["sheets"] else name
+            marks = ", ".join("?" * len(vals))
+            if dim in layout["dictionaries"]:
+                values = f'SELECT code FROM "{name}__dict__{dim}" WHERE value IN ({marks})'
+            else:
+                values = marks
+            queries.append(f'SELECT row_id FROM "{table}" WHERE "{dim}" IN ({values})')
+            params.extend(vals)
+        return f"row_id IN ({' INTERSECT '.join(queries)})", params
+
+    def compute_aggregates(self, name, measures, selection=None):
+        """
+        Evaluate *measures* against dataset *name*, restricted to the works
+        matching *selection* (`{dimension: [values]}`), and return
+        `{name: result}` exactly as `aggregates.compute_aggregates` would.
+        """
+        where, params = self._where(name, selection)
+        conn = self._connect()
+        try:
+            return {m.name: _Evaluation(self, conn, name, m, where, params).run() for m in measures}
+        finally:
+            conn.close()
+
+
+class _Evaluation:
+    """One measure of one dataset, as SQL."""
+
+    def __init__(self, backend, conn, name, measure, where, params):
+        self.backend, self.conn, self.name, self.m = backend, conn, name, measure
+        self.table = name if measure.source == "frame" else f"{name}__{measure.source}"
+        self.where, self.params = where, params
+
+    def rows(self, *conditions):
+        """`FROM ... WHERE ...` over the selected rows of the measure's table."""
+        conditions = [c for c in (self.where, *conditions) if c]
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f'FROM "{self.table}"{where}'
+
+    def query(self, sql):
+        """Run *sql*, built on `rows()`, with the selection's parameters."""
+        return _query(self.conn, self.backend.engine, sql, self.params)
+
+    def labels(self, dictionary):
+        return _query(self.conn, self.backend.engine, f"SELECT code, value FROM {dictionary} ORDER BY code")
+
+    def dictionary(self, column):
+        """Dictionary table of *column*, or None when it is stored as plain values."""
+        if column in self.backend.layout[self.name]["dictionaries"]:
+            return f'"{self.name}__dict__{column}"'
+        return None
+
+    def grouped(self, extra="", order_by="key"):
+        """
+        Rows per value of the measure's column (plus *extra* aggregates),
+        labelled through its dictionary; `first` is the first row holding it.
+        """
+        column = f'"{self.m.column}"'
+        grouped = (f"SELECT {column} AS key, COUNT(*) AS n, MIN(row_id) AS first{extra} "
+                   f"{self.rows(f'{column} IS NOT NULL')} GROUP BY {column}")
+        dictionary = self.dictionary(self.m.column)
+        if dictionary is None:
+            return self.query(f"SELECT key AS label, g.* FROM ({grouped}) g ORDER BY {order_by}")
+        return self.query(f"SELECT d.value AS label, g.* FROM ({grouped}) g "
+                          f"JOIN {dictionary} d ON d.code = g.key ORDER BY {order_by}")
+
+    def run(self):
+        m = self.m
+        column = f'"{m.column}"'
+        # categorical groups come in dictionary order, plain ones sorted; ties
+        # between counts break by first appearance (dictionary order again)
+        categorical = self.dictionary(m.column) is not None
+        first = "g.key" if categorical else "first"
+
+        if m.kind == "rows":
+            return int(self.query(f"SELECT COUNT(*) AS n {self.rows()}")["n"].iloc[0])
+
+        if m.kind == "mean":
+            return float(pd.to_numeric(self.query(f"SELECT AVG({column}) AS v {self.rows()}")["v"]).iloc[0])
+
+        if m.kind == "distribution":
+            counts = self.query(f"SELECT {column} AS v, COUNT(*) AS n {self.rows(f'{column} IS NOT NULL')} "
+                                f"GROUP BY {column}")
+            return summarize(counts["v"], bins=m.bins, max_outliers=m.top_n, weights=counts["n"])
+
+        if m.kind == "count":
+            result = self.grouped(order_by=f"n DESC, {first}" + (f" LIMIT {int(m.top_n)}" if m.top_n else ""))
+            return add_percentage(pd.DataFrame({m.column: result["label"].to_numpy(), "count": result["n"].to_numpy()}))
+
+        if m.kind == "distinct":
+            return self.grouped(order_by=first)["label"].to_numpy()
+
+        if m.kind == "group_size":
+            result = self.grouped(order_by="g.key")
+            return pd.DataFrame({m.column: result["label"].to_numpy(), "count": result["n"].to_numpy()})
+
+        if m.kind == "group_mean":
+            result = self.grouped(extra=f', AVG("{m.value}") AS v', order_by="g.key")
+            return pd.DataFrame({m.column: result["label"].to_numpy(),
+                                 m.value: pd.to_numeric(result["v"]).to_numpy(dtype=float)})
+
+        if m.kind == "year_cube":
+            return self.year_cube()
+
+        if m.kind == "activity":
+            return self.activity()
+
+        raise ValueError(f"Unknown measure kind {m.kind!r} for {m.name!r}.")
+
+    def year_cube(self):
+        m = self.m
+        cells = self.query(
+            f'SELECT year, "{m.column}" AS key, COUNT(*) AS n, SUM("{m.value}") AS total, '
+            f'COUNT("{m.value}") AS valid {self.rows()} GROUP BY year, "{m.column}"'
+        )
+        present = cells["key"].notna().to_numpy()
+        codes = np.full(len(cells), -1, dtype=np.int64)
+        dictionary = self.dictionary(m.column)
+        if dictionary is None:
+            labels = np.sort(cells["key"][present].unique())
+            codes[present] = np.searchsorted(labels, cells["key"][present])
+        else:
+            labels = self.labels(dictionary)["value"]
+            codes[present] = cells["key"][present].astype(np.int64)
+        return YearCube(
+            cells["year"].to_numpy(),
+            codes,
+            np.asarray(labels, dtype=object),
+            pd.to_numeric(cells["total"]).to_numpy(dtype=float),
+            by=m.column,
+            value=m.value,
+            counts=cells["n"].to_numpy(),
+            valid=cells["valid"].to_numpy(),
+        )
+
+    def activity(self):
+        m = self.m
+        has_end = m.end in self.backend.layout[self.name]["columns"]
+        end = f'"{m.end}"' if has_end else "NULL"
+        cells = self.query(
+            f'SELECT "{m.column}" AS start, {end} AS finish, COUNT(*) AS n, SUM("{m.value}") AS weight '
+            f'{self.rows()} GROUP BY "{m.column}", {end}'
+        )
+        finish = None
+        if has_end:
+            finish = cells["finish"]
+            dictionary = self.dictionary(m.end)
+            if dictionary is not None:
+                labels = self.labels(dictionary)
+                finish = pd.to_numeric(finish).map(dict(zip(labels["code"], labels["value"])))
+        years, active, weighted = active_per_year(
+            cells["start"], run_end_years(cells["start"], finish), pd.to_numeric(cells["weight"]), counts=cells["n"]
+        )
+        return pd.DataFrame({"year": years, "active": active, m.value: weighted})
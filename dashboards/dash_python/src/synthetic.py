@@ -0,0 +1,237 @@
+"""
+Synthetic IMDB datasets shaped like `movie_after_cleaning.csv` /
+`series_after_cleaning.csv`, at any scale.
+
+    python -m src.synthetic --movies 8000000 --series 2000000 --out /tmp/imdb-10m
+
+A profile is fitted from the shipped data (see `fit_profile`) and rows are
+generated and appended to disk chunk by chunk, so memory use depends on the
+chunk size, not on the number of works.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.splits import SPLIT_COLUMNS, build_splits
+
+# Column order of the shipped cleaned CSVs
+COLUMNS = {
+    "movie": ["link", "description", "rating", "votes", "year", "duration", "title", "genre",
+              "director", "writer", "stars", "country", "language", "production_company",
+              "worldwide_gross", "parentalguide"],
+    "series": ["link", "description", "rating", "votes", "title", "type", "genre", "creators",
+               "stars", "country", "language", "production_company", "end_year", "start_year",
+               "year", "parentalguide"],
+}
+
+DATA_FILES = {"movie": "movie_after_cleaning.csv", "series": "series_after_cleaning.csv"}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fitting
+# ──────────────────────────────────────────────────────────────────────────────
+def _empirical(values):
+    """Distinct values and their probabilities."""
+    counts = pd.Series(values).value_counts(dropna=False)
+    return {"values": counts.index.tolist(), "p": (counts / counts.sum()).tolist()}
+
+
+def _zipf_exponent(freq):
+    """Slope of the log rank / log frequency line (Zipf's s)."""
+    freq = np.sort(np.asarray(freq, dtype=float))[::-1]
+    if len(freq) < 3:
+        return 1.0
+    ranks = np.arange(1, len(freq) + 1)
+    slope, _ = np.polyfit(np.log(ranks), np.log(freq), 1)
+    return float(max(0.1, -slope))
+
+
+def _heaps_exponent(values):
+    """Vocabulary growth exponent from the distinct count at half vs full size."""
+    values = pd.Series(values)
+    half = values.iloc[: len(values) // 2].nunique()
+    full = values.nunique()
+    if half <= 1 or full <= half:
+        return 0.0
+    return float(min(1.0, np.log(full / half) / np.log(2)))
+
+
+def _lognormal(values, floor):
+    values = np.asarray(values, dtype=float)
+    logs = np.log(values - floor)
+    return {"floor": float(floor), "mu": float(logs.mean()), "sigma": float(logs.std()), "max": float(values.max())}
+
+
+def _draw_lognormal(rng, fit, n):
+    """Shifted log-normal draws, capped at the largest fitted value."""
+    return np.minimum(fit["floor"] + np.exp(rng.normal(fit["mu"], fit["sigma"], n)), fit["max"])
+
+
+def fit_profile(frame, kind):
+    """
+    Fit a generation profile for *kind* ("movie"/"series") from a cleaned frame:
+    empirical distributions for ratings, durations, years and parental guides,
+    a shifted log-normal for the (heavily skewed) votes and grosses, and for
+    every multi-valued column the values-per-work distribution plus a Zipf
+    rank/frequency law and a Heaps vocabulary-growth exponent.
+    """
+    splits = build_splits(frame, SPLIT_COLUMNS[kind])
+    profile = {
+        "kind": kind,
+        "works": len(frame),
+        "rating": _empirical(frame["rating"]),
+        "votes": _lognormal(frame["votes"], frame["votes"].min() - 1),
+        "parentalguide": _empirical(frame["parentalguide"]),
+        "multi": {},
+    }
+
+    for sheet, column in SPLIT_COLUMNS[kind].items():
+        table = splits[sheet]
+        freq = table[sheet].value_counts()
+        per_work = np.bincount(table["row_id"], minlength=len(frame))
+        profile["multi"][column] = {
+            "names": freq.index.astype(str).tolist(),
+            "zipf": _zipf_exponent(freq.to_numpy()),
+            "heaps": _heaps_exponent(table[sheet].astype(str)),
+            "per_work": _empirical(per_work),
+        }
+
+    if kind == "movie":
+        profile["year"] = _empirical(frame["year"].str[:4].astype(int))
+        profile["duration"] = _empirical(frame["duration"])
+        gross = frame["worldwide_gross"].dropna()
+        profile["gross"] = {**_lognormal(gross, 0), "missing": float(frame["worldwide_gross"].isna().mean())}
+    else:
+        start = frame["start_year"].astype(int)
+        finished = frame["end_year"] != "unfinished"
+        run = frame.loc[finished, "end_year"].astype(int) - start[finished]
+        profile["start_year"] = _empirical(start)
+        profile["run_years"] = _empirical(run.clip(lower=0))
+        profile["unfinished"] = float((~finished).mean())
+    return profile
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Generation
+# ──────────────────────────────────────────────────────────────────────────────
+def _sample(rng, dist, n):
+    values = np.asarray(dist["values"])
+    return values[rng.choice(len(values), size=n, p=dist["p"])]
+
+
+def _vocabulary(column, spec, works, fitted_works):
+    """Names for every rank; grows with the dataset following Heaps' law."""
+    names = spec["names"]
+    size = max(len(names), int(len(names) * (works / fitted_works) ** spec["heaps"]))
+    label = column.replace("_", " ").title()
+    extra = np.array([f"{label} {i}" for i in range(len(names), size)], dtype=object)
+    return np.concatenate([np.array(names, dtype=object), extra])
+
+
+def _multi_valued(rng, spec, vocab, cdf, n):
+    """Comma-joined Zipf-distributed values, deduplicated within each work."""
+    k = _sample(rng, spec["per_work"], n).astype(int)
+    width = max(1, int(k.max()))
+    ranks = np.searchsorted(cdf, rng.random((n, width)))
+    keep = np.arange(width) < k[:, None]
+    for j in range(1, width):
+        keep[:, j] &= ~(ranks[:, :j] == ranks[:, [j]]).any(axis=1)
+
+    out = np.full(n, "", dtype=object)
+    for j in range(width):
+        piece = vocab[ranks[:, j]]
+        sep = np.where(out == "", "", ",")
+        out = np.where(keep[:, j], out + sep + piece, out)
+    return np.where(out == "", None, out)
+
+
+def generate_chunks(profile, works, chunk_size=100_000, seed=0, offset=0):
+    """Yield frames of up to *chunk_size* synthetic works (*works* in total)."""
+    rng = np.random.default_rng(seed)
+    kind = profile["kind"]
+
+    multi = {}
+    for column, spec in profile["multi"].items():
+        vocab = _vocabulary(column, spec, works, profile["works"])
+        weights = np.arange(1, len(vocab) + 1, dtype=float) ** -spec["zipf"]
+        multi[column] = (spec, vocab, np.cumsum(weights) / weights.sum())
+
+    for start in range(0, works, chunk_size):
+        n = min(chunk_size, works - start)
+        ids = np.arange(offset + start, offset + start + n)
+        chunk = {
+            "link": [f"https://www.imdb.com/title/tt9{i:08d}/" for i in ids],
+            "description": "Synthetic " + kind + " for load testing.",
+            "rating": _sample(rng, profile["rating"], n),
+            "votes": _draw_lognormal(rng, profile["votes"], n).astype(np.int64),
+            "title": [f"Synthetic {kind.title()} {i}" for i in ids],
+            "parentalguide": _sample(rng, profile["parentalguide"], n),
+        }
+        for column, (spec, vocab, cdf) in multi.items():
+            chunk[column] = _multi_valued(rng, spec, vocab, cdf, n)
+
+        if kind == "movie":
+            chunk["year"] = [f"{y}-01-01" for y in _sample(rng, profile["year"], n)]
+            chunk["duration"] = _sample(rng, profile["duration"], n)
+            gross = profile["gross"]
+            values = _draw_lognormal(rng, gross, n).round(0)
+            chunk["worldwide_gross"] = np.where(rng.random(n) < gross["missing"], np.nan, values)
+        else:
+            start_year = _sample(rng, profile["start_year"], n).astype(int)
+            end_year = start_year + _sample(rng, profile["run_years"], n).astype(int)
+            unfinished = rng.random(n) < profile["unfinished"]
+            chunk["type"] = "TV Series"
+            chunk["start_year"] = start_year
+            chunk["year"] = start_year
+            chunk["end_year"] = np.where(unfinished, "unfinished", end_year.astype(str))
+
+        yield pd.DataFrame(chunk)[COLUMNS[kind]]
+
+
+def write_dataset(out_dir, profile, works, chunk_size=100_000, seed=0, with_splits=False):
+    """
+    Stream *works* synthetic rows to `<out_dir>/<kind>_after_cleaning.csv`
+    and, with *with_splits*, the matching split tables to
+    `<out_dir>/splits_<kind>/<sheet>.csv` (`row_id`, `title`, value).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    kind = profile["kind"]
+    path = out_dir / DATA_FILES[kind]
+    split_dir = out_dir / f"splits_{kind}"
+    if with_splits:
+        split_dir.mkdir(exist_ok=True)
+
+    row_offset = 0
+    for i, chunk in enumerate(generate_chunks(profile, works, chunk_size, seed)):
+        chunk.to_csv(path, index=False, mode="w" if i == 0 else "a", header=i == 0)
+        if with_splits:
+            for sheet, table in build_splits(chunk, SPLIT_COLUMNS[kind]).items():
+                table["row_id"] += row_offset
+                table.to_csv(split_dir / f"{sheet}.csv", index=False,
+                             mode="w" if i == 0 else "a", header=i == 0)
+        row_offset += len(chunk)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--series", type=int, default=25_000)
+    parser.add_argument("--out", required=True, help="output data directory")
+    parser.add_argument("--source", default=Path(__file__).resolve().parent.parent / "data",
+                        help="directory with the shipped cleaned CSVs to fit against")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--with-splits", action="store_true", help="also write exploded split tables")
+    args = parser.parse_args()
+
+    for kind, works in (("movie", args.movies), ("series", args.series)):
+        profile = fit_profile(pd.read_csv(Path(args.source) / DATA_FILES[kind]), kind)
+        write_dataset(args.out, profile, works, args.chunk_size, args.seed, args.with_splits)
+
+
+if __name__ == "__main__":
+    main()
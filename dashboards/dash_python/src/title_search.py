@@ -0,0 +1,91 @@
+import bisect
+import unicodedata
+
+import numpy as np
+
+
+def normalize(text):
+    """Lower-case, accent-free, single-spaced form used for matching."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.lower().split())
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """
+    Search index over a list of titles.
+
+    * prefix matches come from a sorted array of normalized titles
+      (two binary searches), best-ranked first;
+    * remaining slots are filled with fuzzy matches: the share of the
+      query's trigrams found in a title (Jaccard similarity breaks ties),
+      looked up in an inverted trigram -> title-id index.
+
+    Ranks are the titles' positions in the source list (the IMDb order,
+    i.e. most popular first), so ties favour the better known work.
+    """
+
+    def __init__(self, titles, min_similarity=0.4):
+        self.titles = [str(t) for t in titles]
+        self.min_similarity = min_similarity
+
+        keys = [normalize(t) for t in self.titles]
+        self._order = np.argsort(np.array(keys, dtype=object), kind="stable")
+        self._sorted_keys = [keys[i] for i in self._order]
+
+        postings = {}
+        self._trigram_counts = np.empty(len(keys), dtype=np.int32)
+        for i, key in enumerate(keys):
+            grams = trigrams(key)
+            self._trigram_counts[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.titles)
+
+    def prefix(self, query, k=20):
+        """Ids of up to *k* titles starting with *query*, best-ranked first."""
+        key = normalize(query)
+        lo = bisect.bisect_left(self._sorted_keys, key)
+        hi = bisect.bisect_left(self._sorted_keys, key + "\uffff")
+        ids = self._order[lo:hi]
+        if len(ids) > k:
+            ids = np.partition(ids, k - 1)[:k]
+        return np.sort(ids)
+
+    def fuzzy(self, query, k=20, exclude=()):
+        """Ids of up to *k* titles sharing the most trigrams with *query*."""
+        query_grams = trigrams(normalize(query))
+        grams = [g for g in query_grams if g in self._postings]
+        if not grams:
+            return np.empty(0, dtype=np.int64)
+
+        hits = np.concatenate([self._postings[g] for g in grams])
+        candidates, shared = np.unique(hits, return_counts=True)
+        query_size = len(query_grams)
+        containment = shared / query_size
+        jaccard = shared / (query_size + self._trigram_counts[candidates] - shared)
+
+        keep = containment >= self.min_similarity
+        if len(exclude):
+            keep &= ~np.isin(candidates, exclude)
+        candidates, containment, jaccard = candidates[keep], containment[keep], jaccard[keep]
+        # best containment first, then closest length, then best rank
+        order = np.lexsort((candidates, -jaccard, -containment))[:k]
+        return candidates[order]
+
+    def search(self, query, k=20):
+        """Top-*k* titles for *query*: prefix matches, then fuzzy matches."""
+        if not query or not normalize(query):
+            return []
+        ids = self.prefix(query, k)
+        if len(ids) < k and len(normalize(query)) >= 2:
+            ids = np.concatenate([ids, self.fuzzy(query, k - len(ids), exclude=ids)])
+        return [self.titles[i] for i in ids]
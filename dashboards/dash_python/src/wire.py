@@ -0,0 +1,133 @@
+import base64
+import gzip
+import json
+
+import numpy as np
+import plotly.io as pio
+
+# Bump when `encode_figure` changes what it produces (part of figure cache keys)
+ENCODING_VERSION = 1
+
+# Typed arrays Plotly.js decodes from `{"dtype": ..., "bdata": <base64>}`
+TYPED_ARRAYS = {
+    "i1": np.int8, "u1": np.uint8, "i2": np.int16, "u2": np.uint16,
+    "i4": np.int32, "u4": np.uint32, "f4": np.float32, "f8": np.float64,
+}
+INTEGER_DTYPES = ("u1", "i1", "u2", "i2", "u4", "i4")
+
+# Arrays shorter than this stay JSON lists (base64 would not be shorter)
+MIN_TYPED_LENGTH = 4
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json", "application/javascript", "text/javascript",
+    "text/html", "text/css", "text/plain",
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Typed arrays
+# ──────────────────────────────────────────────────────────────────────────────
+def decode_array(spec):
+    """The values of a typed array spec as a numpy array."""
+    return np.frombuffer(base64.b64decode(spec["bdata"]), dtype=TYPED_ARRAYS[spec["dtype"]])
+
+
+def encode_array(values):
+    """
+    *values* as the narrowest typed array that holds them exactly: integral
+    values get the smallest integer type covering their range, other
+    floats `f4` when every value survives the round trip, else `f8`.
+    Short arrays and short decimals (ratings like 7.1 print in fewer than
+    their eight `f8` bytes) stay a JSON list whenever that is smaller.
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    dtype = "f8"
+    if np.isfinite(arr).all() and (arr == np.round(arr)).all():
+        lo, hi = (arr.min(), arr.max()) if len(arr) else (0, 0)
+        for candidate in INTEGER_DTYPES:
+            info = np.iinfo(TYPED_ARRAYS[candidate])
+            if info.min <= lo and hi <= info.max:
+                dtype = candidate
+                break
+    elif np.array_equal(arr.astype(np.float32).astype(np.float64), arr, equal_nan=True):
+        dtype = "f4"
+    data = arr.astype(TYPED_ARRAYS[dtype])
+    spec = {"dtype": dtype, "bdata": base64.b64encode(data.tobytes()).decode("ascii")}
+    if np.isfinite(arr).all():
+        listed = data.tolist()
+        if len(json.dumps(listed, separators=(",", ":"))) <= len(json.dumps(spec, separators=(",", ":"))):
+            return listed
+    return spec
+
+
+def _is_numeric_list(value):
+    return (
+        isinstance(value, list)
+        and len(value) >= MIN_TYPED_LENGTH
+        and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)
+    )
+
+
+def _narrow(node):
+    if isinstance(node, dict):
+        if "bdata" in node and node.get("dtype") in TYPED_ARRAYS:
+            return encode_array(decode_array(node)) if len(node) == 2 else node
+        return {key: _narrow(value) for key, value in node.items()}
+    if _is_numeric_list(node):
+        return encode_array(node)
+    if isinstance(node, list):
+        # nested arrays (2-D data) keep their JSON form
+        return [_narrow(value) if isinstance(value, dict) else value for value in node]
+    return node
+
+
+def encode_figure(fig):
+    """
+    JSON-ready dict of a Plotly figure (or figure dict) whose trace arrays
+    are typed arrays of their narrowest exact type (or JSON lists, where
+    those are shorter; see `encode_array`). Layout is untouched.
+    """
+    fig = json.loads(pio.to_json(fig, validate=False))
+    fig["data"] = [_narrow(trace) for trace in fig.get("data", [])]
+    return fig
+
+
+def decode_figure(node):
+    """Inverse of `encode_figure`: typed arrays back to plain JSON lists."""
+    if isinstance(node, dict):
+        if "bdata" in node and node.get("dtype") in TYPED_ARRAYS:
+            return decode_array(node).tolist()
+        return {key: decode_figure(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [decode_figure(value) for value in node]
+    return node
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Flask integration
+# ──────────────────────────────────────────────────────────────────────────────
+def install(server, min_size=1024, level=6):
+    """
+    Gzip every compressible response of at least *min_size* bytes on a
+    Flask *server* for clients that accept it (callback responses, the
+    layout and Dash's own scripts).
+    """
+    from flask import request
+
+    @server.after_request
+    def _compress(response):
+        if (
+            response.direct_passthrough
+            or response.status_code != 200
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or "gzip" not in request.accept_encodings
+        ):
+            return response
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        response.set_data(gzip.compress(body, compresslevel=level))
+        response.headers["Content-Encoding"] = "gzip"
+        response.vary.add("Accept-Encoding")
+        return response
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Aggregate-bundle key holding the selected (start, end) years, if any
+RANGE_KEY = "years.range"
+
+
+def year_range(aggregates):
+    """The (start, end) years selected for a bundle; (None, None) = every year."""
+    return aggregates.get(RANGE_KEY) or (None, None)
+
+
+class YearCube:
+    """
+    Row counts and sums of a value per (year, group), stored as running
+    totals over the years. The totals of any [start, end] year range are
+    then one subtraction per group – O(groups), whatever the number of rows
+    or years – instead of a fresh groupby over the rows.
+
+    Rows without a group still count towards the per-year totals. Rows may
+    also be pre-aggregated (year, group) cells: *values* then holds each
+    cell's sum, *counts* its rows and *valid* its non-missing values.
+    """
+
+    def __init__(self, years, codes, labels, values, by, value, counts=None, valid=None):
+        self.by, self.value = by, value
+        self.labels = np.asarray(labels)
+        years = np.asarray(years, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        groups = len(self.labels)
+
+        self.first_year = int(years.min()) if len(years) else 0
+        offsets = years - self.first_year
+        span = int(offsets.max()) + 1 if len(years) else 0
+        self.years = np.arange(self.first_year, self.first_year + span)
+
+        # one cell per (year, group); column `groups` collects rows without a group
+        cells = offsets * (groups + 1) + np.where(codes >= 0, codes, groups)
+        ok = ~np.isnan(values)
+        shape = (span, groups + 1)
+        size = span * (groups + 1)
+        count = _cell_counts(cells, counts, size).reshape(shape)
+        total = np.bincount(cells[ok], weights=values[ok], minlength=size).reshape(shape)
+        valid = _cell_counts(cells[ok], None if valid is None else np.asarray(valid)[ok], size).reshape(shape)
+
+        self._year_count = count.sum(axis=1)
+        self._year_total = total.sum(axis=1)
+        self._year_valid = valid.sum(axis=1)
+
+        # prefix sums with a leading zero row: rows [i, j) = cum[j] - cum[i]
+        self._count = _running(count[:, :groups])
+        self._total = _running(total[:, :groups])
+        self._valid = _running(valid[:, :groups])
+
+    def _span(self, start, end):
+        """Year offsets [i, j) covered by the inclusive range [start, end]."""
+        last = self.first_year + len(self.years) - 1
+        start = self.first_year if start is None else max(int(start), self.first_year)
+        end = last if end is None else min(int(end), last)
+        if end < start:
+            return 0, 0
+        return start - self.first_year, end - self.first_year + 1
+
+    def by_group(self, start=None, end=None):
+        """Count and mean value per group over [start, end], in group order."""
+        i, j = self._span(start, end)
+        count = self._count[j] - self._count[i]
+        total = self._total[j] - self._total[i]
+        valid = self._valid[j] - self._valid[i]
+        present = count > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = total[present] / valid[present]
+        return pd.DataFrame({self.by: self.labels[present], "count": count[present], self.value: means})
+
+    def by_year(self, start=None, end=None):
+        """Count and mean value per year over [start, end] (years with rows only)."""
+        i, j = self._span(start, end)
+        count = self._year_count[i:j]
+        present = count > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self._year_total[i:j][present] / self._year_valid[i:j][present]
+        return pd.DataFrame({"year": self.years[i:j][present], "count": count[present], self.value: means})
+
+
+def _cell_counts(cells, counts, size):
+    if counts is None:
+        return np.bincount(cells, minlength=size)
+    return np.bincount(cells, weights=counts, minlength=size).astype(np.int64)
+
+
+def _running(cells):
+    return np.vstack([np.zeros((1, cells.shape[1]), dtype=cells.dtype), np.cumsum(cells, axis=0)])